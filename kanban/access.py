@@ -0,0 +1,156 @@
+from django.db import transaction
+from rest_framework.exceptions import PermissionDenied
+
+from .models import Board, BoardAccess, BoardCollaborator
+
+
+# --- Manutenção da tabela materializada BoardAccess (chamada pelos signals em kanban/signals.py) ---
+#
+# Cada mudança recalcula só os pares (quadro, usuário) afetados, a partir do dono e dos
+# colaboradores, na mesma transação do save/delete que a originou.
+
+def permission_for(board_id, user_id):
+    # 'owner' para o dono, a permissão de colaborador ou None se o usuário não tem acesso
+    if Board.objects.filter(id=board_id, fk_user_id=user_id).exists():
+        return 'owner'
+    return BoardCollaborator.objects.filter(fk_board_id=board_id, fk_user_id=user_id).values_list(
+        'permission', flat=True
+    ).first()
+
+
+def sync(board_id, user_id):
+    if not board_id or not user_id:
+        return
+    permission = permission_for(board_id, user_id)
+    if permission is None:
+        BoardAccess.objects.filter(fk_board_id=board_id, fk_user_id=user_id).delete()
+    else:
+        BoardAccess.objects.update_or_create(
+            fk_board_id=board_id, fk_user_id=user_id, defaults={'permission': permission},
+        )
+
+
+def owner_changed(board_id, previous, current):
+    # `previous` é None na criação
+    if previous != current:
+        sync(board_id, previous)
+        sync(board_id, current)
+
+
+def collaborator_changed(previous, current):
+    # Pares (quadro, usuário) antes e depois; None na criação e na remoção
+    for pair in {previous, current} - {None}:
+        sync(*pair)
+
+
+# --- Reconstrução em massa (manage.py rebuild_board_access) ---
+
+def rebuild(boards=None):
+    """Recria as linhas de acesso dos quadros informados (ou de todos) a partir de donos e colaboradores."""
+    owners = Board.objects.all()
+    collaborators = BoardCollaborator.objects.all()
+    existing = BoardAccess.objects.all()
+    if boards:
+        owners, collaborators, existing = (
+            owners.filter(id__in=boards), collaborators.filter(fk_board__in=boards), existing.filter(fk_board__in=boards),
+        )
+    rows = {(board_id, user_id): permission for board_id, user_id, permission in collaborators.values_list(
+        'fk_board_id', 'fk_user_id', 'permission',
+    )}
+    rows.update({pair: 'owner' for pair in owners.values_list('id', 'fk_user_id')})
+    with transaction.atomic():
+        existing.delete()
+        BoardAccess.objects.bulk_create(
+            [BoardAccess(fk_board_id=board_id, fk_user_id=user_id, permission=permission)
+             for (board_id, user_id), permission in rows.items()],
+            batch_size=1000,
+        )
+    return len(rows)
+
+
+# --- Escopo por requisição (viewsets) ---
+
+# Ordem das permissões: cada uma inclui as anteriores
+LEVELS = {'view': 0, 'edit': 1, 'admin': 2, 'owner': 3}
+# Acima disso o filtro usa a subquery em BoardAccess em vez de uma lista de ids na query
+MAX_INLINE_BOARDS = 500
+
+
+def board_permissions(user):
+    """{id do quadro: permissão} dos quadros ativos (nem removidos nem arquivados) acessíveis ao usuário."""
+    return dict(BoardAccess.objects.filter(
+        fk_user=user, fk_board__deleted_at__isnull=True, fk_board__archived_at__isnull=True,
+    ).values_list('fk_board_id', 'permission'))
+
+
+class BoardScopedMixin:
+    """
+    Para viewsets de modelos que pertencem a um quadro pelo caminho `board_field`
+    (ex.: 'fk_card__fk_column__fk_board'): listagem e detalhe ficam restritos aos
+    quadros acessíveis ao usuário, e escrita exige `write_permission` no quadro do
+    registro (e no de destino, se ele mudar). O acesso é resolvido uma única vez
+    por requisição e reaproveitado no filtro e nas verificações de permissão.
+    """
+
+    board_field = None
+    write_permission = 'edit'
+    write_denied = 'Você não tem permissão para alterar o conteúdo deste quadro.'
+
+    def board_permissions(self):
+        if getattr(self, '_board_permissions', None) is None:
+            self._board_permissions = board_permissions(self.request.user)
+        return self._board_permissions
+
+    def accessible_board_ids(self):
+        # Poucos quadros: ids direto na query (busca pelo índice da FK); muitos: subquery em BoardAccess
+        permissions = self.board_permissions()
+        if len(permissions) <= MAX_INLINE_BOARDS:
+            return list(permissions)
+        return Board.objects.accessible_to(self.request.user).values('id')
+
+    def scope(self, queryset):
+        return queryset.filter(**{f'{self.board_field}_id__in': self.accessible_board_ids()})
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        # Na geração do schema (drf_yasg) a view não tem requisição nem usuário
+        if getattr(self, 'swagger_fake_view', False):
+            return queryset.none()
+        return self.scope(queryset)
+
+    def board_id_of(self, source):
+        # `source` é a instância ou os validated_data do serializer; None se o caminho não foi informado
+        first, *rest = self.board_field.split('__')
+        if isinstance(source, dict):
+            if first not in source:
+                return None
+            value = source[first]
+            if not rest:
+                return value.pk
+        else:
+            if not rest:
+                return getattr(source, f'{first}_id')
+            value = getattr(source, first)
+        for name in rest[:-1]:
+            value = getattr(value, name)
+        return getattr(value, f'{rest[-1]}_id')
+
+    def check_board(self, board_id, permission=None):
+        granted = self.board_permissions().get(board_id)
+        if granted is None or LEVELS[granted] < LEVELS[permission or self.write_permission]:
+            raise PermissionDenied(self.write_denied)
+
+    def perform_create(self, serializer):
+        self.check_board(self.board_id_of(serializer.validated_data))
+        super().perform_create(serializer)
+
+    def perform_update(self, serializer):
+        self.check_board(self.board_id_of(serializer.instance))
+        target = self.board_id_of(serializer.validated_data)
+        if target is not None:
+            self.check_board(target)
+        super().perform_update(serializer)
+
+    def perform_destroy(self, instance):
+        self.check_board(self.board_id_of(instance))
+        super().perform_destroy(instance)
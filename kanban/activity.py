@@ -0,0 +1,189 @@
+import atexit
+import threading
+from contextvars import ContextVar
+from datetime import timedelta
+from functools import partial
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.utils import timezone
+
+from .models import Activity, Board, Column, Card, Task, Comment, Attachment, BoardCollaborator
+
+# Tamanho do lote gravado de uma vez fora de requisições (comandos, shell, workers)
+BATCH_SIZE = 500
+# Fora de requisições, tempo máximo (s) que um evento espera no buffer (KANBAN_ACTIVITY_FLUSH_INTERVAL)
+FLUSH_INTERVAL = 5
+# Retenção padrão do feed (KANBAN_ACTIVITY_RETENTION)
+RETENTION = timedelta(days=180)
+
+# Requisição e buffer de eventos correntes, definidos por ActivityMiddleware
+_request = ContextVar('kanban_activity_request', default=None)
+_buffer = ContextVar('kanban_activity_buffer', default=None)
+
+# Buffer do processo, usado quando não há requisição em andamento, e o timer que o grava
+_pending = []
+_pending_lock = threading.Lock()
+_timer = None
+
+# Remoção em andamento: pais dos objetos removidos, anotados no pre_delete, e o quadro de cada pai
+_deleting = ContextVar('kanban_activity_deleting', default=None)
+_UNRESOLVED = object()
+
+
+def start_request(request):
+    return _request.set(request), _buffer.set([])
+
+
+def end_request(tokens):
+    # Devolve os eventos confirmados durante a requisição, a serem gravados com write()
+    events = _buffer.get()
+    _request.reset(tokens[0])
+    _buffer.reset(tokens[1])
+    return events
+
+
+def write(events):
+    # Grava os eventos em um único INSERT (por lote)
+    if events:
+        Activity.objects.bulk_create(events, batch_size=BATCH_SIZE)
+
+
+def flush():
+    global _timer
+    with _pending_lock:
+        events = _pending[:]
+        del _pending[:]
+        if _timer is not None:
+            _timer.cancel()
+            _timer = None
+    write(events)
+
+
+atexit.register(flush)
+
+
+def _flush_from_timer():
+    # Roda na thread do timer: fecha a conexão que ela abriu para gravar
+    try:
+        flush()
+    finally:
+        connections.close_all()
+
+
+def _enqueue(event):
+    global _timer
+    events = _buffer.get()
+    if events is not None:
+        events.append(event)
+        return
+    # Comandos, shell e workers: grava ao completar um lote ou, no máximo, FLUSH_INTERVAL depois do primeiro evento
+    with _pending_lock:
+        _pending.append(event)
+        full = len(_pending) >= BATCH_SIZE
+        if not full and _timer is None:
+            _timer = threading.Timer(getattr(settings, 'KANBAN_ACTIVITY_FLUSH_INTERVAL', FLUSH_INTERVAL), _flush_from_timer)
+            _timer.daemon = True
+            _timer.start()
+    if full:
+        flush()
+
+
+def _actor_id():
+    # O DRF repassa o usuário autenticado para o HttpRequest original
+    request = _request.get()
+    user = getattr(request, 'user', None)
+    return user.pk if user is not None and user.is_authenticated else None
+
+
+def _parent(instance):
+    # Modelo e id do pai pelo qual o quadro do objeto é resolvido
+    if isinstance(instance, Card):
+        return Column, instance.fk_column_id
+    return Card, instance.fk_card_id
+
+
+def deleting(instance, origin):
+    """
+    Chamada no pre_delete de cartões e dos seus filhos. O Django envia o pre_delete de
+    toda a cascata antes de apagar a primeira linha: os pais são anotados aqui e o quadro
+    de todos eles é resolvido numa única query por modelo na primeira consulta.
+    """
+    state = _deleting.get()
+    if state is None or state['origin'] is not origin:
+        state = {'origin': origin, Column: {}, Card: {}}
+        _deleting.set(state)
+        transaction.on_commit(partial(_deleting.set, None))
+    model, parent_id = _parent(instance)
+    state[model].setdefault(parent_id, _UNRESOLVED)
+
+
+def _deleted_board_id(model, parent_id):
+    state = _deleting.get()
+    boards = state[model] if state is not None else {}
+    if parent_id not in boards:
+        return None
+    if boards[parent_id] is _UNRESOLVED:
+        pending = [key for key, value in boards.items() if value is _UNRESOLVED]
+        path = 'fk_board_id' if model is Column else 'fk_column__fk_board_id'
+        found = dict(model.objects.filter(id__in=pending).values_list('id', path))
+        boards.update({key: found.get(key) for key in pending})
+    return boards[parent_id]
+
+
+def _board_id(instance, deleted=False):
+    if isinstance(instance, Board):
+        return instance.pk
+    if isinstance(instance, (Column, BoardCollaborator)):
+        return instance.fk_board_id
+    model, parent_id = _parent(instance)
+    if deleted:
+        board_id = _deleted_board_id(model, parent_id)
+        if board_id is not None:
+            return board_id
+    if isinstance(instance, Card):
+        return instance.get_board_id()
+    # Tarefas, comentários e anexos: quadro do cartão
+    if type(instance).fk_card.is_cached(instance):
+        return instance.fk_card.get_board_id()
+    return Card.objects.filter(id=instance.fk_card_id).values_list('fk_column__fk_board_id', flat=True).first()
+
+
+def deleted_board_id(instance):
+    """Quadro de um cartão (ou filho de cartão) no post_delete, resolvido uma vez por remoção."""
+    return _board_id(instance, deleted=True)
+
+
+def record(instance, verb, board_id=None):
+    """
+    Registra um evento do feed. O evento só entra no buffer quando a transação
+    corrente é confirmada, e o buffer é gravado em lote (ver ActivityMiddleware).
+    """
+    board_id = board_id or _board_id(instance, deleted=verb == 'deleted')
+    if board_id is None:
+        return
+    event = Activity(
+        fk_board_id=board_id,
+        fk_user_id=_actor_id(),
+        verb=verb,
+        target_type=instance._meta.model_name,
+        target_id=instance.pk,
+        summary=str(instance)[:255],
+        created_at=timezone.now(),
+    )
+    transaction.on_commit(partial(_enqueue, event))
+
+
+def prune(before=None, batch_size=5000):
+    """Remove, em lotes limitados, os eventos mais antigos que a retenção configurada."""
+    if before is None:
+        before = timezone.now() - getattr(settings, 'KANBAN_ACTIVITY_RETENTION', RETENTION)
+    removed = 0
+    while True:
+        ids = list(Activity.objects.filter(created_at__lt=before).order_by('created_at').values_list('id', flat=True)[:batch_size])
+        if not ids:
+            return removed
+        removed += Activity.objects.filter(id__in=ids).delete()[0]
+
+
+TRACKED_MODELS = (Board, Column, Card, Task, Comment, Attachment, BoardCollaborator)
@@ -1,7 +1,7 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.utils.translation import gettext_lazy as _
-from .models import User, Board, Column, Card, Task, Tag, Comment, Notification, Attachment
+from .models import User, Board, Column, Card, Task, Tag, CardTemplate, Comment, Notification, Attachment
 
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
@@ -64,9 +64,19 @@ class TaskAdmin(admin.ModelAdmin):
 # Admin para o modelo Tag
 @admin.register(Tag)
 class TagAdmin(admin.ModelAdmin):
-    list_display = ('name', 'color', 'created_at', 'updated_at')
+    list_display = ('name', 'color', 'fk_board', 'created_at', 'updated_at')
+    list_filter = ('fk_board',)
     search_fields = ('name',)
-    ordering = ('name',)
+    ordering = ('fk_board', 'name')
+
+
+# Admin para o modelo CardTemplate
+@admin.register(CardTemplate)
+class CardTemplateAdmin(admin.ModelAdmin):
+    list_display = ('name', 'fk_board', 'title', 'priority', 'created_at')
+    list_filter = ('fk_board',)
+    search_fields = ('name', 'title')
+    ordering = ('fk_board', 'name')
 
 
 # Admin para o modelo Comment
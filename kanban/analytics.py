@@ -0,0 +1,151 @@
+import statistics
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Min, Q
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import Column, CardTransition
+
+# Buckets de dias já encerrados não mudam (o log é somente inserção)
+CACHE_TIMEOUT = 60 * 60 * 24 * 7
+
+
+def record_transition(card, from_column, to_column, board_id=None):
+    # Quem chama repassa o quadro quando já o conhece (ex.: resolvido uma vez para toda a cascata de uma remoção)
+    if from_column == to_column:
+        return
+    CardTransition.objects.create(
+        card_id=card.id, fk_board_id=board_id or card.get_board_id(), from_column=from_column, to_column=to_column,
+    )
+
+
+def _day_bounds(first_day, last_day):
+    tz = timezone.get_current_timezone()
+    return (
+        datetime.combine(first_day, time.min, tzinfo=tz),
+        datetime.combine(last_day + timedelta(days=1), time.min, tzinfo=tz),
+    )
+
+
+def _cache_key(board_id, first_column, done_column, kind, day):
+    return f'kanban:analytics:{board_id}:{first_column}:{done_column}:{kind}:{day.isoformat()}'
+
+
+def _empty_bucket():
+    return {'in': {}, 'out': {}, 'throughput': 0, 'lead': [], 'cycle': []}
+
+
+def _compute_buckets(board_id, first_day, last_day, first_column, done_column):
+    """Agrega no banco, por dia, as entradas/saídas de cada coluna e os tempos dos cartões concluídos."""
+    start, end = _day_bounds(first_day, last_day)
+    buckets = {first_day + timedelta(days=offset): _empty_bucket() for offset in range((last_day - first_day).days + 1)}
+    period = CardTransition.objects.filter(fk_board_id=board_id, created_at__gte=start, created_at__lt=end)
+
+    daily = period.annotate(day=TruncDate('created_at')).order_by()
+    for row in daily.exclude(to_column=None).values('day', 'to_column').annotate(total=Count('id')):
+        buckets[row['day']]['in'][row['to_column']] = row['total']
+    for row in daily.exclude(from_column=None).values('day', 'from_column').annotate(total=Count('id')):
+        buckets[row['day']]['out'][row['from_column']] = row['total']
+
+    if done_column is None:
+        return buckets
+
+    # Lead time: criação -> primeira chegada à última coluna.
+    # Cycle time: primeira entrada numa coluna além da primeira -> primeira chegada à última coluna.
+    finished = (
+        CardTransition.objects.filter(fk_board_id=board_id, card_id__in=period.filter(to_column=done_column).values('card_id'))
+        .order_by().values('card_id')
+        .annotate(
+            created=Min('created_at', filter=Q(from_column__isnull=True)),
+            started=Min('created_at', filter=Q(to_column__isnull=False) & ~Q(to_column=first_column)),
+            done=Min('created_at', filter=Q(to_column=done_column)),
+        )
+    )
+    for row in finished:
+        done = row['done']
+        if done is None or not start <= done < end:
+            continue
+        bucket = buckets[timezone.localdate(done)]
+        bucket['throughput'] += 1
+        if row['created']:
+            bucket['lead'].append((done - row['created']).total_seconds())
+        if row['started'] and row['started'] <= done:
+            bucket['cycle'].append((done - row['started']).total_seconds())
+    return buckets
+
+
+def _initial_counts(board_id, first_day, first_column, done_column, today):
+    # Quantidade de cartões em cada coluna no início do primeiro dia
+    key = _cache_key(board_id, first_column, done_column, 'state', first_day)
+    counts = cache.get(key) if first_day <= today else None
+    if counts is None:
+        start, _ = _day_bounds(first_day, first_day)
+        before = CardTransition.objects.filter(fk_board_id=board_id, created_at__lt=start).order_by()
+        counts = {}
+        for row in before.exclude(to_column=None).values('to_column').annotate(total=Count('id')):
+            counts[row['to_column']] = counts.get(row['to_column'], 0) + row['total']
+        for row in before.exclude(from_column=None).values('from_column').annotate(total=Count('id')):
+            counts[row['from_column']] = counts.get(row['from_column'], 0) - row['total']
+        if first_day <= today:
+            cache.set(key, counts, getattr(settings, 'KANBAN_ANALYTICS_CACHE_TIMEOUT', CACHE_TIMEOUT))
+    return counts
+
+
+def _percentiles(seconds):
+    if not seconds:
+        return None
+    hours = sorted(value / 3600 for value in seconds)
+    if len(hours) == 1:
+        return {'p50': round(hours[0], 2), 'p85': round(hours[0], 2), 'p95': round(hours[0], 2)}
+    cuts = statistics.quantiles(hours, n=100, method='inclusive')
+    return {'p50': round(cuts[49], 2), 'p85': round(cuts[84], 2), 'p95': round(cuts[94], 2)}
+
+
+def board_analytics(board, first_day, last_day):
+    """
+    Fluxo cumulativo, throughput e percentis de lead/cycle time do quadro entre
+    `first_day` e `last_day` (inclusive). Os dias já encerrados ficam em cache
+    por bucket diário; só os dias ausentes do cache (e o dia corrente) vão ao banco.
+    """
+    columns = list(Column.objects.filter(fk_board=board).order_by('position', 'id').values('id', 'name'))
+    first_column = columns[0]['id'] if columns else None
+    done_column = columns[-1]['id'] if columns else None
+    today = timezone.localdate()
+    days = [first_day + timedelta(days=offset) for offset in range((last_day - first_day).days + 1)]
+    timeout = getattr(settings, 'KANBAN_ANALYTICS_CACHE_TIMEOUT', CACHE_TIMEOUT)
+
+    keys = {day: _cache_key(board.id, first_column, done_column, 'day', day) for day in days if day < today}
+    cached = cache.get_many(list(keys.values()))
+    buckets = {day: cached[key] for day, key in keys.items() if key in cached}
+    missing = [day for day in days if day not in buckets]
+    if missing:
+        computed = _compute_buckets(board.id, missing[0], missing[-1], first_column, done_column)
+        cache.set_many({keys[day]: computed[day] for day in missing if day in keys}, timeout)
+        buckets.update({day: computed[day] for day in missing})
+
+    counts = _initial_counts(board.id, first_day, first_column, done_column, today)
+    flow, throughput, lead, cycle = [], [], [], []
+    for day in days:
+        bucket = buckets[day]
+        for column_id, total in bucket['in'].items():
+            counts[column_id] = counts.get(column_id, 0) + total
+        for column_id, total in bucket['out'].items():
+            counts[column_id] = counts.get(column_id, 0) - total
+        flow.append({'date': day, 'counts': {column['id']: counts.get(column['id'], 0) for column in columns}})
+        throughput.append({'date': day, 'count': bucket['throughput']})
+        lead.extend(bucket['lead'])
+        cycle.extend(bucket['cycle'])
+
+    return {
+        'board': board.id,
+        'start': first_day,
+        'end': last_day,
+        'columns': columns,
+        'cumulative_flow': flow,
+        'throughput': throughput,
+        'lead_time_hours': _percentiles(lead),
+        'cycle_time_hours': _percentiles(cycle),
+    }
@@ -3,3 +3,7 @@ from django.apps import AppConfig
 class KanbanConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'kanban'
+
+    def ready(self):
+        # Registra os receivers de signals do app
+        from . import signals  # noqa: F401
@@ -0,0 +1,259 @@
+import datetime
+import gzip
+import io
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, models, transaction
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+from . import reaper, search
+from .models import (
+    Board, Column, Card, Task, Tag, Comment, Attachment, CardReminder, SearchEntry, Activity, BoardArchive, BoardArchiveBlob,
+)
+
+# Versão do formato do JSON arquivado (2: tags por quadro)
+FORMAT_VERSION = 2
+# Linhas lidas por ida ao banco ao montar o arquivo
+CHUNK_SIZE = 2000
+# Seções com posição única dentro do pai (restrições de 0015): seção -> campo do pai
+POSITION_GROUPS = {'columns': 'fk_board_id', 'cards': 'fk_column_id', 'tasks': 'fk_card_id'}
+
+
+class ArchiveError(Exception):
+    pass
+
+
+class _Encoder(DjangoJSONEncoder):
+    # Mantém os microssegundos (o DjangoJSONEncoder trunca em milissegundos): a restauração é exata
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def _sections(board_id):
+    # Da raiz para as folhas (ordem da restauração); a remoção percorre ao contrário
+    card_filter = Q(fk_card__fk_column__fk_board_id=board_id)
+    return (
+        ('columns', Column.objects.filter(fk_board_id=board_id)),
+        ('cards', Card.objects.filter(fk_column__fk_board_id=board_id)),
+        ('tasks', Task.objects.filter(card_filter)),
+        ('comments', Comment.objects.filter(card_filter)),
+        ('attachments', Attachment.objects.filter(card_filter)),
+        ('tags', Tag.objects.filter(fk_board_id=board_id)),
+        ('tag_links', Tag.cards.through.objects.filter(card__fk_column__fk_board_id=board_id)),
+        ('reminders', CardReminder.objects.filter(card_filter)),
+        ('search_entries', SearchEntry.objects.filter(fk_board_id=board_id)),
+    )
+
+
+def _dumps(value):
+    return json.dumps(value, cls=_Encoder, separators=(',', ':'), ensure_ascii=False)
+
+
+def iter_document(board, archived_at=None, counts=None, blobs=None):
+    """
+    Gera o JSON do quadro e de todo o conteúdo em trechos (bytes), lendo as linhas
+    em lotes, sem manter o documento inteiro em memória. Se informados, `counts`
+    recebe as contagens por seção e `blobs` os arquivos citados pelos anexos.
+    """
+    counts = {} if counts is None else counts
+    blobs = set() if blobs is None else blobs
+    board_row = Board.objects.filter(id=board.id).values().get()
+    yield ('{"version":%d,"archived_at":%s,"board":%s' % (FORMAT_VERSION, _dumps(archived_at), _dumps(board_row))).encode()
+    for name, queryset in _sections(board.id):
+        parts, total = [f',"{name}":['], 0
+        for row in queryset.order_by('pk').values().iterator(chunk_size=CHUNK_SIZE):
+            parts.append((',' if total else '') + _dumps(row))
+            total += 1
+            if name == 'attachments':
+                blobs.update(blob for blob in (row['file'], row['thumbnail']) if blob)
+            if len(parts) >= CHUNK_SIZE:
+                yield ''.join(parts).encode()
+                parts = []
+        parts.append(']')
+        yield ''.join(parts).encode()
+        counts[name] = total
+    yield b'}'
+
+
+def dump(board, archived_at=None):
+    """
+    Monta o JSON do quadro e de todo o conteúdo já comprimido com gzip, trecho a
+    trecho (iter_document). Devolve os bytes comprimidos, o tamanho original, as
+    contagens por seção e os blobs citados.
+    """
+    buffer = io.BytesIO()
+    counts, blobs, raw_size = {}, set(), 0
+    with gzip.GzipFile(fileobj=buffer, mode='wb', compresslevel=6, mtime=0) as output:
+        for data in iter_document(board, archived_at, counts, blobs):
+            raw_size += len(data)
+            output.write(data)
+    return buffer.getvalue(), raw_size, counts, sorted(blobs)
+
+
+def archive_board(board, user=None, batch_size=1000):
+    """
+    Grava o conteúdo do quadro em um BoardArchive e o remove das tabelas ativas,
+    em lotes. O quadro (com colaboradores, contadores e histórico) continua
+    existindo e pode ser lido por snapshot() ou restaurado por restore_board().
+    """
+    now = timezone.now()
+    # A marcação tira o quadro do escopo de escrita (Board.objects.alive()) antes da leitura
+    if not Board.objects.filter(id=board.id, archived_at__isnull=True, deleted_at__isnull=True).update(archived_at=now):
+        raise ArchiveError('O quadro já está arquivado ou foi removido.')
+    # O documento é montado e comprimido fora de transação; só a gravação do arquivo é atômica
+    try:
+        data, raw_size, counts, blobs = dump(board, archived_at=now)
+        with transaction.atomic():
+            archive = BoardArchive.objects.create(
+                fk_board=board, archived_by=user, data=data, raw_size=raw_size, counts=counts,
+            )
+            BoardArchiveBlob.objects.bulk_create([BoardArchiveBlob(fk_archive=archive, name=name) for name in blobs],
+                                                 batch_size=1000)
+    except Exception:
+        Board.objects.filter(id=board.id, archived_at=now).update(archived_at=None)
+        raise
+    board.archived_at = now
+    finish(archive, batch_size=batch_size)
+    return archive
+
+
+def finish(archive, batch_size=1000):
+    # Remove das tabelas ativas o que já está no arquivo (retomável se interrompido)
+    reaper.discard_uploads(archive.fk_board_id)
+    for _, queryset in reversed(_sections(archive.fk_board_id)):
+        reaper.delete_in_batches(queryset, batch_size)
+    BoardArchive.objects.filter(id=archive.id).update(complete=True)
+    archive.complete = True
+
+
+def load(archive):
+    return json.loads(gzip.decompress(archive.data))
+
+
+def _resolve_conflicts(document):
+    """
+    Arquivos gravados antes das posições únicas (0015) e dos nomes de tag únicos por
+    quadro (0016) podem repetir valores. Como nas migrações, as posições repetidas vão
+    para o fim do grupo, na ordem de criação, e as tags de mesmo nome são unificadas.
+    """
+    for name, parent in POSITION_GROUPS.items():
+        groups = {}
+        for row in sorted(document.get(name, []), key=lambda row: row['id']):
+            if row['position'] is not None:
+                groups.setdefault(row[parent], []).append(row)
+        for rows in groups.values():
+            next_position = max(row['position'] for row in rows) + 1
+            taken = set()
+            for row in rows:
+                if row['position'] in taken:
+                    row['position'] = next_position
+                    next_position += 1
+                taken.add(row['position'])
+
+    kept, merged = {}, {}
+    for row in sorted(document.get('tags', []), key=lambda row: row['id']):
+        merged[row['id']] = kept.setdefault(row['name'].lower(), row['id'])
+    if len(kept) < len(merged):
+        document['tags'] = [row for row in document['tags'] if merged[row['id']] == row['id']]
+        links = {}
+        for row in document.get('tag_links', []):
+            row['tag_id'] = merged.get(row['tag_id'], row['tag_id'])
+            links.setdefault((row['tag_id'], row['card_id']), row)
+        document['tag_links'] = list(links.values())
+
+
+def restore_board(board, batch_size=500):
+    """
+    Devolve às tabelas ativas, numa única transação, o conteúdo arquivado do quadro. O
+    índice de busca é refeito dos registros restaurados, e não copiado do arquivo.
+    """
+    archive = BoardArchive.objects.filter(fk_board=board).first()
+    if archive is None:
+        raise ArchiveError('O quadro não está arquivado.')
+    if not archive.complete:
+        finish(archive)
+    document = load(archive)
+    _resolve_conflicts(document)
+    try:
+        with transaction.atomic():
+            for name, queryset in _sections(board.id):
+                if name == 'search_entries':
+                    continue
+                model = queryset.model
+                rows = document.get(name, [])
+                if name == 'tag_links' and document['version'] < 2:
+                    # Arquivos de antes das tags por quadro: só voltam os vínculos com tags deste quadro
+                    tag_ids = set(Tag.objects.filter(fk_board_id=board.id).values_list('id', flat=True))
+                    rows = [row for row in rows if row['tag_id'] in tag_ids]
+                _insert_rows(model, rows, batch_size)
+            search.index_board(board.id, batch_size)
+            archive.delete()
+            Board.objects.filter(id=board.id).update(archived_at=None)
+    except IntegrityError as exc:
+        raise ArchiveError(f'O conteúdo arquivado conflita com os dados atuais: {exc}')
+    board.archived_at = None
+    return document
+
+
+def _insert_rows(model, rows, batch_size):
+    # bulk_create com as chaves originais não dispara signals: os contadores voltam exatamente
+    # como foram arquivados (o índice de busca é refeito em restore_board). auto_now/auto_now_add
+    # sobrescrevem as datas na inserção, então os valores arquivados são regravados em seguida
+    # (bulk_update não os altera).
+    stamped = [
+        field.attname for field in model._meta.concrete_fields
+        if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+    ]
+    for start in range(0, len(rows), batch_size):
+        chunk = rows[start:start + batch_size]
+        objs = model.objects.bulk_create([model(**row) for row in chunk])
+        if stamped:
+            for obj, row in zip(objs, chunk):
+                for attname in stamped:
+                    setattr(obj, attname, row[attname])
+            model.objects.bulk_update(objs, stamped)
+
+
+def stored_snapshot(board):
+    # JSON comprimido guardado no arquivamento; None para quadros ativos
+    if not board.archived_at:
+        return None
+    archive = BoardArchive.objects.filter(fk_board=board).only('data').first()
+    return bytes(archive.data) if archive is not None else None
+
+
+def snapshot(board):
+    """
+    JSON (comprimido com gzip) do quadro e de todo o conteúdo: lido do arquivo
+    para quadros arquivados e montado das tabelas ativas para os demais.
+    """
+    return stored_snapshot(board) or dump(board)[0]
+
+
+def snapshot_document(board):
+    """
+    Conteúdo de snapshot() como objetos Python, com as datas e horas convertidas
+    de volta para datetime (para os formatos binários gravarem no tipo nativo).
+    """
+    document = json.loads(gzip.decompress(snapshot(board)))
+    sections = [('board', Board)] + [(name, queryset.model) for name, queryset in _sections(board.id)]
+    for name, model in sections:
+        fields = [field.attname for field in model._meta.concrete_fields if isinstance(field, models.DateTimeField)]
+        rows = document.get(name) or []
+        for row in [rows] if isinstance(rows, dict) else rows:
+            for field in fields:
+                if row.get(field):
+                    row[field] = datetime.datetime.fromisoformat(row[field])
+    if document.get('archived_at'):
+        document['archived_at'] = datetime.datetime.fromisoformat(document['archived_at'])
+    return document
+
+
+def inactive_boards(before):
+    """Quadros ativos sem atualização nem atividade registrada desde `before`."""
+    recent = Activity.objects.filter(fk_board=OuterRef('pk'), created_at__gte=before)
+    return Board.objects.alive().filter(updated_at__lt=before).filter(~Exists(recent)).order_by('updated_at', 'id')
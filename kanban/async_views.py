@@ -0,0 +1,184 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.core.paginator import InvalidPage
+from django.http import HttpResponse
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.views import View
+from rest_framework import exceptions
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from rest_framework.views import APIView
+
+from .caching import CachePolicyMixin
+from .concurrency import etag
+from .models import Board, Column, Card, Notification, BoardCollaborator
+from .serializers import BoardSerializer, ColumnSerializer, CardSerializer, CardTagSerializer, NotificationSerializer, BoardCollaboratorSerializer
+
+# Relações carregadas junto com o usuário aninhado pelo UserSerializer: sem elas a
+# serialização faria queries síncronas dentro do event loop.
+USER_PREFETCH = ('groups', 'user_permissions')
+
+
+def _user_prefetch(field):
+    return [f'{field}__{relation}' for relation in USER_PREFETCH]
+
+
+class AsyncReadView(View):
+    """
+    Versão assíncrona (ASGI) das rotas de listagem e detalhe. Usa o ORM
+    assíncrono do Django e responde no mesmo formato das viewsets do DRF: os
+    autenticadores, throttles, paginação e tratamento de erros são as classes do
+    REST_FRAMEWORK, com os próprios métodos da APIView.
+
+    Observação: o ORM assíncrono executa cada query via sync_to_async na thread
+    da requisição, então queries "concorrentes" se sobrepõem na espera, mas não
+    em paralelo no banco. O ganho está em não ocupar uma thread por conexão.
+    """
+
+    serializer_class = None
+    authentication_classes = api_settings.DEFAULT_AUTHENTICATION_CLASSES
+    throttle_classes = api_settings.DEFAULT_THROTTLE_CLASSES
+    pagination_class = api_settings.DEFAULT_PAGINATION_CLASS
+    renderer = JSONRenderer()
+    settings = api_settings
+
+    # Os mesmos da APIView: nenhuma cópia da lógica de autenticação e throttling do DRF
+    get_authenticators = APIView.get_authenticators
+    get_authenticate_header = APIView.get_authenticate_header
+    get_throttles = APIView.get_throttles
+    check_throttles = APIView.check_throttles
+    throttled = APIView.throttled
+    get_exception_handler = APIView.get_exception_handler
+
+    def get_queryset(self, user):
+        raise NotImplementedError
+
+    async def get(self, request, pk=None):
+        drf_request = Request(request, authenticators=self.get_authenticators())
+        try:
+            user = await sync_to_async(self.initial)(drf_request)
+            if pk is None:
+                return await self.list(drf_request, self.get_queryset(user))
+            return await self.retrieve(drf_request, self.get_queryset(user), pk, user)
+        except exceptions.APIException as exc:
+            return self.handle_exception(drf_request, exc)
+
+    def initial(self, request):
+        # Como na APIView (IsAuthenticated antes dos throttles); a verificação de senha e a
+        # leitura dos buckets rodam na mesma ida à thread
+        if not request.user.is_authenticated:
+            raise exceptions.NotAuthenticated()
+        self.check_throttles(request)
+        return request.user
+
+    def handle_exception(self, request, exc):
+        if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+            exc.auth_header = self.get_authenticate_header(request)
+        handled = self.get_exception_handler()(exc, {'view': self, 'request': request, 'args': self.args, 'kwargs': self.kwargs})
+        response = self.render(handled.data, status=handled.status_code)
+        for header, value in handled.items():
+            response[header] = value
+        return response
+
+    def get_throttle_board_id(self, request):
+        return None
+
+    async def list(self, request, queryset):
+        # Página calculada pelo paginador do REST_FRAMEWORK sobre a contagem assíncrona: o
+        # Paginator do Django só fatia o queryset, e a página é buscada pelo ORM assíncrono
+        paginator = self.pagination_class()
+        paginator.request = request
+        django_paginator = paginator.django_paginator_class(queryset, paginator.get_page_size(request))
+        django_paginator.count = await queryset.acount()
+        page_number = paginator.get_page_number(request, django_paginator)
+        try:
+            paginator.page = django_paginator.page(page_number)
+        except InvalidPage as exc:
+            raise exceptions.NotFound(paginator.invalid_page_message.format(page_number=page_number, message=str(exc)))
+        paginator.page.object_list = await self.fetch(paginator.page.object_list)
+        data = self.serializer_class(paginator.page.object_list, many=True).data
+        return self.render(paginator.get_paginated_response(data).data)
+
+    async def retrieve(self, request, queryset, pk, user):
+        try:
+            instance = await queryset.aget(pk=pk)
+        except queryset.model.DoesNotExist:
+            raise exceptions.NotFound('Não encontrado.')
+        response = self.render(self.serializer_class(instance).data)
+        if hasattr(instance, 'version'):
+            response['ETag'] = etag(instance.version)
+        return response
+
+    async def fetch(self, queryset):
+        return [obj async for obj in queryset]
+
+    def render(self, data, status=200):
+        response = HttpResponse(self.renderer.render(data), status=status, content_type='application/json')
+        # Mesma política das viewsets (kanban/caching.py): por usuário e sempre revalidada
+        patch_vary_headers(response, CachePolicyMixin.cache_vary)
+        if status == 200:
+            patch_cache_control(response, **CachePolicyMixin.cache_control)
+        return response
+
+
+class AsyncBoardView(AsyncReadView):
+    serializer_class = BoardSerializer
+
+    def get_throttle_board_id(self, request):
+        return self.kwargs.get('pk')
+
+    def get_boards(self, user):
+        # Mesmo escopo do BoardViewSet: arquivados inclusive, removidos não
+        return Board.objects.accessible_to(user, include_inactive=True).filter(deleted_at__isnull=True)
+
+    def get_queryset(self, user):
+        return (
+            self.get_boards(user).select_related('fk_user')
+            .prefetch_related(*_user_prefetch('fk_user')).order_by('id')
+        )
+
+    async def retrieve(self, request, queryset, pk, user):
+        # Resposta composta: quadro, colunas e colaboradores buscados ao mesmo tempo
+        boards = self.get_boards(user)
+        board, columns, collaborators = await asyncio.gather(
+            queryset.filter(pk=pk).afirst(),
+            self.fetch(Column.objects.filter(fk_board_id=pk, fk_board__in=boards).order_by('position', 'id')),
+            self.fetch(BoardCollaborator.objects.filter(fk_board_id=pk, fk_board__in=boards).order_by('id')),
+        )
+        if board is None:
+            raise exceptions.NotFound('Não encontrado.')
+        data = BoardSerializer(board).data
+        data['columns'] = ColumnSerializer(columns, many=True).data
+        data['collaborators'] = BoardCollaboratorSerializer(collaborators, many=True).data
+        return self.render(data)
+
+
+class AsyncColumnView(AsyncReadView):
+    serializer_class = ColumnSerializer
+
+    def get_queryset(self, user):
+        return Column.objects.filter(fk_board__in=Board.objects.accessible_to(user)).order_by('fk_board', 'position', 'id')
+
+
+class AsyncCardView(AsyncReadView):
+    serializer_class = CardSerializer
+
+    def get_queryset(self, user):
+        return (
+            Card.objects.filter(fk_column__fk_board__in=Board.objects.accessible_to(user))
+            .select_related('fk_column', 'fk_user')
+            .prefetch_related(*_user_prefetch('fk_user'), CardTagSerializer.prefetch())
+            .order_by('fk_column', 'position', 'id')
+        )
+
+
+class AsyncNotificationView(AsyncReadView):
+    serializer_class = NotificationSerializer
+
+    def get_queryset(self, user):
+        return (
+            Notification.objects.filter(fk_user=user).select_related('fk_user')
+            .prefetch_related(*_user_prefetch('fk_user')).order_by('-created_at', '-id')
+        )
@@ -0,0 +1,25 @@
+from django.utils.cache import patch_cache_control, patch_vary_headers
+
+# Padrão das leituras: só o navegador do usuário guarda, e sempre revalida antes de reusar
+PRIVATE_NO_CACHE = {'private': True, 'no_cache': True}
+
+
+class CachePolicyMixin:
+    """
+    Política de cache HTTP por viewset (ou por action, com `@action(cache_control=...)`):
+    `cache_control` são os argumentos de patch_cache_control aplicados às leituras
+    bem-sucedidas (GET/HEAD). Toda resposta leva `Vary` com os headers que mudam a
+    representação: o formato (Accept) e o usuário (Authorization), pois as listagens
+    são filtradas pelo acesso de quem pede. Escritas não são marcadas: não são cacheáveis.
+    """
+
+    cache_control = PRIVATE_NO_CACHE
+    cache_vary = ('Accept', 'Authorization')
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        patch_vary_headers(response, self.cache_vary)
+        if request.method in ('GET', 'HEAD') and 200 <= response.status_code < 300 and self.cache_control:
+            if not response.has_header('Cache-Control'):
+                patch_cache_control(response, **self.cache_control)
+        return response
@@ -0,0 +1,152 @@
+from itertools import islice
+
+from django.db import transaction
+from django.db.models import Max
+from django.db.models.functions import Lower
+
+from . import counters
+from .models import Board, Column, Card, Task, Tag, CardTemplate, CardTransition, SearchEntry
+
+# Linhas por INSERT em lote (e por leitura das linhas de origem)
+BATCH_SIZE = 1000
+
+CARD_FIELDS = ('title', 'description', 'position', 'start_date', 'due_date', 'priority')
+TEMPLATE_FIELDS = ('name', 'title', 'description', 'priority', 'tasks', 'tags')
+
+
+# As cópias são feitas com bulk_create, que não dispara signals: o índice de busca, o log
+# de movimentações (criação dos cartões) e os contadores são preenchidos aqui, em lote.
+
+def _batches(rows, size):
+    rows = iter(rows)
+    while batch := list(islice(rows, size)):
+        yield batch
+
+
+def _index(board_id, cards=(), tasks=()):
+    SearchEntry.objects.bulk_create(
+        [SearchEntry(kind='card', object_id=card.id, fk_card_id=card.id, fk_board_id=board_id,
+                     title=card.title, body=card.description or '') for card in cards] +
+        [SearchEntry(kind='task', object_id=task.id, fk_card_id=task.fk_card_id, fk_board_id=board_id,
+                     title=task.title) for task in tasks],
+        batch_size=BATCH_SIZE,
+    )
+
+
+def _record_created(board_id, cards):
+    CardTransition.objects.bulk_create(
+        [CardTransition(card_id=card.id, fk_board_id=board_id, to_column=card.fk_column_id) for card in cards],
+        batch_size=BATCH_SIZE,
+    )
+
+
+def clone_board(board, user, name=None, cards=True, tasks=True, reset_progress=True, batch_size=BATCH_SIZE):
+    """
+    Copia o quadro numa única transação: colunas, tags, modelos de cartão e, opcionalmente,
+    cartões, tarefas (concluídas voltam a pendentes com `reset_progress`) e vínculos de tags.
+    As linhas de origem são lidas em lotes e inseridas com bulk_create; os novos ids ficam
+    em dicionários (id de origem -> id da cópia) para remapear as chaves dos filhos.
+    O novo quadro é de `user`, sem colaboradores; responsáveis pelos cartões não são copiados.
+    """
+    with transaction.atomic():
+        new_board = Board.objects.create(name=name or f'{board.name} (cópia)', fk_user=user)
+
+        columns = list(Column.objects.filter(fk_board=board).order_by('position', 'id').values('id', 'name', 'position'))
+        created = Column.objects.bulk_create(
+            [Column(fk_board=new_board, fk_user=user, name=row['name'], position=row['position']) for row in columns],
+            batch_size=batch_size,
+        )
+        column_map = {row['id']: column.id for row, column in zip(columns, created)}
+
+        tags = list(Tag.objects.filter(fk_board=board).order_by('id').values('id', 'name', 'color'))
+        created = Tag.objects.bulk_create(
+            [Tag(fk_board=new_board, name=row['name'], color=row['color']) for row in tags], batch_size=batch_size,
+        )
+        tag_map = {row['id']: tag.id for row, tag in zip(tags, created)}
+
+        CardTemplate.objects.bulk_create(
+            [CardTemplate(fk_board=new_board, fk_user=user, **row)
+             for row in CardTemplate.objects.filter(fk_board=board).order_by('id').values(*TEMPLATE_FIELDS)],
+            batch_size=batch_size,
+        )
+
+        if cards:
+            card_map = _clone_cards(board, new_board, user, column_map, batch_size)
+            if tasks:
+                _clone_tasks(board, new_board, card_map, reset_progress, batch_size)
+            # Só os vínculos com tags deste quadro (as copiadas em tag_map): um cartão trazido de
+            # outro quadro pode ainda carregar tags de lá
+            TagCard = Tag.cards.through
+            links = TagCard.objects.filter(card__fk_column__fk_board=board, tag__fk_board=board).order_by('id').values_list(
+                'tag_id', 'card_id',
+            )
+            for batch in _batches(links.iterator(chunk_size=batch_size), batch_size):
+                TagCard.objects.bulk_create(
+                    [TagCard(tag_id=tag_map[tag_id], card_id=card_map[card_id]) for tag_id, card_id in batch],
+                    batch_size=batch_size,
+                )
+            counters.recompute(boards=[new_board.id])
+    return new_board
+
+
+def _clone_cards(board, new_board, user, column_map, batch_size):
+    card_map = {}
+    rows = Card.objects.filter(fk_column__fk_board=board).order_by('id').values('id', 'fk_column_id', *CARD_FIELDS)
+    for batch in _batches(rows.iterator(chunk_size=batch_size), batch_size):
+        created = Card.objects.bulk_create(
+            [Card(fk_column_id=column_map[row['fk_column_id']], fk_user=user, **{field: row[field] for field in CARD_FIELDS})
+             for row in batch],
+            batch_size=batch_size,
+        )
+        card_map.update((row['id'], card.id) for row, card in zip(batch, created))
+        _index(new_board.id, cards=created)
+        _record_created(new_board.id, created)
+    return card_map
+
+
+def _clone_tasks(board, new_board, card_map, reset_progress, batch_size):
+    rows = Task.objects.filter(fk_card__fk_column__fk_board=board).order_by('id').values(
+        'fk_card_id', 'title', 'position', 'completed', 'completed_at',
+    )
+    for batch in _batches(rows.iterator(chunk_size=batch_size), batch_size):
+        created = Task.objects.bulk_create(
+            [Task(fk_card_id=card_map[row['fk_card_id']], title=row['title'], position=row['position'],
+                  completed=row['completed'] and not reset_progress,
+                  completed_at=None if reset_progress else row['completed_at'])
+             for row in batch],
+            batch_size=batch_size,
+        )
+        _index(new_board.id, tasks=created)
+
+
+def instantiate_template(template, column, user, count=1):
+    """
+    Cria `count` cartões do modelo no fim da coluna, com as tarefas (pendentes) e as tags
+    do quadro da coluna cujo nome coincide com as do modelo. Devolve os cartões criados.
+    """
+    with transaction.atomic():
+        last = Card.objects.filter(fk_column=column).aggregate(last=Max('position'))['last']
+        first = 0 if last is None else last + 1
+        cards = Card.objects.bulk_create([
+            Card(fk_column=column, fk_user=user, title=template.title, description=template.description,
+                 priority=template.priority, position=first + offset, tasks_total=len(template.tasks))
+            for offset in range(count)
+        ])
+        tasks = Task.objects.bulk_create([
+            Task(fk_card=card, title=title, position=position)
+            for card in cards for position, title in enumerate(template.tasks)
+        ], batch_size=BATCH_SIZE)
+
+        names = {name.lower() for name in template.tags}
+        tag_ids = list(Tag.objects.annotate(lower_name=Lower('name')).filter(
+            fk_board_id=column.fk_board_id, lower_name__in=names,
+        ).values_list('id', flat=True)) if names else []
+        TagCard = Tag.cards.through
+        TagCard.objects.bulk_create(
+            [TagCard(tag_id=tag_id, card_id=card.id) for card in cards for tag_id in tag_ids], batch_size=BATCH_SIZE,
+        )
+
+        _index(column.fk_board_id, cards=cards, tasks=tasks)
+        _record_created(column.fk_board_id, cards)
+        counters.cards_created(column.id, count, urgent=count if template.priority == counters.URGENT else 0)
+    return cards
@@ -0,0 +1,52 @@
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+from .models import VersionConflict
+
+
+class PreconditionFailed(APIException):
+    status_code = status.HTTP_412_PRECONDITION_FAILED
+    default_detail = 'O registro foi alterado por outra requisição. Recarregue-o e tente novamente.'
+    default_code = 'precondition_failed'
+
+
+def etag(version):
+    return f'"{version}"'
+
+
+def check_if_match(request, instance):
+    """Recusa a escrita se o If-Match enviado não corresponde à versão atual do registro."""
+    header = request.headers.get('If-Match')
+    if not header:
+        return
+    tags = [tag.removeprefix('W/') for tag in parse_etags(header)]
+    if '*' not in tags and etag(instance.version) not in tags:
+        raise PreconditionFailed()
+
+
+class OptimisticConcurrencyMixin:
+    """
+    Para viewsets de modelos com `version` (VersionedModel): respostas de detalhe
+    levam o ETag da versão; PUT/PATCH/DELETE aceitam If-Match e respondem 412
+    se o registro mudou, seja antes da leitura (If-Match) ou entre a leitura e o
+    UPDATE condicional (VersionConflict). Nenhuma linha fica travada.
+    """
+
+    def perform_update(self, serializer):
+        check_if_match(self.request, serializer.instance)
+        try:
+            super().perform_update(serializer)
+        except VersionConflict:
+            raise PreconditionFailed()
+
+    def perform_destroy(self, instance):
+        check_if_match(self.request, instance)
+        super().perform_destroy(instance)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        data = getattr(response, 'data', None)
+        if (self.detail or self.action == 'create') and response.status_code < 300 and isinstance(data, dict) and 'version' in data:
+            response['ETag'] = etag(data['version'])
+        return response
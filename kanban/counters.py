@@ -0,0 +1,113 @@
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from .models import Board, Column, Card, Task
+
+URGENT = 'U'
+
+
+# --- Atualizações incrementais (chamadas pelos signals em kanban/signals.py) ---
+#
+# Cada alteração vira um UPDATE ... SET contador = contador +/- n, sem ler o valor atual,
+# executado na mesma transação do save/delete que o originou. Os decrementos param em zero:
+# os contadores são PositiveIntegerField, e um valor já dessincronizado (corrigido depois por
+# manage.py recompute_counters) não pode fazer o CHECK do banco derrubar o save/delete.
+
+def _add(queryset, **deltas):
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if deltas:
+        queryset.update(**{
+            field: F(field) + delta if delta > 0 else Greatest(F(field) + delta, Value(0))
+            for field, delta in deltas.items()
+        })
+
+
+def snapshot_card(card):
+    return (card.fk_column_id, card.priority)
+
+
+def snapshot_task(task):
+    return (task.fk_card_id, task.completed)
+
+
+def card_changed(previous, current):
+    # `previous` é None na criação e `current` é None na remoção
+    old_column, old_priority = previous or (None, None)
+    new_column, new_priority = current or (None, None)
+    if old_column != new_column:
+        if old_column:
+            _add(Column.objects.filter(id=old_column), card_count=-1)
+        if new_column:
+            _add(Column.objects.filter(id=new_column), card_count=1)
+    was_urgent = old_priority == URGENT
+    is_urgent = new_priority == URGENT
+    if old_column != new_column or was_urgent != is_urgent:
+        if was_urgent and old_column:
+            _add(Board.objects.filter(columns=old_column), urgent_card_count=-1)
+        if is_urgent and new_column:
+            _add(Board.objects.filter(columns=new_column), urgent_card_count=1)
+
+
+def task_changed(previous, current):
+    old_card, old_completed = previous or (None, False)
+    new_card, new_completed = current or (None, False)
+    if old_card == new_card:
+        if old_card:
+            _add(Card.objects.filter(id=old_card), tasks_completed=int(new_completed) - int(old_completed))
+        return
+    if old_card:
+        _add(Card.objects.filter(id=old_card), tasks_total=-1, tasks_completed=-int(old_completed))
+    if new_card:
+        _add(Card.objects.filter(id=new_card), tasks_total=1, tasks_completed=int(new_completed))
+
+
+def cards_created(column_id, count, urgent=0):
+    # Cartões inseridos em lote (bulk_create não dispara os signals): `urgent` deles são urgentes
+    _add(Column.objects.filter(id=column_id), card_count=count)
+    _add(Board.objects.filter(columns=column_id), urgent_card_count=urgent)
+
+
+# --- Recalculo em massa (manage.py recompute_counters) ---
+
+def _count(queryset, group_by):
+    return Coalesce(
+        Subquery(
+            queryset.filter(**{group_by: OuterRef('pk')}).order_by().values(group_by)
+            .annotate(total=Count('id')).values('total'),
+            output_field=IntegerField(),
+        ),
+        Value(0),
+    )
+
+
+def recompute(boards=None):
+    """Recalcula todos os contadores (ou os dos quadros informados) com um UPDATE por tabela."""
+    columns = Column.objects.all()
+    cards = Card.objects.all()
+    board_qs = Board.objects.all()
+    if boards is not None:
+        columns = columns.filter(fk_board__in=boards)
+        cards = cards.filter(fk_column__fk_board__in=boards)
+        board_qs = board_qs.filter(id__in=boards)
+
+    columns.update(card_count=_count(Card.objects.all(), 'fk_column'))
+    cards.update(
+        tasks_total=_count(Task.objects.all(), 'fk_card'),
+        tasks_completed=_count(Task.objects.filter(completed=True), 'fk_card'),
+    )
+    board_qs.update(urgent_card_count=_count(Card.objects.filter(priority=URGENT), 'fk_column__fk_board'))
+
+
+def board_stats(board, now):
+    columns = list(board.columns.order_by('position', 'id').values('id', 'name', 'position', 'card_count'))
+    return {
+        'board': board.id,
+        'card_count': sum(column['card_count'] for column in columns),
+        'urgent_card_count': board.urgent_card_count,
+        # Atraso depende do instante da consulta, então não é desnormalizado: a contagem
+        # percorre apenas a faixa due_date < now do índice (fk_column, due_date).
+        'overdue_card_count': Card.objects.filter(
+            fk_column__in=[column['id'] for column in columns], due_date__lt=now,
+        ).count(),
+        'columns': columns,
+    }
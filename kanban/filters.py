@@ -0,0 +1,58 @@
+import django_filters
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from .models import Card, Tag
+
+
+class CardOrderingFilter(django_filters.OrderingFilter):
+    def filter(self, qs, value):
+        qs = super().filter(qs, value)
+        if value:
+            # Desempate estável para a paginação
+            qs = qs.order_by(*qs.query.order_by, 'id')
+        return qs
+
+
+class NumberInFilter(django_filters.BaseInFilter, django_filters.NumberFilter):
+    pass
+
+
+# Filtros da listagem de cartões. Todos viram condições SQL sobre colunas indexadas
+# (FKs, tabela de junção das tags, índices de Card.Meta.indexes).
+class CardFilter(django_filters.FilterSet):
+    board = django_filters.NumberFilter(field_name='fk_column__fk_board')
+    column = django_filters.NumberFilter(field_name='fk_column')
+    assignee = django_filters.NumberFilter(field_name='fk_assigned_user')
+    priority = django_filters.MultipleChoiceFilter(choices=Card.PRIORITY_CHOICES)
+    tag = django_filters.NumberFilter(field_name='tags')
+    # Cartões com qualquer uma das tags (?tags=1,2): EXISTS no índice (tag, cartão) da tabela de junção,
+    # sem JOIN que repetiria o cartão e exigiria DISTINCT
+    tags = NumberInFilter(method='filter_tags')
+    due = django_filters.IsoDateTimeFromToRangeFilter(field_name='due_date')
+    overdue = django_filters.BooleanFilter(method='filter_overdue')
+
+    ordering = CardOrderingFilter(
+        fields=(
+            ('position', 'position'),
+            ('due_date', 'due_date'),
+            # Ordem de prioridade (Urgente primeiro) pela coluna gerada Card.priority_rank: a ordem
+            # alfabética dos códigos não serve
+            ('priority_rank', 'priority'),
+        ),
+    )
+
+    class Meta:
+        model = Card
+        fields = ['board', 'column', 'assignee', 'priority', 'tag', 'tags', 'due', 'overdue']
+
+    def filter_tags(self, queryset, name, value):
+        if not value:
+            return queryset
+        return queryset.filter(Exists(Tag.cards.through.objects.filter(tag_id__in=value, card_id=OuterRef('pk'))))
+
+    def filter_overdue(self, queryset, name, value):
+        now = timezone.now()
+        if value:
+            return queryset.filter(due_date__lt=now)
+        return queryset.exclude(due_date__lt=now)
@@ -0,0 +1,173 @@
+import functools
+import hashlib
+import json
+import threading
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.files.uploadedfile import UploadedFile
+from django.utils.datastructures import MultiValueDict
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.response import Response
+
+HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+# Cache onde ficam as chaves (KANBAN_IDEMPOTENCY_CACHE) e por quanto tempo a resposta é reaproveitada
+CACHE_ALIAS = 'idempotency'
+TTL = 60 * 60 * 24
+# Validade da reserva da chave enquanto a primeira requisição é processada. A reserva é
+# renovada a cada terço desse tempo até a requisição terminar, então uma requisição longa
+# nunca roda duas vezes; se o worker morrer, a chave fica livre no máximo esse tempo depois.
+PENDING_TIMEOUT = 60
+# Headers da resposta original repetidos na reprodução (Content-Type vem do renderer negociado)
+REPLAYED_HEADERS = ('Location', 'Upload-Offset', 'Upload-Length')
+
+_PENDING = 'pending'
+_DONE = 'done'
+
+
+class IdempotencyConflict(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = 'Uma requisição com este Idempotency-Key ainda está em andamento. Tente novamente em instantes.'
+    default_code = 'idempotency_conflict'
+
+
+class IdempotencyKeyReused(APIException):
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    default_detail = 'Este Idempotency-Key já foi usado com outra requisição (endpoint ou corpo diferentes).'
+    default_code = 'idempotency_key_reused'
+
+
+def _cache():
+    return caches[getattr(settings, 'KANBAN_IDEMPOTENCY_CACHE', CACHE_ALIAS)]
+
+
+def _ttl():
+    ttl = getattr(settings, 'KANBAN_IDEMPOTENCY_TTL', TTL)
+    return int(ttl.total_seconds()) if hasattr(ttl, 'total_seconds') else int(ttl)
+
+
+def _canonical(value):
+    # Corpo já interpretado pelo parser (JSON, form, multipart, MessagePack, CBOR) num formato estável
+    if isinstance(value, MultiValueDict):
+        return {str(key): [_canonical(item) for item in items] for key, items in value.lists()}
+    if isinstance(value, dict):
+        return {str(key): _canonical(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    if isinstance(value, UploadedFile):
+        digest = hashlib.sha256()
+        for chunk in value.chunks():
+            digest.update(chunk)
+        value.seek(0)
+        return {'file': value.name, 'size': value.size, 'sha256': digest.hexdigest()}
+    return value
+
+
+def fingerprint(request):
+    payload = json.dumps([request.method, request.get_full_path(), _canonical(request.data)], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _plain(data):
+    # ReturnDict/ReturnList guardam o serializer: no cache ficam só dicts e listas
+    if isinstance(data, dict):
+        return {key: _plain(value) for key, value in data.items()}
+    if isinstance(data, list):
+        return [_plain(value) for value in data]
+    return data
+
+
+def _store_key(request, key):
+    return f'kanban:idempotency:{request.user.pk}:{hashlib.sha256(key.encode()).hexdigest()}'
+
+
+def _release(cache, store_key):
+    try:
+        cache.delete(store_key)
+    except Exception:
+        pass
+
+
+def _keep_reserved(store_key, done):
+    # Roda numa thread à parte durante a primeira requisição
+    while not done.wait(PENDING_TIMEOUT / 3):
+        try:
+            _cache().touch(store_key, PENDING_TIMEOUT)
+        except Exception:
+            pass
+
+
+def idempotent(method):
+    """
+    Torna a criação repetível com o header Idempotency-Key: a primeira requisição
+    reserva a chave (por usuário) e, se der certo (2xx), a resposta fica no cache
+    por KANBAN_IDEMPOTENCY_TTL; as repetições com a mesma chave e o mesmo corpo
+    recebem a resposta guardada (com `Idempotent-Replayed: true`) sem validar nem
+    gravar nada. Mesma chave com outro corpo ou endpoint: 422; com a primeira ainda
+    em andamento: 409. Erros não ficam guardados, e a chave volta a ficar livre.
+    Sem o header, para anônimos ou com o cache fora do ar, a requisição segue normal.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, request, *args, **kwargs):
+        key = request.headers.get(HEADER)
+        if key is None or not request.user.is_authenticated:
+            return method(self, request, *args, **kwargs)
+        if not key or len(key) > MAX_KEY_LENGTH or not key.isprintable():
+            raise ValidationError({HEADER: f'Informe uma chave de 1 a {MAX_KEY_LENGTH} caracteres imprimíveis.'})
+
+        cache = _cache()
+        store_key = _store_key(request, key)
+        request_fingerprint = fingerprint(request)
+        try:
+            reserved = cache.add(store_key, (_PENDING, request_fingerprint), PENDING_TIMEOUT)
+            entry = None if reserved else cache.get(store_key)
+        except Exception:
+            return method(self, request, *args, **kwargs)
+
+        if not reserved:
+            if entry is None:
+                # A chave expirou entre o add e o get: trata como em andamento, o cliente repete
+                raise IdempotencyConflict()
+            state, stored_fingerprint, *stored = entry
+            if stored_fingerprint != request_fingerprint:
+                raise IdempotencyKeyReused()
+            if state == _PENDING:
+                raise IdempotencyConflict()
+            status_code, data, headers = stored
+            response = Response(data, status=status_code, headers=headers)
+            response['Idempotent-Replayed'] = 'true'
+            return response
+
+        done = threading.Event()
+        keeper = threading.Thread(target=_keep_reserved, args=(store_key, done), daemon=True)
+        keeper.start()
+        try:
+            response = method(self, request, *args, **kwargs)
+        except BaseException:
+            _release(cache, store_key)
+            raise
+        finally:
+            done.set()
+            keeper.join()
+        if 200 <= response.status_code < 300:
+            headers = {name: response[name] for name in REPLAYED_HEADERS if response.has_header(name)}
+            try:
+                cache.set(store_key, (_DONE, request_fingerprint, response.status_code, _plain(response.data), headers), _ttl())
+            except Exception:
+                pass
+        else:
+            _release(cache, store_key)
+        return response
+
+    return wrapper
+
+
+class IdempotencyMixin:
+    """Aceita Idempotency-Key no POST de criação do viewset (ver `idempotent`)."""
+
+    @idempotent
+    def create(self, request, *args, **kwargs):
+        return super().create(request, *args, **kwargs)
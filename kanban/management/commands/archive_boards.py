@@ -0,0 +1,64 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from kanban import archive
+from kanban.models import Board, BoardArchive
+
+
+class Command(BaseCommand):
+    help = (
+        'Arquiva os quadros inativos (conteúdo comprimido fora das tabelas ativas), '
+        'restaura quadros arquivados ou conclui arquivamentos interrompidos.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--inactive-days', type=int, default=180,
+                            help='Arquiva quadros sem atualização nem atividade há N dias.')
+        parser.add_argument('--limit', type=int, help='Máximo de quadros arquivados nesta execução.')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Linhas removidas por transação.')
+        parser.add_argument('--dry-run', action='store_true', help='Apenas lista os quadros que seriam arquivados.')
+        parser.add_argument('--restore', type=int, nargs='+', metavar='BOARD_ID', help='Restaura os quadros informados.')
+
+    def handle(self, *args, **options):
+        if options['restore']:
+            return self.restore(options['restore'])
+
+        # Arquivamentos interrompidos no meio da remoção das linhas ativas
+        for stored in BoardArchive.objects.filter(complete=False):
+            archive.finish(stored, batch_size=options['batch_size'])
+            self.stdout.write(f'Quadro {stored.fk_board_id}: arquivamento concluído.')
+
+        before = timezone.now() - timedelta(days=options['inactive_days'])
+        boards = archive.inactive_boards(before)
+        if options['limit']:
+            boards = boards[:options['limit']]
+        archived = 0
+        for board in boards:
+            if options['dry_run']:
+                self.stdout.write(f'Quadro {board.id} ({board.name}) seria arquivado.')
+                continue
+            try:
+                stored = archive.archive_board(board, batch_size=options['batch_size'])
+            except archive.ArchiveError as exc:
+                self.stderr.write(f'Quadro {board.id}: {exc}')
+                continue
+            archived += 1
+            self.stdout.write(
+                f'Quadro {board.id}: {sum(stored.counts.values())} linhas, '
+                f'{stored.raw_size} -> {len(stored.data)} bytes.'
+            )
+        self.stdout.write(self.style.SUCCESS(f'{archived} quadros arquivados.'))
+
+    def restore(self, ids):
+        boards = Board.objects.filter(id__in=ids, archived_at__isnull=False)
+        if not boards:
+            raise CommandError('Nenhum dos quadros informados está arquivado.')
+        for board in boards:
+            try:
+                archive.restore_board(board)
+            except archive.ArchiveError as exc:
+                self.stderr.write(f'Quadro {board.id}: {exc}')
+                continue
+            self.stdout.write(f'Quadro {board.id} restaurado.')
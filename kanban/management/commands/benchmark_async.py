@@ -0,0 +1,111 @@
+import asyncio
+import base64
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import AsyncClient, Client
+
+
+class Command(BaseCommand):
+    help = (
+        'Compara, em processo, a capacidade de conexões simultâneas das rotas síncronas (WSGI, '
+        'limitadas a um pool de threads) e assíncronas (ASGI, /async/...). Usa a autenticação '
+        'Basic real, então o custo do hash de senha entra nos números dos dois lados.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--login', required=True, help='Usuário usado nas requisições.')
+        parser.add_argument('--password', required=True)
+        parser.add_argument('--path', default='cards/', help='Rota comparada (sem a barra inicial). Padrão: cards/')
+        parser.add_argument('--concurrency', default='1,8,32,128',
+                            help='Níveis de conexões simultâneas, separados por vírgula.')
+        parser.add_argument('--requests', type=int, default=200, help='Requisições por nível.')
+        parser.add_argument('--threads', type=int, default=8,
+                            help='Threads do servidor WSGI simulado (equivalente a workers x threads).')
+
+    def handle(self, *args, **options):
+        try:
+            levels = [int(value) for value in options['concurrency'].split(',') if value.strip()]
+        except ValueError:
+            raise CommandError('--concurrency deve ser uma lista de inteiros.')
+        if not levels or min(levels) < 1 or options['requests'] < 1 or options['threads'] < 1:
+            raise CommandError('Concorrência, requisições e threads devem ser positivos.')
+
+        credentials = base64.b64encode(f"{options['login']}:{options['password']}".encode()).decode()
+        headers = {'Authorization': f'Basic {credentials}'}
+        path = options['path'].strip('/')
+        sync_path, async_path = f'/{path}/', f'/async/{path}/'
+
+        # Aquecimento e validação das credenciais/rotas antes de medir
+        for label, status in (('WSGI', Client().get(sync_path, headers=headers).status_code),
+                              ('ASGI', asyncio.run(AsyncClient().get(async_path, headers=headers)).status_code)):
+            if status != 200:
+                raise CommandError(f'{label}: resposta {status} no aquecimento; verifique a rota e as credenciais.')
+
+        self.stdout.write(f"{'modo':<6}{'conexões':>10}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'erros':>8}")
+        for concurrency in levels:
+            for label, runner in (('WSGI', self.run_wsgi), ('ASGI', self.run_asgi)):
+                path = sync_path if label == 'WSGI' else async_path
+                elapsed, latencies, errors = runner(path, headers, concurrency, options)
+                self.stdout.write(
+                    f'{label:<6}{concurrency:>10}{len(latencies) / elapsed:>10.1f}'
+                    f'{_percentile(latencies, 50):>10.1f}{_percentile(latencies, 95):>10.1f}{errors:>8}'
+                )
+
+    def run_wsgi(self, path, headers, concurrency, options):
+        # Cada conexão espera uma thread livre do pool, como num servidor WSGI com threads
+        local = threading.local()
+        pool = ThreadPoolExecutor(max_workers=options['threads'])
+        gate = threading.Semaphore(concurrency)
+
+        def request(queued):
+            if not hasattr(local, 'client'):
+                local.client = Client()
+            try:
+                status = local.client.get(path, headers=headers).status_code
+            finally:
+                gate.release()
+            return time.perf_counter() - queued, status
+
+        def close():
+            connections.close_all()
+
+        started = time.perf_counter()
+        futures = []
+        for _ in range(options['requests']):
+            gate.acquire()
+            futures.append(pool.submit(request, time.perf_counter()))
+        results = [future.result() for future in futures]
+        elapsed = time.perf_counter() - started
+        for _ in range(options['threads']):
+            pool.submit(close)
+        pool.shutdown()
+        return elapsed, [latency for latency, _ in results], sum(status != 200 for _, status in results)
+
+    def run_asgi(self, path, headers, concurrency, options):
+        async def run():
+            client = AsyncClient()
+            gate = asyncio.Semaphore(concurrency)
+
+            async def request():
+                async with gate:
+                    queued = time.perf_counter()
+                    response = await client.get(path, headers=headers)
+                    return time.perf_counter() - queued, response.status_code
+
+            started = time.perf_counter()
+            results = await asyncio.gather(*(request() for _ in range(options['requests'])))
+            return time.perf_counter() - started, results
+
+        elapsed, results = asyncio.run(run())
+        return elapsed, [latency for latency, _ in results], sum(status != 200 for _, status in results)
+
+
+def _percentile(values, percent):
+    if len(values) < 2:
+        return values[0] * 1000 if values else 0.0
+    return statistics.quantiles(values, n=100, method='inclusive')[percent - 1] * 1000
@@ -0,0 +1,87 @@
+import gzip
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count
+from rest_framework.renderers import JSONRenderer
+
+from kanban import archive
+from kanban.middleware import COMPRESS_LEVEL, COMPRESS_MIN_SIZE
+from kanban.models import Board, Card, Tag
+from kanban.serializers import CardSerializer, TagSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        'Mede o custo de CPU da compressão gzip das respostas por nível: tamanho final, '
+        'taxa de compressão e tempo para comprimir e descomprimir payloads reais de um quadro.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--board', type=int, help='Quadro medido (padrão: o ativo com mais cartões).')
+        parser.add_argument('--levels', default='1,6,9', help='Níveis do gzip comparados, separados por vírgula.')
+        parser.add_argument('--runs', type=int, default=20, help='Repetições por medida (mediana).')
+
+    def handle(self, *args, **options):
+        try:
+            levels = [int(level) for level in options['levels'].split(',')]
+        except ValueError:
+            raise CommandError('Informe os níveis como inteiros separados por vírgula (ex.: 1,6,9).')
+        if options['runs'] < 1 or not all(1 <= level <= 9 for level in levels):
+            raise CommandError('Informe níveis entre 1 e 9 e um número positivo de repetições.')
+        board = self._board(options['board'])
+
+        minimum = getattr(settings, 'KANBAN_COMPRESS_MIN_SIZE', COMPRESS_MIN_SIZE)
+        self.stdout.write(
+            f'Quadro {board.id} ({board.name}); em uso: nível {COMPRESS_LEVEL}, mínimo {minimum} bytes; '
+            f'mediana de {options["runs"]} execuções'
+        )
+        self.stdout.write(
+            f"{'payload':<10} {'nível':>5} {'bytes':>10} {'gzip':>9} {'taxa':>6} "
+            f"{'comprime ms':>12} {'MB/s':>8} {'descomprime ms':>15}"
+        )
+        for label, payload in self._payloads(board):
+            if len(payload) < minimum:
+                self.stdout.write(f'{label:<10} {"-":>5} {len(payload):>10} {"(abaixo do mínimo: não é comprimido)":>30}')
+                continue
+            for level in levels:
+                compressed = gzip.compress(payload, compresslevel=level, mtime=0)
+                compress_ms = self._time(lambda: gzip.compress(payload, compresslevel=level, mtime=0), options['runs'])
+                decompress_ms = self._time(lambda: gzip.decompress(compressed), options['runs'])
+                throughput = len(payload) / 1024 / 1024 / (compress_ms / 1000) if compress_ms else 0
+                self.stdout.write(
+                    f'{label:<10} {level:>5} {len(payload):>10} {len(compressed):>9} '
+                    f'{len(compressed) / len(payload):>6.1%} {compress_ms:>12.2f} {throughput:>8.1f} {decompress_ms:>15.2f}'
+                )
+
+    def _board(self, board_id):
+        boards = Board.objects.alive()
+        if board_id:
+            board = boards.filter(id=board_id).first()
+        else:
+            board = boards.annotate(cards=Count('columns__cards')).order_by('-cards', 'id').first()
+        if board is None:
+            raise CommandError('Nenhum quadro ativo encontrado.')
+        return board
+
+    def _payloads(self, board):
+        # Corpos como a API os envia (JSON), do maior para o menor
+        renderer = JSONRenderer()
+        cards = CardSerializer.optimize(Card.objects.filter(fk_column__fk_board=board)).order_by('fk_column', 'position', 'id')
+        tags = Tag.objects.filter(fk_board=board).prefetch_related('cards').order_by('name', 'id')
+        return (
+            ('snapshot', gzip.decompress(archive.snapshot(board))),
+            ('cartões', renderer.render(CardSerializer(cards, many=True).data)),
+            ('página', renderer.render(CardSerializer(cards[:5], many=True).data)),
+            ('tags', renderer.render(TagSerializer(tags, many=True).data)),
+        )
+
+    def _time(self, function, runs):
+        samples = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            function()
+            samples.append((time.perf_counter() - started) * 1000)
+        return statistics.median(samples)
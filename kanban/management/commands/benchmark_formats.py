@@ -0,0 +1,94 @@
+import gzip
+import json
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+from rest_framework.test import APIRequestFactory
+
+from kanban import archive
+from kanban.models import Board, Card
+from kanban.serializers import CardSerializer
+
+
+def _decoder(renderer):
+    if renderer.format == 'msgpack':
+        import msgpack
+        return lambda data: msgpack.unpackb(data, timestamp=3)
+    if renderer.format == 'cbor':
+        import cbor2
+        return cbor2.loads
+    return json.loads
+
+
+class Command(BaseCommand):
+    help = (
+        'Compara JSON com os formatos binários registrados (MessagePack/CBOR) no snapshot de um quadro '
+        'e na lista de cartões dele: tamanho (cru e com gzip) e tempo de codificação e decodificação.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--board', type=int, help='Quadro medido (padrão: o ativo com mais cartões).')
+        parser.add_argument('--runs', type=int, default=20, help='Repetições por medida (mediana).')
+
+    def handle(self, *args, **options):
+        if options['runs'] < 1:
+            raise CommandError('Informe um número positivo de repetições.')
+        board = self._board(options['board'])
+        renderers = [JSONRenderer()] + [
+            renderer_class() for renderer_class in api_settings.DEFAULT_RENDERER_CLASSES
+            if getattr(renderer_class, 'native_datetimes', False)
+        ]
+        if len(renderers) == 1:
+            self.stdout.write(self.style.WARNING(
+                f'Nenhum formato binário registrado (instale msgpack e/ou cbor2); KANBAN_BINARY_FORMATS={settings.KANBAN_BINARY_FORMATS}'
+            ))
+
+        self.stdout.write(f'Quadro {board.id} ({board.name}), mediana de {options["runs"]} execuções')
+        self.stdout.write(f"{'payload':<10} {'formato':<8} {'bytes':>10} {'gzip':>9} {'codifica ms':>12} {'decodifica ms':>14}")
+        for label, build in (('snapshot', self._snapshot), ('cartões', self._cards)):
+            for renderer in renderers:
+                data = build(board, renderer)
+                encoded = renderer.render(data)
+                decode = _decoder(renderer)
+                encode_ms = self._time(lambda: renderer.render(data), options['runs'])
+                decode_ms = self._time(lambda: decode(encoded), options['runs'])
+                self.stdout.write(
+                    f'{label:<10} {renderer.format:<8} {len(encoded):>10} {len(gzip.compress(encoded)):>9} '
+                    f'{encode_ms:>12.2f} {decode_ms:>14.2f}'
+                )
+
+    def _board(self, board_id):
+        boards = Board.objects.alive()
+        if board_id:
+            board = boards.filter(id=board_id).first()
+        else:
+            board = boards.annotate(cards=Count('columns__cards')).order_by('-cards', 'id').first()
+        if board is None:
+            raise CommandError('Nenhum quadro ativo encontrado.')
+        return board
+
+    def _snapshot(self, board, renderer):
+        if getattr(renderer, 'native_datetimes', False):
+            return archive.snapshot_document(board)
+        return json.loads(gzip.decompress(archive.snapshot(board)))
+
+    def _cards(self, board, renderer):
+        # Mesma serialização da listagem, sem paginação, com o renderer já negociado na requisição
+        request = Request(APIRequestFactory().get('/'))
+        request.accepted_renderer = renderer
+        cards = CardSerializer.optimize(Card.objects.filter(fk_column__fk_board=board)).order_by('fk_column', 'position', 'id')
+        return CardSerializer(cards, many=True, context={'request': request}).data
+
+    def _time(self, function, runs):
+        samples = []
+        for _ in range(runs):
+            started = time.perf_counter()
+            function()
+            samples.append((time.perf_counter() - started) * 1000)
+        return statistics.median(samples)
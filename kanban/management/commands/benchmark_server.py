@@ -0,0 +1,251 @@
+import base64
+import http.client
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from importlib.util import find_spec
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.utils import get_random_secret_key
+
+HOST = '127.0.0.1'
+
+
+def _percentile(values, percent):
+    if len(values) < 2:
+        return values[0] * 1000 if values else 0.0
+    return statistics.quantiles(values, n=100, method='inclusive')[percent - 1] * 1000
+
+
+def _connection(port, paths, headers, offset, start_at, end_at, results):
+    # Uma conexão HTTP/1.1 em laço pelas rotas; o http.client reconecta se o worker fechar (sync)
+    connection = http.client.HTTPConnection(HOST, port, timeout=30)
+    latencies, errors, index = [], 0, offset
+    time.sleep(max(start_at - time.time(), 0))
+    while time.time() < end_at:
+        path = paths[index % len(paths)]
+        index += 1
+        started = time.perf_counter()
+        try:
+            connection.request('GET', path, headers=headers)
+            response = connection.getresponse()
+            response.read()
+            ok = response.status == 200
+        except (OSError, http.client.HTTPException):
+            connection.close()
+            ok = False
+        if ok:
+            latencies.append(time.perf_counter() - started)
+        else:
+            errors += 1
+    connection.close()
+    results.append((latencies, errors))
+
+
+def _client(port, paths, headers, connections, first, start_at, end_at):
+    # Roda num processo do gerador de carga: `connections` conexões simultâneas, uma por thread
+    results = []
+    threads = [
+        threading.Thread(target=_connection, args=(port, paths, headers, first + number, start_at, end_at, results))
+        for number in range(connections)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return [latency for latencies, _ in results for latency in latencies], sum(errors for _, errors in results)
+
+
+def _rss_mb(pid):
+    # Memória do mestre e dos workers do gunicorn (Linux, /proc); None em outros sistemas
+    total = 0
+    try:
+        for entry in os.listdir('/proc'):
+            if not entry.isdigit():
+                continue
+            try:
+                with open(f'/proc/{entry}/status') as status:
+                    fields = dict(line.split(':', 1) for line in status if ':' in line)
+            except OSError:
+                continue
+            if int(entry) == pid or int(fields.get('PPid', 0)) == pid:
+                total += int(fields.get('VmRSS', '0 kB').split()[0])
+    except OSError:
+        return None
+    return total / 1024
+
+
+class Command(BaseCommand):
+    help = (
+        'Sobe o gunicorn (setup/gunicorn.conf.py, perfil de produção) com cada combinação de workers e '
+        'threads, aplica carga HTTP de leitura por um tempo fixo e informa req/s, latências (p50/p95/p99), '
+        'erros e memória, indicando a combinação com maior vazão. Use com o dataset de manage.py '
+        'seed_benchmark. O gerador de carga roda na mesma máquina e disputa as CPUs com o servidor, e a '
+        'autenticação Basic real (hash de senha a cada requisição) entra nos números.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--login', default='bench', help='Usuário das requisições (padrão: o de seed_benchmark).')
+        parser.add_argument('--password', required=True)
+        parser.add_argument('--workers', default='1,2,4', help='Processos do gunicorn, separados por vírgula.')
+        parser.add_argument('--threads', default='1,4', help='Threads por processo, separadas por vírgula.')
+        parser.add_argument('--paths', default='boards/,columns/,cards/,tasks/,tags/',
+                            help='Rotas GET percorridas em rodízio, separadas por vírgula.')
+        parser.add_argument('--connections', type=int, default=16, help='Conexões simultâneas do gerador de carga.')
+        parser.add_argument('--client-processes', type=int, default=max(1, (os.cpu_count() or 2) // 2),
+                            help='Processos do gerador de carga (as conexões são divididas entre eles).')
+        parser.add_argument('--duration', type=float, default=10, help='Segundos medidos por combinação.')
+        parser.add_argument('--warmup', type=float, default=2, help='Segundos de carga descartados antes de medir.')
+        parser.add_argument('--settings-profile', default='setup.settings_production',
+                            help='DJANGO_SETTINGS_MODULE dos workers.')
+        parser.add_argument('--throttle', action='store_true', help='Mantém os throttles ligados (padrão: desligados).')
+        parser.add_argument('--json', help='Grava os resultados neste arquivo (JSON).')
+
+    def handle(self, *args, **options):
+        if find_spec('gunicorn') is None:
+            raise CommandError('Instale o gunicorn (requirements.txt) para rodar este benchmark.')
+        try:
+            matrix = [(int(workers), int(threads))
+                      for workers in options['workers'].split(',') for threads in options['threads'].split(',')]
+        except ValueError:
+            raise CommandError('--workers e --threads devem ser listas de inteiros.')
+        paths = ['/' + path.strip().strip('/') + '/' for path in options['paths'].split(',') if path.strip()]
+        processes = min(options['client_processes'], options['connections'])
+        if (not matrix or min(min(pair) for pair in matrix) < 1 or not paths or options['connections'] < 1
+                or processes < 1 or options['duration'] <= 0 or options['warmup'] < 0):
+            raise CommandError('Workers, threads, conexões, processos e duração devem ser positivos.')
+
+        credentials = base64.b64encode(f"{options['login']}:{options['password']}".encode()).decode()
+        headers = {'Authorization': f'Basic {credentials}', 'Accept': 'application/json'}
+        self.stdout.write(
+            f"{options['connections']} conexões em {processes} processo(s), rotas {', '.join(paths)}; "
+            f"{options['warmup']:g}s de aquecimento e {options['duration']:g}s medidos por combinação"
+        )
+        self.stdout.write(
+            f"{'workers':>7} {'threads':>7} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'erros':>6} {'RSS MB':>8}"
+        )
+        results = []
+        for workers, threads in matrix:
+            result = self._run(workers, threads, paths, headers, processes, options)
+            results.append(result)
+            rss = f"{result['rss_mb']:>8.1f}" if result['rss_mb'] is not None else f"{'-':>8}"
+            self.stdout.write(
+                f"{workers:>7} {threads:>7} {result['rps']:>9.1f} {result['p50_ms']:>8.1f} {result['p95_ms']:>8.1f} "
+                f"{result['p99_ms']:>8.1f} {result['errors']:>6} {rss}"
+            )
+
+        # Maior vazão entre as combinações sem erros (ou, se todas tiveram, com menos erros)
+        best = max([result for result in results if not result['errors']] or results,
+                   key=lambda result: (-result['errors'], result['rps']))
+        self.stdout.write(self.style.SUCCESS(
+            f"Melhor vazão: GUNICORN_WORKERS={best['workers']} GUNICORN_THREADS={best['threads']} "
+            f"({best['rps']:.1f} req/s, p95 {best['p95_ms']:.1f} ms)"
+        ))
+        if options['json']:
+            with open(options['json'], 'w') as output:
+                json.dump({'options': {key: options[key] for key in (
+                    'workers', 'threads', 'paths', 'connections', 'duration', 'warmup', 'settings_profile', 'throttle',
+                )}, 'client_processes': processes, 'cpus': os.cpu_count(), 'results': results, 'best': best}, output, indent=2)
+
+    def _run(self, workers, threads, paths, headers, processes, options):
+        port = self._free_port()
+        with tempfile.TemporaryFile() as log:
+            server = subprocess.Popen(
+                [sys.executable, '-m', 'gunicorn', '-c', str(settings.BASE_DIR / 'setup' / 'gunicorn.conf.py'), 'setup.wsgi'],
+                cwd=settings.BASE_DIR, env=self._env(workers, threads, port, options), stdout=log, stderr=log,
+            )
+            try:
+                self._wait_ready(server, port, paths, headers, log)
+                if options['warmup']:
+                    self._load(port, paths, headers, processes, options['connections'], options['warmup'])
+                latencies, errors = self._load(port, paths, headers, processes, options['connections'], options['duration'])
+                rss = _rss_mb(server.pid)
+            finally:
+                server.terminate()
+                try:
+                    server.wait(timeout=30)
+                except subprocess.TimeoutExpired:
+                    server.kill()
+                    server.wait()
+        return {
+            'workers': workers, 'threads': threads, 'requests': len(latencies), 'errors': errors,
+            'rps': len(latencies) / options['duration'], 'p50_ms': _percentile(latencies, 50),
+            'p95_ms': _percentile(latencies, 95), 'p99_ms': _percentile(latencies, 99), 'rss_mb': rss,
+        }
+
+    def _env(self, workers, threads, port, options):
+        database = settings.DATABASES['default']
+        env = {
+            **os.environ,
+            'DJANGO_SETTINGS_MODULE': options['settings_profile'],
+            'DJANGO_SECRET_KEY': os.environ.get('DJANGO_SECRET_KEY') or get_random_secret_key(),
+            'DJANGO_ALLOWED_HOSTS': f'{HOST},localhost',
+            # Os workers usam o mesmo banco deste processo (onde seed_benchmark gravou o dataset)
+            'KANBAN_DB_ENGINE': database['ENGINE'].rsplit('.', 1)[-1],
+            'KANBAN_DB_NAME': str(database['NAME']),
+            'KANBAN_DB_USER': database.get('USER') or '',
+            'KANBAN_DB_PASSWORD': database.get('PASSWORD') or '',
+            'KANBAN_DB_HOST': database.get('HOST') or '',
+            'KANBAN_DB_PORT': str(database.get('PORT') or ''),
+            'KANBAN_THROTTLE_ENABLED': '1' if options['throttle'] else '0',
+            # Sem Redis configurado, cada worker usa o próprio cache (a carga é só de leitura)
+            'KANBAN_LOCAL_CACHE': '0' if os.environ.get('KANBAN_REDIS_URL') else '1',
+            'GUNICORN_BIND': f'{HOST}:{port}',
+            'GUNICORN_WORKERS': str(workers),
+            'GUNICORN_THREADS': str(threads),
+            'GUNICORN_ACCESS_LOG': '',
+            'GUNICORN_LOG_LEVEL': 'warning',
+        }
+        env.pop('GUNICORN_WORKER_CLASS', None)
+        return env
+
+    def _free_port(self):
+        with socket.socket() as sock:
+            sock.bind((HOST, 0))
+            return sock.getsockname()[1]
+
+    def _wait_ready(self, server, port, paths, headers, log):
+        deadline = time.monotonic() + 60
+        while True:
+            if server.poll() is not None or time.monotonic() > deadline:
+                log.seek(0)
+                raise CommandError(f'O gunicorn não subiu:\n{log.read().decode(errors="replace")[-2000:]}')
+            try:
+                socket.create_connection((HOST, port), timeout=1).close()
+                break
+            except OSError:
+                time.sleep(0.2)
+        # Confere credenciais e rotas antes de medir
+        connection = http.client.HTTPConnection(HOST, port, timeout=30)
+        for path in paths:
+            connection.request('GET', path, headers=headers)
+            response = connection.getresponse()
+            body = response.read()
+            if response.status != 200:
+                raise CommandError(f'{path}: resposta {response.status} no aquecimento: {body[:200]!r}')
+        connection.close()
+
+    def _load(self, port, paths, headers, processes, connections, duration):
+        # Todas as conexões começam e terminam juntas; cada processo fica com uma parte delas
+        start_at = time.time() + 0.5
+        end_at = start_at + duration
+        shares = [connections // processes + (1 if number < connections % processes else 0) for number in range(processes)]
+        with ProcessPoolExecutor(max_workers=processes) as pool:
+            futures = [
+                pool.submit(_client, port, paths, headers, share, sum(shares[:number]), start_at, end_at)
+                for number, share in enumerate(shares)
+            ]
+            latencies, errors = [], 0
+            for future in futures:
+                part, part_errors = future.result()
+                latencies.extend(part)
+                errors += part_errors
+        return latencies, errors
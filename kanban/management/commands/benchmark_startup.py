@@ -0,0 +1,69 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+# Roda num processo novo: o boot de um worker até estar pronto para a primeira requisição
+# (django.setup, aplicação WSGI e urlconf, que o Django só carrega na primeira requisição)
+WORKER_BOOT = '''
+import json, resource, sys, time
+started = time.perf_counter()
+import django
+django.setup()
+configured = time.perf_counter()
+from django.core.wsgi import get_wsgi_application
+get_wsgi_application()
+from django.urls import get_resolver
+get_resolver().url_patterns
+ready = time.perf_counter()
+print(json.dumps({
+    'setup_ms': (configured - started) * 1000,
+    'boot_ms': (ready - started) * 1000,
+    'modules': len(sys.modules),
+    'rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+}))
+'''
+
+
+class Command(BaseCommand):
+    help = (
+        'Mede o boot de um worker por perfil de settings, em processos novos: tempo total '
+        '(com o interpretador), tempo do Django até o urlconf carregado, módulos importados e memória (RSS).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--profiles', default='setup.settings,setup.settings_api',
+                            help='Módulos de settings comparados, separados por vírgula.')
+        parser.add_argument('--runs', type=int, default=5, help='Processos por perfil (mediana).')
+
+    def handle(self, *args, **options):
+        profiles = [value.strip() for value in options['profiles'].split(',') if value.strip()]
+        if not profiles or options['runs'] < 1:
+            raise CommandError('Informe ao menos um perfil e um número positivo de execuções.')
+
+        self.stdout.write(f"{'perfil':<24} {'total ms':>9} {'django ms':>10} {'setup ms':>9} {'módulos':>8} {'RSS MB':>7}")
+        for profile in profiles:
+            samples = [self._boot(profile) for _ in range(options['runs'])]
+            median = {key: statistics.median(sample[key] for sample in samples) for key in samples[0]}
+            self.stdout.write(
+                f"{profile:<24} {median['wall_ms']:>9.0f} {median['boot_ms']:>10.0f} {median['setup_ms']:>9.0f} "
+                f"{median['modules']:>8.0f} {median['rss_kb'] / 1024:>7.1f}"
+            )
+
+    def _boot(self, profile):
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': profile}
+        started = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, '-c', WORKER_BOOT], cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        wall_ms = (time.perf_counter() - started) * 1000
+        if result.returncode:
+            raise CommandError(f'O boot com {profile} falhou:\n{result.stderr}')
+        sample = json.loads(result.stdout.strip().splitlines()[-1])
+        sample['wall_ms'] = wall_ms
+        return sample
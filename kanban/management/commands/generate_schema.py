@@ -0,0 +1,33 @@
+import os
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from django.urls import resolve, reverse
+
+from kanban import openapi
+
+
+class Command(BaseCommand):
+    help = 'Gera o documento OpenAPI (JSON e YAML) servido pelas rotas do swagger, para rodar no build.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output-dir', help='Diretório de saída (padrão: KANBAN_SCHEMA_DIR).')
+
+    def handle(self, *args, **options):
+        folder = Path(options['output_dir'] or openapi.schema_dir())
+        folder.mkdir(parents=True, exist_ok=True)
+        view_class = resolve(reverse('schema-json', kwargs={'format': '.json'})).func.cls
+        for kind in openapi.KINDS:
+            started = time.perf_counter()
+            data = openapi.encode(view_class, kind)
+            self._write(folder / f'openapi.{kind}', data)
+            self.stdout.write(f'openapi.{kind}: {len(data)} bytes em {(time.perf_counter() - started) * 1000:.0f} ms')
+        # Escrita por último: o arquivo só é servido quando a versão corresponde ao código em execução
+        self._write(folder / openapi.VERSION_FILE, openapi.code_version().encode())
+        self.stdout.write(self.style.SUCCESS(f'Schema gerado em {folder} (versão {openapi.code_version()}).'))
+
+    def _write(self, path, data):
+        temporary = path.with_name(path.name + '.tmp')
+        temporary.write_bytes(data)
+        os.replace(temporary, path)
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from kanban import thumbnails
+from kanban.models import Attachment
+
+
+class Command(BaseCommand):
+    help = 'Gera as miniaturas/previews que faltam para os anexos existentes.'
+
+    def handle(self, *args, **options):
+        generated = skipped = 0
+        pending = Attachment.objects.filter(thumbnail='').values_list('id', 'content_type')
+        for attachment_id, content_type in pending.iterator():
+            if not thumbnails.available(content_type):
+                skipped += 1
+                continue
+            try:
+                thumbnails.generate(attachment_id)
+                generated += 1
+            except Exception as exc:
+                self.stderr.write(f'Anexo {attachment_id}: {exc}')
+        self.stdout.write(self.style.SUCCESS(f'{generated} miniaturas geradas, {skipped} anexos sem suporte.'))
@@ -0,0 +1,19 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from kanban import activity
+
+
+class Command(BaseCommand):
+    help = 'Remove do feed de atividades os eventos mais antigos que a retenção configurada.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, help='Retenção em dias (padrão: KANBAN_ACTIVITY_RETENTION).')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Eventos removidos por DELETE.')
+
+    def handle(self, *args, **options):
+        before = timezone.now() - timedelta(days=options['days']) if options['days'] is not None else None
+        removed = activity.prune(before=before, batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'{removed} eventos removidos.'))
@@ -0,0 +1,36 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from kanban import storage, uploads
+from kanban.models import Attachment, BoardArchiveBlob
+
+
+class Command(BaseCommand):
+    help = 'Descarta uploads em partes abandonados e, opcionalmente, os blobs de anexos sem referência.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=int, help='Validade das sessões paradas (padrão: KANBAN_UPLOAD_EXPIRY).')
+        parser.add_argument('--orphans', action='store_true',
+                            help='Remove também os blobs que nenhum anexo referencia (criados há mais de 1 hora).')
+
+    def handle(self, *args, **options):
+        before = timezone.now() - timedelta(hours=options['hours']) if options['hours'] is not None else None
+        removed = uploads.prune_sessions(before=before)
+        self.stdout.write(self.style.SUCCESS(f'{removed} sessões de upload descartadas.'))
+
+        if options['orphans']:
+            blobs = storage.attachment_storage()
+            referenced = set()
+            for file, thumbnail in Attachment.objects.values_list('file', 'thumbnail').iterator():
+                referenced.update((file, thumbnail))
+            referenced.update(BoardArchiveBlob.objects.values_list('name', flat=True).iterator())
+            # A margem evita apagar um blob gravado por um upload cuja transação ainda não confirmou
+            limit = timezone.now() - timedelta(hours=1)
+            orphans = 0
+            for name in storage.orphan_blobs(Attachment.file.field.upload_to.rstrip('/'), referenced):
+                if blobs.get_modified_time(name) < limit:
+                    blobs.delete(name)
+                    orphans += 1
+            self.stdout.write(self.style.SUCCESS(f'{orphans} blobs órfãos removidos.'))
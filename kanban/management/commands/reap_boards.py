@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils.dateparse import parse_datetime
+
+from kanban import reaper
+
+
+class Command(BaseCommand):
+    help = 'Expurga, em lotes, o conteúdo dos quadros removidos cujo prazo de restauração venceu.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Linhas apagadas por transação.')
+        parser.add_argument('--now', help='Instante de referência (ISO 8601), útil para execuções reproduzíveis.')
+        parser.add_argument('--interval', type=int, default=0,
+                            help='Se informado, executa continuamente a cada N segundos (worker em processo).')
+
+    def handle(self, *args, **options):
+        now = parse_datetime(options['now']) if options['now'] else None
+        while True:
+            purged = reaper.run(now=now, batch_size=options['batch_size'])
+            self.stdout.write(f'Quadros expurgados: {purged}')
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from kanban import access
+
+
+class Command(BaseCommand):
+    help = 'Recria a tabela materializada de acesso aos quadros (BoardAccess) a partir de donos e colaboradores.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--board', type=int, action='append', dest='boards',
+                            help='Limita a reconstrução ao quadro informado (pode ser repetido).')
+
+    def handle(self, *args, **options):
+        total = access.rebuild(boards=options['boards'])
+        self.stdout.write(self.style.SUCCESS(f'{total} linhas de acesso recriadas.'))
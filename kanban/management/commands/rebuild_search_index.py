@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from kanban import search
+from kanban.models import Card, Comment, Task, SearchEntry
+
+
+class Command(BaseCommand):
+    help = 'Recria o índice de busca textual de cartões, comentários e tarefas.'
+
+    def handle(self, *args, **options):
+        SearchEntry.objects.all().delete()
+        for card in Card.objects.iterator():
+            search.index_card(card)
+        for comment in Comment.objects.iterator():
+            search.index_comment(comment)
+        for task in Task.objects.iterator():
+            search.index_task(task)
+        search.rebuild()
+        self.stdout.write(self.style.SUCCESS(f'{SearchEntry.objects.count()} entradas indexadas.'))
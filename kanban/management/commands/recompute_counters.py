@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from kanban import counters
+
+
+class Command(BaseCommand):
+    help = 'Recalcula em massa os contadores desnormalizados de quadros, colunas e cartões.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--board', type=int, action='append', dest='boards',
+                            help='Limita o recálculo ao quadro informado (pode ser repetido).')
+
+    def handle(self, *args, **options):
+        counters.recompute(boards=options['boards'])
+        self.stdout.write(self.style.SUCCESS('Contadores recalculados.'))
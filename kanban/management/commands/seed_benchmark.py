@@ -0,0 +1,96 @@
+import random
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from faker import Faker
+
+from kanban import counters
+from kanban.models import User, Board, Column, Card, Task, Tag, SearchEntry
+
+PRIORITIES = ('B', 'M', 'I', 'U')
+
+
+class Command(BaseCommand):
+    help = (
+        'Cria um dataset determinístico para os benchmarks (manage.py benchmark_server): '
+        'um usuário com quadros, colunas, tags, cartões e tarefas. A mesma semente gera os mesmos dados.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--login', default='bench', help='Usuário dono dos quadros (criado se não existir).')
+        parser.add_argument('--password', required=True)
+        parser.add_argument('--boards', type=int, default=10)
+        parser.add_argument('--columns', type=int, default=5, help='Colunas por quadro.')
+        parser.add_argument('--cards', type=int, default=200, help='Cartões por quadro.')
+        parser.add_argument('--tasks', type=int, default=3, help='Tarefas por cartão.')
+        parser.add_argument('--tags', type=int, default=8, help='Tags por quadro.')
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--reset', action='store_true', help='Remove antes os quadros do usuário.')
+
+    def handle(self, *args, **options):
+        if min(options['boards'], options['columns']) < 1 or min(options['cards'], options['tasks'], options['tags']) < 0:
+            raise CommandError('Informe ao menos um quadro e uma coluna, e quantidades não negativas.')
+        fake = Faker('pt_BR')
+        fake.seed_instance(options['seed'])
+        rng = random.Random(options['seed'])
+
+        user = User.objects.filter(login=options['login']).first()
+        if user is None:
+            user = User.objects.create_user(options['login'], fake.name(), options['password'])
+        elif Board.objects.filter(fk_user=user).exists():
+            if not options['reset']:
+                raise CommandError(f'O usuário {user.login} já tem quadros; use --reset para recriá-los.')
+            Board.objects.filter(fk_user=user).delete()
+
+        with transaction.atomic():
+            boards = [self._board(user, number, fake, rng, options) for number in range(options['boards'])]
+            counters.recompute(boards=[board.id for board in boards])
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(boards)} quadros de {user.login}, com {options['cards']} cartões e "
+            f"{options['cards'] * options['tasks']} tarefas cada (semente {options['seed']})."
+        ))
+
+    def _board(self, user, number, fake, rng, options):
+        # Quadro e colunas pelo save (signals criam o acesso do dono); o resto em lote
+        board = Board.objects.create(name=f'Benchmark {number + 1}', fk_user=user)
+        columns = [
+            Column.objects.create(name=fake.word().capitalize(), position=position, fk_user=user, fk_board=board)
+            for position in range(options['columns'])
+        ]
+        tags = Tag.objects.bulk_create([
+            Tag(name=f'{fake.word()} {index}', color=fake.hex_color(), fk_board=board) for index in range(options['tags'])
+        ])
+        now = timezone.now()
+        positions = [0] * len(columns)
+        cards = []
+        for _ in range(options['cards']):
+            index = rng.randrange(len(columns))
+            due = fake.date_time_between('-30d', '+30d', tzinfo=now.tzinfo) if rng.random() < 0.5 else None
+            cards.append(Card(
+                title=fake.sentence(nb_words=4)[:100], description=fake.paragraph(), fk_column=columns[index],
+                position=positions[index], priority=rng.choice(PRIORITIES), due_date=due, fk_user=user,
+            ))
+            positions[index] += 1
+        cards = Card.objects.bulk_create(cards, batch_size=500)
+        tasks = []
+        for card in cards:
+            for position in range(options['tasks']):
+                completed = rng.random() < 0.4
+                tasks.append(Task(title=fake.sentence(nb_words=3)[:100], position=position, fk_card=card,
+                                  completed=completed, completed_at=now if completed else None))
+        tasks = Task.objects.bulk_create(tasks, batch_size=500)
+        if tags:
+            TagCard = Tag.cards.through
+            TagCard.objects.bulk_create([
+                TagCard(tag_id=tag.id, card_id=card.id) for card in cards for tag in rng.sample(tags, min(2, len(tags)))
+            ], batch_size=500)
+        # bulk_create não dispara os signals: entradas de busca aqui, contadores no fim (recompute)
+        SearchEntry.objects.bulk_create(
+            [SearchEntry(kind='card', object_id=card.id, fk_card_id=card.id, fk_board_id=board.id,
+                         title=card.title, body=card.description) for card in cards] +
+            [SearchEntry(kind='task', object_id=task.id, fk_card_id=task.fk_card_id, fk_board_id=board.id,
+                         title=task.title) for task in tasks],
+            batch_size=500,
+        )
+        return board
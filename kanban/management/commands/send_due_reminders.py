@@ -0,0 +1,41 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from kanban.reminders import run_due_reminders
+
+
+class Command(BaseCommand):
+    help = 'Envia notificações para cartões com prazo próximo ou atrasados (uma vez por cartão, limiar e prazo).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500, help='Cartões processados por transação.')
+        # Um instante fixo só faz sentido numa execução única
+        mode = parser.add_mutually_exclusive_group()
+        mode.add_argument('--now', help='Instante de referência (ISO 8601 com fuso), útil para execuções reproduzíveis.')
+        mode.add_argument('--interval', type=int, default=0,
+                          help='Se informado, executa continuamente a cada N segundos (worker em processo).')
+
+    def handle(self, *args, **options):
+        now = self._now(options['now']) if options['now'] else None
+        while True:
+            created = run_due_reminders(now=now, batch_size=options['batch_size'])
+            self.stdout.write(
+                f"Prazo próximo: {created['due_soon']} | Atrasados: {created['overdue']}"
+            )
+            if not options['interval']:
+                break
+            time.sleep(options['interval'])
+
+    def _now(self, value):
+        try:
+            now = parse_datetime(value)
+        except ValueError:
+            now = None
+        if now is None:
+            raise CommandError(f'--now inválido: "{value}". Use ISO 8601, ex.: 2026-01-31T09:00:00-03:00.')
+        if timezone.is_naive(now):
+            raise CommandError('--now precisa informar o fuso horário (ex.: -03:00 ou Z).')
+        return now
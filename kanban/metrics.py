@@ -0,0 +1,134 @@
+import threading
+import time
+from contextvars import ContextVar
+
+# Métricas da requisição corrente (None fora de uma requisição instrumentada)
+_current = ContextVar('kanban_request_metrics', default=None)
+
+
+class RequestMetrics:
+    """Acumula os números de uma única requisição."""
+
+    __slots__ = ('started', 'queries', 'db_time', 'serializer_time', 'serializer_depth')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.serializer_depth = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        # Conta e cronometra cada query
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - start
+            self.queries += 1
+
+
+def execute_wrapper(execute, sql, params, many, context):
+    # Instalado em todas as conexões (kanban/signals.py). O ContextVar acompanha a requisição
+    # também nas threads usadas pelo ORM assíncrono, ao contrário de um wrapper por conexão.
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    return metrics(execute, sql, params, many, context)
+
+
+def start_request():
+    metrics = RequestMetrics()
+    token = _current.set(metrics)
+    return metrics, token
+
+
+def end_request(token):
+    _current.reset(token)
+
+
+def current():
+    return _current.get()
+
+
+class serializer_timer:
+    """
+    Cronometra a serialização da requisição corrente. Chamadas aninhadas
+    (serializers dentro de serializers) só são contadas no nível mais externo.
+    """
+
+    __slots__ = ('metrics', 'start')
+
+    def __enter__(self):
+        self.metrics = _current.get()
+        if self.metrics is not None:
+            self.metrics.serializer_depth += 1
+            if self.metrics.serializer_depth == 1:
+                self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        metrics = self.metrics
+        if metrics is not None:
+            if metrics.serializer_depth == 1:
+                metrics.serializer_time += time.perf_counter() - self.start
+            metrics.serializer_depth -= 1
+        return False
+
+
+class MetricsRegistry:
+    """Agregação em memória, por view e action, das métricas de cada requisição."""
+
+    FIELDS = ('requests', 'duration', 'queries', 'db_time', 'serializer_time', 'response_bytes')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data = {}
+
+    def record(self, view, action, duration, metrics, response_bytes):
+        key = (view, action)
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                entry = self._data[key] = [0, 0.0, 0, 0.0, 0.0, 0]
+            entry[0] += 1
+            entry[1] += duration
+            entry[2] += metrics.queries
+            entry[3] += metrics.db_time
+            entry[4] += metrics.serializer_time
+            entry[5] += response_bytes
+
+    def snapshot(self):
+        with self._lock:
+            return {key: dict(zip(self.FIELDS, values)) for key, values in self._data.items()}
+
+    def reset(self):
+        with self._lock:
+            self._data.clear()
+
+    def to_prometheus(self):
+        # Formato de exposição de texto do Prometheus (text/plain; version=0.0.4)
+        series = (
+            ('kanban_requests_total', 'counter', 'Total de requisições atendidas.', 'requests'),
+            ('kanban_request_duration_seconds_total', 'counter', 'Tempo total gasto atendendo requisições.', 'duration'),
+            ('kanban_db_queries_total', 'counter', 'Total de queries SQL executadas.', 'queries'),
+            ('kanban_db_duration_seconds_total', 'counter', 'Tempo total gasto no banco de dados.', 'db_time'),
+            ('kanban_serializer_duration_seconds_total', 'counter', 'Tempo total gasto em serializers.', 'serializer_time'),
+            ('kanban_response_bytes_total', 'counter', 'Total de bytes enviados nas respostas.', 'response_bytes'),
+        )
+        snapshot = sorted(self.snapshot().items())
+        lines = []
+        for name, kind, help_text, field in series:
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            for (view, action), values in snapshot:
+                labels = f'view="{_escape(view)}",action="{_escape(action)}"'
+                lines.append(f'{name}{{{labels}}} {values[field]}')
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+registry = MetricsRegistry()
@@ -0,0 +1,180 @@
+import re
+import time
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.middleware.gzip import GZipMiddleware
+
+from . import activity, metrics, querywatch
+
+
+class HybridMiddleware:
+    """
+    Base para middlewares que funcionam tanto no WSGI quanto no ASGI, sem
+    forçar as views assíncronas a rodar em uma thread (ver kanban/async_views.py).
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        return self.handle(request, self.get_response)
+
+    async def __acall__(self, request):
+        return await self.ahandle(request, self.get_response)
+
+
+class QueryMetricsMiddleware(HybridMiddleware):
+    """
+    Mede, por requisição, o número de queries SQL, o tempo de banco, o tempo
+    de serialização e o tamanho da resposta. Os números são devolvidos no
+    header `Server-Timing` e agregados por view/action em `metrics.registry`.
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.enabled = getattr(settings, 'KANBAN_METRICS_ENABLED', True)
+
+    def handle(self, request, get_response):
+        if not self.enabled:
+            return get_response(request)
+        request_metrics, token = metrics.start_request()
+        try:
+            response = get_response(request)
+        finally:
+            metrics.end_request(token)
+        return self.finish(request, response, request_metrics)
+
+    async def ahandle(self, request, get_response):
+        if not self.enabled:
+            return await get_response(request)
+        request_metrics, token = metrics.start_request()
+        try:
+            response = await get_response(request)
+        finally:
+            metrics.end_request(token)
+        return self.finish(request, response, request_metrics)
+
+    def finish(self, request, response, request_metrics):
+        duration = time.perf_counter() - request_metrics.started
+        size = 0 if response.streaming else len(response.content)
+        view, action = getattr(request, '_metrics_view', ('unresolved', request.method.lower()))
+        metrics.registry.record(view, action, duration, request_metrics, size)
+
+        response['Server-Timing'] = (
+            f'db;dur={request_metrics.db_time * 1000:.2f};desc="{request_metrics.queries} queries", '
+            f'serializer;dur={request_metrics.serializer_time * 1000:.2f}, '
+            f'total;dur={duration * 1000:.2f}, '
+            f'size;desc="{size} bytes"'
+        )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        # ViewSets do DRF expõem a classe e o mapeamento método -> action na função da view
+        cls = getattr(view_func, 'cls', None) or getattr(view_func, 'view_class', None)
+        method = request.method.lower()
+        if cls is not None:
+            actions = getattr(view_func, 'actions', None) or {}
+            request._metrics_view = (cls.__name__, actions.get(method, method))
+        else:
+            name = getattr(view_func, '__name__', view_func.__class__.__name__)
+            request._metrics_view = (name, method)
+        return None
+
+
+class QueryInspectorMiddleware(HybridMiddleware):
+    """
+    Modo de depuração que inspeciona as queries de cada requisição e aponta
+    N+1 (a mesma query repetida mudando só os parâmetros) e queries lentas,
+    com a pilha Python que as disparou. Configurado por KANBAN_QUERY_INSPECTOR.
+    """
+
+    def handle(self, request, get_response):
+        # A configuração é lida a cada requisição para respeitar override_settings nos testes
+        if not querywatch.get_config()['ENABLED']:
+            return get_response(request)
+        with querywatch.inspect_queries(f'{request.method} {request.path}') as inspector:
+            response = get_response(request)
+        return self.finish(response, inspector)
+
+    async def ahandle(self, request, get_response):
+        if not querywatch.get_config()['ENABLED']:
+            return await get_response(request)
+        with querywatch.inspect_queries(f'{request.method} {request.path}') as inspector:
+            response = await get_response(request)
+        return self.finish(response, inspector)
+
+    def finish(self, response, inspector):
+        if inspector.problems:
+            response['X-Query-Problems'] = str(len(inspector.problems))
+        return response
+
+
+class ActivityMiddleware(HybridMiddleware):
+    """
+    Disponibiliza a requisição corrente para o feed de atividades (autor dos
+    eventos) e grava em lote, ao final, os eventos confirmados na requisição.
+    """
+
+    def handle(self, request, get_response):
+        tokens = activity.start_request(request)
+        try:
+            return get_response(request)
+        finally:
+            activity.write(activity.end_request(tokens))
+
+    async def ahandle(self, request, get_response):
+        tokens = activity.start_request(request)
+        try:
+            return await get_response(request)
+        finally:
+            events = activity.end_request(tokens)
+            if events:
+                await sync_to_async(activity.write)(events)
+
+
+# Tipos que compensam comprimir; imagens, PDFs e demais binários já vêm comprimidos
+COMPRESSIBLE_TYPES = re.compile(
+    r'^(text/[^;]+|application/(json|[^;]+\+json|javascript|xml|[^;]+\+xml|yaml|x-yaml|msgpack|cbor)|image/svg\+xml)(;|$)'
+)
+# Abaixo disso a economia não paga o custo (e o cabeçalho gzip): a resposta cabe em poucos pacotes
+COMPRESS_MIN_SIZE = 1024
+# Nível fixo do GZipMiddleware do Django (django.utils.text.compress_string)
+COMPRESS_LEVEL = 6
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """
+    GZipMiddleware do Django, que mantém a mitigação de BREACH (nome de arquivo
+    aleatório no cabeçalho gzip) e comprime o streaming conforme os trechos são
+    gerados, restrito aos tipos textuais (JSON, YAML, MessagePack...) e, nas
+    respostas comuns, às que têm ao menos KANBAN_COMPRESS_MIN_SIZE bytes.
+    Não mexe em respostas parciais (Range) ou entregues pelo servidor web
+    (X-Sendfile); as que já têm Content-Encoding o próprio Django preserva.
+    """
+
+    def __init__(self, get_response):
+        super().__init__(get_response)
+        self.min_size = getattr(settings, 'KANBAN_COMPRESS_MIN_SIZE', COMPRESS_MIN_SIZE)
+
+    def process_response(self, request, response):
+        if not self._compressible(response):
+            return response
+        return super().process_response(request, response)
+
+    def _compressible(self, response):
+        if response.status_code != 200:
+            return False
+        if any(response.has_header(header) for header in ('Content-Range', 'Accept-Ranges', 'X-Sendfile', 'X-Accel-Redirect')):
+            return False
+        if not COMPRESSIBLE_TYPES.match(response.get('Content-Type', '')):
+            return False
+        return response.streaming or len(response.content) >= self.min_size
@@ -0,0 +1,98 @@
+# Generated by Django 5.1 on 2026-10-19 13:53
+
+import itertools
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Linhas lidas e inseridas por ida ao banco no preenchimento inicial do índice
+BATCH_SIZE = 1000
+
+SQLITE_FORWARD = [
+    "CREATE VIRTUAL TABLE kanban_searchentry_fts USING fts5("
+    "title, body, content='kanban_searchentry', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER kanban_searchentry_ai AFTER INSERT ON kanban_searchentry BEGIN "
+    "INSERT INTO kanban_searchentry_fts(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+    "CREATE TRIGGER kanban_searchentry_ad AFTER DELETE ON kanban_searchentry BEGIN "
+    "INSERT INTO kanban_searchentry_fts(kanban_searchentry_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body); END",
+    "CREATE TRIGGER kanban_searchentry_au AFTER UPDATE OF title, body ON kanban_searchentry BEGIN "
+    "INSERT INTO kanban_searchentry_fts(kanban_searchentry_fts, rowid, title, body) VALUES ('delete', old.id, old.title, old.body); "
+    "INSERT INTO kanban_searchentry_fts(rowid, title, body) VALUES (new.id, new.title, new.body); END",
+]
+SQLITE_REVERSE = [
+    "DROP TRIGGER IF EXISTS kanban_searchentry_au",
+    "DROP TRIGGER IF EXISTS kanban_searchentry_ad",
+    "DROP TRIGGER IF EXISTS kanban_searchentry_ai",
+    "DROP TABLE IF EXISTS kanban_searchentry_fts",
+]
+POSTGRES_FORWARD = [
+    "CREATE INDEX kanban_searchentry_tsv ON kanban_searchentry "
+    "USING GIN (to_tsvector('portuguese', title || ' ' || body))",
+]
+POSTGRES_REVERSE = [
+    "DROP INDEX IF EXISTS kanban_searchentry_tsv",
+]
+
+
+def _run(statements):
+    def run(apps, schema_editor):
+        vendor = schema_editor.connection.vendor
+        for sql in statements.get(vendor, []):
+            schema_editor.execute(sql)
+    return run
+
+
+def backfill(apps, schema_editor):
+    # Indexa os cartões, comentários e tarefas já existentes, lendo e inserindo em lotes
+    # (o quadro vem junto em cada linha, sem um mapa de todos os cartões em memória)
+    Card = apps.get_model('kanban', 'Card')
+    Comment = apps.get_model('kanban', 'Comment')
+    Task = apps.get_model('kanban', 'Task')
+    SearchEntry = apps.get_model('kanban', 'SearchEntry')
+
+    board = 'fk_card__fk_column__fk_board_id'
+    cards = Card.objects.values_list('id', 'fk_column__fk_board_id', 'title', 'description')
+    comments = Comment.objects.values_list('id', 'fk_card_id', board, 'comment_text')
+    tasks = Task.objects.values_list('id', 'fk_card_id', board, 'title')
+    entries = itertools.chain(
+        (SearchEntry(kind='card', object_id=card_id, fk_card_id=card_id, fk_board_id=board_id,
+                     title=title, body=description or '')
+         for card_id, board_id, title, description in cards.iterator(chunk_size=BATCH_SIZE)),
+        (SearchEntry(kind='comment', object_id=comment_id, fk_card_id=card_id, fk_board_id=board_id, body=text or '')
+         for comment_id, card_id, board_id, text in comments.iterator(chunk_size=BATCH_SIZE)),
+        (SearchEntry(kind='task', object_id=task_id, fk_card_id=card_id, fk_board_id=board_id, title=title)
+         for task_id, card_id, board_id, title in tasks.iterator(chunk_size=BATCH_SIZE)),
+    )
+    while batch := list(itertools.islice(entries, BATCH_SIZE)):
+        SearchEntry.objects.bulk_create(batch, batch_size=BATCH_SIZE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban', '0004_boardcollaborator'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('card', 'Cartão'), ('comment', 'Comentário'), ('task', 'Tarefa')], max_length=10)),
+                ('object_id', models.BigIntegerField()),
+                ('title', models.CharField(blank=True, default='', max_length=100)),
+                ('body', models.TextField(blank=True, default='')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('fk_board', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_entries', to='kanban.board')),
+                ('fk_card', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_entries', to='kanban.card')),
+            ],
+            options={
+                'unique_together': {('kind', 'object_id')},
+            },
+        ),
+        migrations.RunPython(
+            _run({'sqlite': SQLITE_FORWARD, 'postgresql': POSTGRES_FORWARD}),
+            _run({'sqlite': SQLITE_REVERSE, 'postgresql': POSTGRES_REVERSE}),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
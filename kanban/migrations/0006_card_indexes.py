@@ -0,0 +1,25 @@
+# Generated by Django 5.1 on 2026-10-19 13:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban', '0005_searchentry'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='card',
+            index=models.Index(fields=['fk_column', 'position'], name='card_column_position_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='card',
+            index=models.Index(fields=['due_date'], name='card_due_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='card',
+            index=models.Index(fields=['priority', 'due_date'], name='card_priority_due_idx'),
+        ),
+    ]
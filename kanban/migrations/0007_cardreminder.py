@@ -0,0 +1,32 @@
+# Generated by Django 5.1 on 2026-10-19 13:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban', '0006_card_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='notification',
+            name='notification_type',
+            field=models.CharField(choices=[('comment', 'Comentário'), ('task_completed', 'Tarefa Concluída'), ('card_moved', 'Cartão Movido'), ('due_soon', 'Prazo Próximo'), ('overdue', 'Cartão Atrasado')], default='comment', max_length=20),
+        ),
+        migrations.CreateModel(
+            name='CardReminder',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('threshold', models.CharField(choices=[('due_soon', 'Prazo Próximo'), ('overdue', 'Cartão Atrasado')], max_length=20)),
+                ('due_date', models.DateTimeField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('fk_card', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reminders', to='kanban.card')),
+            ],
+            options={
+                'unique_together': {('fk_card', 'threshold')},
+            },
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.1 on 2026-10-19 13:57
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def _count(queryset, group_by):
+    return Coalesce(
+        Subquery(
+            queryset.filter(**{group_by: OuterRef('pk')}).order_by().values(group_by)
+            .annotate(total=Count('id')).values('total'),
+            output_field=IntegerField(),
+        ),
+        Value(0),
+    )
+
+
+def backfill(apps, schema_editor):
+    # Preenche os contadores a partir dos dados existentes
+    Board = apps.get_model('kanban', 'Board')
+    Column = apps.get_model('kanban', 'Column')
+    Card = apps.get_model('kanban', 'Card')
+    Task = apps.get_model('kanban', 'Task')
+    Column.objects.update(card_count=_count(Card.objects.all(), 'fk_column'))
+    Card.objects.update(
+        tasks_total=_count(Task.objects.all(), 'fk_card'),
+        tasks_completed=_count(Task.objects.filter(completed=True), 'fk_card'),
+    )
+    Board.objects.update(urgent_card_count=_count(Card.objects.filter(priority='U'), 'fk_column__fk_board'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban', '0007_cardreminder'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='board',
+            name='urgent_card_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='card',
+            name='tasks_completed',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='card',
+            name='tasks_total',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='column',
+            name='card_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='card',
+            index=models.Index(fields=['fk_column', 'due_date'], name='card_column_due_idx'),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
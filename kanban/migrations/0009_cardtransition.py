@@ -0,0 +1,45 @@
+# Generated by Django 5.1 on 2026-10-19 13:58
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def backfill(apps, schema_editor):
+    # Registra a criação dos cartões existentes na coluna em que estão hoje
+    Card = apps.get_model('kanban', 'Card')
+    CardTransition = apps.get_model('kanban', 'CardTransition')
+    CardTransition.objects.bulk_create(
+        [
+            CardTransition(card_id=card_id, fk_board_id=board_id, to_column=column_id, created_at=created_at)
+            for card_id, board_id, column_id, created_at in Card.objects.values_list(
+                'id', 'fk_column__fk_board_id', 'fk_column_id', 'created_at',
+            ).iterator()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban', '0008_denormalized_counters'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CardTransition',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('card_id', models.BigIntegerField()),
+                ('from_column', models.BigIntegerField(blank=True, null=True)),
+                ('to_column', models.BigIntegerField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('fk_board', models.ForeignKey(db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='transitions', to='kanban.board')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['fk_board', 'created_at'], name='transition_board_created_idx'), models.Index(fields=['card_id', 'created_at'], name='transition_card_created_idx')],
+            },
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,76 @@
+# Generated by Django 5.1 on 2026-10-19 14:09
+
+import mimetypes
+import os
+
+import django.db.models.deletion
+import django.utils.timezone
+import kanban.storage
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill(apps, schema_editor):
+    # Anexos existentes continuam no caminho antigo; só os metadados são preenchidos
+    Attachment = apps.get_model('kanban', 'Attachment')
+    storage = kanban.storage.attachment_storage()
+    for attachment in Attachment.objects.iterator():
+        name = attachment.file.name
+        attachment.original_name = os.path.basename(name)
+        attachment.content_type = mimetypes.guess_type(name)[0] or ''
+        if storage.exists(name):
+            with storage.open(name, 'rb') as handle:
+                attachment.size = handle.size
+                attachment.checksum = kanban.storage.ContentAddressedStorage.digest(handle)
+        attachment.save(update_fields=['original_name', 'content_type', 'size', 'checksum'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban', '0010_activity'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attachment',
+            name='checksum',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=64),
+        ),
+        migrations.AddField(
+            model_name='attachment',
+            name='content_type',
+            field=models.CharField(blank=True, default='', max_length=100),
+        ),
+        migrations.AddField(
+            model_name='attachment',
+            name='original_name',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='attachment',
+            name='size',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='attachment',
+            name='file',
+            field=models.FileField(max_length=255, storage=kanban.storage.attachment_storage, upload_to='attachments/'),
+        ),
+        migrations.CreateModel(
+            name='UploadSession',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('filename', models.CharField(max_length=255)),
+                ('content_type', models.CharField(max_length=100)),
+                ('size', models.PositiveBigIntegerField()),
+                ('offset', models.PositiveBigIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                ('fk_card', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='upload_sessions', to='kanban.card')),
+                ('uploaded_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='upload_sessions', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
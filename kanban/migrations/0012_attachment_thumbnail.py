@@ -0,0 +1,18 @@
+# Generated by Django 5.1 on 2026-10-19 14:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban', '0011_attachment_storage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='attachment',
+            name='thumbnail',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+    ]
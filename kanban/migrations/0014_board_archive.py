@@ -0,0 +1,34 @@
+# Generated by Django 5.1 on 2026-10-19 14:16
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban', '0013_board_soft_delete'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='board',
+            name='archived_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.CreateModel(
+            name='BoardArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('data', models.BinaryField()),
+                ('raw_size', models.PositiveBigIntegerField(default=0)),
+                ('counts', models.JSONField(blank=True, default=dict)),
+                ('blobs', models.JSONField(blank=True, default=list)),
+                ('complete', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('archived_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='board_archives', to=settings.AUTH_USER_MODEL)),
+                ('fk_board', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='archive', to='kanban.board')),
+            ],
+        ),
+    ]
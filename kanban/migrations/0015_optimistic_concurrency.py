@@ -0,0 +1,62 @@
+# Generated by Django 5.1 on 2026-10-19 14:20
+
+from django.db import migrations, models
+from django.db.models import Count, Max
+
+
+def resolve_duplicates(apps, schema_editor):
+    # Posições repetidas (possíveis com a validação antiga) vão para o fim do grupo, na ordem de criação
+    for model_name, group in (('column', 'fk_board'), ('card', 'fk_column'), ('task', 'fk_card')):
+        model = apps.get_model('kanban', model_name)
+        duplicated = (
+            model.objects.filter(position__isnull=False).values(group, 'position')
+            .annotate(total=Count('id')).filter(total__gt=1)
+        )
+        for row in duplicated:
+            siblings = model.objects.filter(**{group: row[group]})
+            next_position = siblings.aggregate(last=Max('position'))['last'] + 1
+            for obj in siblings.filter(position=row['position']).order_by('id')[1:]:
+                model.objects.filter(pk=obj.pk).update(position=next_position)
+                next_position += 1
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban', '0014_board_archive'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='card',
+            name='card_column_position_idx',
+        ),
+        migrations.AddField(
+            model_name='card',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+        migrations.AddField(
+            model_name='column',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+        migrations.AddField(
+            model_name='task',
+            name='version',
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+        migrations.RunPython(resolve_duplicates, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='card',
+            constraint=models.UniqueConstraint(fields=('fk_column', 'position'), name='card_column_position_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='column',
+            constraint=models.UniqueConstraint(fields=('fk_board', 'position'), name='column_board_position_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='task',
+            constraint=models.UniqueConstraint(fields=('fk_card', 'position'), name='task_card_position_uniq'),
+        ),
+    ]
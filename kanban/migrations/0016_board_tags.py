@@ -0,0 +1,80 @@
+import logging
+
+import django.db.models.deletion
+import django.db.models.functions.text
+from django.db import migrations, models
+
+logger = logging.getLogger(__name__)
+
+
+def scope_tags(apps, schema_editor):
+    """
+    Distribui as tags globais pelos quadros dos cartões em que são usadas: a tag
+    fica com o primeiro quadro e ganha uma cópia em cada um dos demais. Tags sem
+    cartões vão para o único quadro da instalação, se houver só um; senão não há
+    a que quadro atribuí-las (as tags não tinham dono) e são removidas, com nome e
+    cor registrados no log. Depois, tags do mesmo quadro com o mesmo nome (sem
+    diferenciar maiúsculas) são unificadas.
+    """
+    Board = apps.get_model('kanban', 'Board')
+    Tag = apps.get_model('kanban', 'Tag')
+    TagCard = Tag.cards.through
+    boards = list(Board.objects.order_by('id').values_list('id', flat=True)[:2])
+    only_board = boards[0] if len(boards) == 1 else None
+    dropped = []
+    for tag in Tag.objects.order_by('id'):
+        board_ids = sorted(set(
+            TagCard.objects.filter(tag_id=tag.id).values_list('card__fk_column__fk_board_id', flat=True)
+        ))
+        if not board_ids and only_board is not None:
+            board_ids = [only_board]
+        if not board_ids:
+            dropped.append((tag.id, tag.name, tag.color))
+            tag.delete()
+            continue
+        Tag.objects.filter(id=tag.id).update(fk_board_id=board_ids[0])
+        for board_id in board_ids[1:]:
+            copy = Tag.objects.create(name=tag.name, color=tag.color, fk_board_id=board_id)
+            TagCard.objects.filter(tag_id=tag.id, card__fk_column__fk_board_id=board_id).update(tag_id=copy.id)
+
+    kept = {}
+    for tag in Tag.objects.order_by('id'):
+        key = (tag.fk_board_id, tag.name.lower())
+        if key not in kept:
+            kept[key] = tag.id
+            continue
+        linked = TagCard.objects.filter(tag_id=kept[key]).values_list('card_id', flat=True)
+        TagCard.objects.filter(tag_id=tag.id, card_id__in=list(linked)).delete()
+        TagCard.objects.filter(tag_id=tag.id).update(tag_id=kept[key])
+        tag.delete()
+
+    if dropped:
+        logger.warning(
+            '%d tag(s) sem cartões removida(s) na migração para tags por quadro (id, nome, cor): %s',
+            len(dropped), dropped,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban', '0015_optimistic_concurrency'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tag',
+            name='fk_board',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='tags', to='kanban.board'),
+        ),
+        migrations.RunPython(scope_tags, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='tag',
+            name='fk_board',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='tags', to='kanban.board'),
+        ),
+        migrations.AddConstraint(
+            model_name='tag',
+            constraint=models.UniqueConstraint(models.F('fk_board'), django.db.models.functions.text.Lower('name'), name='tag_board_name_uniq'),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.1 on 2026-10-19 14:34
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def fill_access(apps, schema_editor):
+    # Dono e colaboradores de cada quadro; o dono prevalece se também for colaborador
+    Board = apps.get_model('kanban', 'Board')
+    BoardCollaborator = apps.get_model('kanban', 'BoardCollaborator')
+    BoardAccess = apps.get_model('kanban', 'BoardAccess')
+    rows = {
+        (board_id, user_id): permission
+        for board_id, user_id, permission in BoardCollaborator.objects.values_list('fk_board_id', 'fk_user_id', 'permission')
+    }
+    rows.update({pair: 'owner' for pair in Board.objects.values_list('id', 'fk_user_id')})
+    BoardAccess.objects.bulk_create(
+        [BoardAccess(fk_board_id=board_id, fk_user_id=user_id, permission=permission)
+         for (board_id, user_id), permission in rows.items()],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban', '0016_board_tags'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BoardAccess',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('permission', models.CharField(choices=[('owner', 'Dono'), ('view', 'Visualizar'), ('edit', 'Editar'), ('admin', 'Administrador')], max_length=10)),
+                ('fk_board', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='access', to='kanban.board')),
+                ('fk_user', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='board_access', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('fk_user', 'fk_board'), name='board_access_user_board_uniq')],
+            },
+        ),
+        migrations.RunPython(fill_access, migrations.RunPython.noop),
+    ]
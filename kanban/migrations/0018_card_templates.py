@@ -0,0 +1,35 @@
+# Generated by Django 5.1 on 2026-10-19 14:42
+
+import django.db.models.deletion
+import django.db.models.functions.text
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban', '0017_board_access'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CardTemplate',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('title', models.CharField(max_length=100)),
+                ('description', models.TextField(blank=True, null=True)),
+                ('priority', models.CharField(choices=[('U', 'Urgente'), ('I', 'Importante'), ('M', 'Média'), ('B', 'Baixa')], default='M', max_length=1)),
+                ('tasks', models.JSONField(blank=True, default=list)),
+                ('tags', models.JSONField(blank=True, default=list)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('fk_board', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='card_templates', to='kanban.board')),
+                ('fk_user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='card_templates', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(models.F('fk_board'), django.db.models.functions.text.Lower('name'), name='card_template_board_name_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.1 on 2026-10-19 16:20
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban', '0018_card_templates'),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='cardreminder',
+            unique_together={('fk_card', 'threshold', 'due_date')},
+        ),
+    ]
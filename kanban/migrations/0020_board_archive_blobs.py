@@ -0,0 +1,50 @@
+# Generated by Django 5.1 on 2026-10-19 15:04
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def copy_blobs(apps, schema_editor):
+    # Passa a lista JSON de cada arquivo para a tabela indexada
+    BoardArchive = apps.get_model('kanban', 'BoardArchive')
+    BoardArchiveBlob = apps.get_model('kanban', 'BoardArchiveBlob')
+    for archive_id, names in BoardArchive.objects.exclude(blobs=[]).values_list('id', 'blobs').iterator():
+        BoardArchiveBlob.objects.bulk_create(
+            [BoardArchiveBlob(fk_archive_id=archive_id, name=name) for name in set(names)], batch_size=1000,
+        )
+
+
+def copy_blobs_back(apps, schema_editor):
+    BoardArchive = apps.get_model('kanban', 'BoardArchive')
+    BoardArchiveBlob = apps.get_model('kanban', 'BoardArchiveBlob')
+    names = {}
+    for archive_id, name in BoardArchiveBlob.objects.order_by('name').values_list('fk_archive_id', 'name').iterator():
+        names.setdefault(archive_id, []).append(name)
+    for archive_id, blobs in names.items():
+        BoardArchive.objects.filter(id=archive_id).update(blobs=blobs)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban', '0019_cardreminder_due_date_unique'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BoardArchiveBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(db_index=True, max_length=255)),
+                ('fk_archive', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='blobs', to='kanban.boardarchive')),
+            ],
+            options={
+                'unique_together': {('fk_archive', 'name')},
+            },
+        ),
+        migrations.RunPython(copy_blobs, copy_blobs_back),
+        migrations.RemoveField(
+            model_name='boardarchive',
+            name='blobs',
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.1 on 2026-10-19 15:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('kanban', '0020_board_archive_blobs'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='card',
+            name='priority_rank',
+            field=models.GeneratedField(db_persist=True, expression=models.Case(models.When(priority='U', then=models.Value(0)), models.When(priority='I', then=models.Value(1)), models.When(priority='M', then=models.Value(2)), models.When(priority='B', then=models.Value(3)), default=models.Value(4)), output_field=models.PositiveSmallIntegerField()),
+        ),
+        migrations.AddIndex(
+            model_name='card',
+            index=models.Index(fields=['priority_rank', 'due_date'], name='card_priority_rank_idx'),
+        ),
+    ]
@@ -1,8 +1,14 @@
-from django.db import models
+import uuid
+
+from django.db import models, transaction
+from django.db.models.functions import Lower
+from django.utils import timezone
 from django.conf import settings
 from django.core.validators import RegexValidator
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
 
+from .storage import attachment_storage
+
 # Gerenciador de usuário personalizado
 class UserManager(BaseUserManager):
     def create_user(self, login, name, password, **extra_fields):
@@ -57,11 +63,31 @@ class User(AbstractBaseUser, PermissionsMixin):
     def __str__(self):
         return self.login
 
+class BoardQuerySet(models.QuerySet):
+    def alive(self):
+        # Quadros removidos (soft delete) somem imediatamente, antes do expurgo em segundo plano;
+        # quadros arquivados não têm conteúdo nas tabelas ativas e não aceitam escrita
+        return self.filter(deleted_at__isnull=True, archived_at__isnull=True)
+
+    def accessible_to(self, user, include_inactive=False):
+        # Quadros que o usuário possui ou nos quais é colaborador, lidos da tabela materializada
+        # BoardAccess: um único semi-join pelo índice (fk_user, fk_board), sem OR, JOIN ou DISTINCT
+        queryset = self.filter(id__in=BoardAccess.objects.filter(fk_user=user).values('fk_board'))
+        return queryset if include_inactive else queryset.alive()
+
 class Board(models.Model):
     name = models.CharField(max_length=100)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     fk_user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='boards')
+    # Contador desnormalizado mantido por kanban/counters.py
+    urgent_card_count = models.PositiveIntegerField(default=0, editable=False)
+    # Preenchido na remoção; o conteúdo é expurgado depois, em lotes (kanban/reaper.py)
+    deleted_at = models.DateTimeField(blank=True, null=True, editable=False, db_index=True)
+    # Preenchido no arquivamento: colunas, cartões e filhos saem das tabelas ativas (kanban/archive.py)
+    archived_at = models.DateTimeField(blank=True, null=True, editable=False)
+
+    objects = BoardQuerySet.as_manager()
 
     def has_permission(self, user, permission_type='view'):
         # Administradores do sistema têm acesso de visualização a todos os quadros
@@ -87,20 +113,66 @@ class Board(models.Model):
     def __str__(self):
         return self.name
 
+# Versão desatualizada: outra requisição alterou o registro depois que ele foi lido
+class VersionConflict(Exception):
+    pass
+
+# Controle de concorrência otimista: cada save incrementa `version` e o UPDATE só
+# acontece se a versão no banco ainda for a que foi lida (WHERE version = lida)
+class VersionedModel(models.Model):
+    version = models.PositiveIntegerField(default=1, editable=False)
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        if self._state.adding:
+            return super().save(*args, **kwargs)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'version'}
+        self._read_version = self.version
+        self.version += 1
+        try:
+            super().save(*args, **kwargs)
+        except VersionConflict:
+            self.version = self._read_version
+            raise
+        finally:
+            del self._read_version
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, forced_update):
+        read_version = getattr(self, '_read_version', None)
+        if read_version is None:
+            return super()._do_update(base_qs, using, pk_val, values, update_fields, forced_update)
+        if super()._do_update(base_qs.filter(version=read_version), using, pk_val, values, update_fields, forced_update):
+            return True
+        if base_qs.filter(pk=pk_val).exists():
+            raise VersionConflict(f'{self._meta.verbose_name} {pk_val} foi alterado por outra requisição.')
+        return False
+
 # Modelo de coluna (Kanban)
-class Column(models.Model):
+class Column(VersionedModel):
     name = models.CharField(max_length=100)
     position = models.IntegerField()
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     fk_user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='columns')
     fk_board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name='columns')
+    # Contador desnormalizado mantido por kanban/counters.py
+    card_count = models.PositiveIntegerField(default=0, editable=False)
+
+    class Meta:
+        constraints = [
+            # Garantida pelo banco: duas requisições simultâneas não criam colunas na mesma posição
+            models.UniqueConstraint(fields=['fk_board', 'position'], name='column_board_position_uniq'),
+        ]
 
     def __str__(self):
         return self.name
 
 # Modelo de cartão (Kanban)
-class Card(models.Model):
+class Card(VersionedModel):
     PRIORITY_CHOICES = (
         ('U', 'Urgente'),
         ('I', 'Importante'),
@@ -115,16 +187,59 @@ class Card(models.Model):
     start_date = models.DateTimeField(blank=True, null=True)
     due_date = models.DateTimeField(blank=True, null=True)
     priority = models.CharField(max_length=1, choices=PRIORITY_CHOICES, default='M', blank=True, null=True)
+    # Posição da prioridade na ordem de PRIORITY_CHOICES (Urgente = 0; sem prioridade por último),
+    # gravada pelo banco: a ordenação por prioridade lê o índice em vez de calcular um CASE por linha
+    priority_rank = models.GeneratedField(
+        expression=models.Case(
+            *[models.When(priority=code, then=models.Value(rank)) for rank, (code, _) in enumerate(PRIORITY_CHOICES)],
+            default=models.Value(len(PRIORITY_CHOICES)),
+        ),
+        output_field=models.PositiveSmallIntegerField(),
+        db_persist=True,
+    )
     fk_user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='cards')
     fk_assigned_user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='assigned_cards', null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # Contadores desnormalizados mantidos por kanban/counters.py
+    tasks_total = models.PositiveIntegerField(default=0, editable=False)
+    tasks_completed = models.PositiveIntegerField(default=0, editable=False)
+
+    class Meta:
+        # Índices usados pelos filtros e ordenações da listagem de cartões (kanban/filters.py)
+        indexes = [
+            models.Index(fields=['due_date'], name='card_due_date_idx'),
+            models.Index(fields=['priority', 'due_date'], name='card_priority_due_idx'),
+            models.Index(fields=['priority_rank', 'due_date'], name='card_priority_rank_idx'),
+            models.Index(fields=['fk_column', 'due_date'], name='card_column_due_idx'),
+        ]
+        constraints = [
+            # Também serve de índice para a ordenação (coluna, posição); posições nulas não conflitam
+            models.UniqueConstraint(fields=['fk_column', 'position'], name='card_column_position_uniq'),
+        ]
+
+    def save(self, *args, **kwargs):
+        # Salva e atualiza os contadores (signals) na mesma transação
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+    def get_board_id(self):
+        # Reaproveita a coluna já carregada (o serializer a resolve ao validar fk_column_id)
+        if Card.fk_column.is_cached(self):
+            return self.fk_column.fk_board_id
+        return Column.objects.filter(id=self.fk_column_id).values_list('fk_board_id', flat=True).first()
+
+    @property
+    def task_completion(self):
+        if not self.tasks_total:
+            return None
+        return round(100 * self.tasks_completed / self.tasks_total, 1)
 
     def __str__(self):
         return self.title
 
 # Modelo de tarefa (para cartões)
-class Task(models.Model):
+class Task(VersionedModel):
     title = models.CharField(max_length=100)
     position = models.IntegerField()
     fk_card = models.ForeignKey(Card, on_delete=models.CASCADE, related_name='tasks')
@@ -133,6 +248,16 @@ class Task(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['fk_card', 'position'], name='task_card_position_uniq'),
+        ]
+
+    def save(self, *args, **kwargs):
+        # Salva e atualiza os contadores (signals) na mesma transação
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
     def __str__(self):
         return self.title
 
@@ -143,10 +268,42 @@ class Tag(models.Model):
         max_length=7,
         validators=[RegexValidator(regex='^#[0-9A-Fa-f]{6}$', message='Cor hexadecimal inválida')]
     )
+    # Sem índice próprio: o índice único (quadro, lower(nome)) começa pelo quadro e atende às listagens
+    fk_board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name='tags', db_index=False)
     cards = models.ManyToManyField(Card, related_name='tags')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        constraints = [
+            # Nome único por quadro, sem diferenciar maiúsculas de minúsculas
+            models.UniqueConstraint(models.F('fk_board'), Lower('name'), name='tag_board_name_uniq'),
+        ]
+
+    def __str__(self):
+        return self.name
+
+# Modelo de cartão reutilizável de um quadro: instanciado em lote numa coluna (kanban/cloning.py).
+# Tarefas e tags ficam como listas de títulos e nomes: as tags são resolvidas pelo nome (sem
+# diferenciar maiúsculas) no quadro de destino na hora de instanciar.
+class CardTemplate(models.Model):
+    name = models.CharField(max_length=100)
+    fk_board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name='card_templates', db_index=False)
+    fk_user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='card_templates')
+    title = models.CharField(max_length=100)
+    description = models.TextField(blank=True, null=True)
+    priority = models.CharField(max_length=1, choices=Card.PRIORITY_CHOICES, default='M')
+    tasks = models.JSONField(default=list, blank=True)
+    tags = models.JSONField(default=list, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            # Nome único por quadro; o índice também atende à listagem por quadro
+            models.UniqueConstraint(models.F('fk_board'), Lower('name'), name='card_template_board_name_uniq'),
+        ]
+
     def __str__(self):
         return self.name
 
@@ -166,6 +323,8 @@ class Notification(models.Model):
         ('comment', 'Comentário'),
         ('task_completed', 'Tarefa Concluída'),
         ('card_moved', 'Cartão Movido'),
+        ('due_soon', 'Prazo Próximo'),
+        ('overdue', 'Cartão Atrasado'),
     )
       
     fk_user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='notifications')
@@ -177,16 +336,166 @@ class Notification(models.Model):
     def __str__(self):
         return self.message
 
+# Registro dos lembretes de prazo já enviados: garante um único aviso por cartão/limiar
+class CardReminder(models.Model):
+    THRESHOLD_CHOICES = (
+        ('due_soon', 'Prazo Próximo'),
+        ('overdue', 'Cartão Atrasado'),
+    )
+
+    fk_card = models.ForeignKey(Card, on_delete=models.CASCADE, related_name='reminders')
+    threshold = models.CharField(max_length=20, choices=THRESHOLD_CHOICES)
+    due_date = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        # Um aviso por prazo: se o prazo do cartão muda, o novo prazo volta a ser avisado
+        unique_together = ('fk_card', 'threshold', 'due_date')
+
+    def __str__(self):
+        return f"{self.fk_card_id} ({self.get_threshold_display()})"
+
+# Log de movimentação de cartões entre colunas (somente inserção).
+# from_column vazio indica criação do cartão e to_column vazio indica remoção.
+# Não há restrições de FK: o histórico sobrevive à remoção do cartão e a remoção em
+# cascata de um quadro pode registrar as saídas dos cartões sem violar integridade.
+class CardTransition(models.Model):
+    card_id = models.BigIntegerField()
+    fk_board = models.ForeignKey(Board, on_delete=models.DO_NOTHING, db_constraint=False, related_name='transitions')
+    from_column = models.BigIntegerField(blank=True, null=True)
+    to_column = models.BigIntegerField(blank=True, null=True)
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['fk_board', 'created_at'], name='transition_board_created_idx'),
+            models.Index(fields=['card_id', 'created_at'], name='transition_card_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.card_id}: {self.from_column} -> {self.to_column}"
+
+# Expurgo de um quadro removido: executado em lotes pelo reaper após o prazo de
+# restauração. Sem restrição de FK, o registro do progresso sobrevive ao quadro.
+class BoardDeletion(models.Model):
+    STATUS_CHOICES = (
+        ('pending', 'Aguardando'),
+        ('running', 'Em andamento'),
+        ('done', 'Concluído'),
+        ('cancelled', 'Cancelado'),
+    )
+
+    fk_board = models.ForeignKey(Board, on_delete=models.DO_NOTHING, db_constraint=False, related_name='deletions')
+    requested_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.DO_NOTHING, db_constraint=False,
+                                     related_name='board_deletions', blank=True, null=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    purge_after = models.DateTimeField()
+    total = models.PositiveIntegerField(default=0)
+    removed = models.PositiveIntegerField(default=0)
+    progress = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    heartbeat_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'purge_after'], name='deletion_status_purge_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.fk_board_id} ({self.get_status_display()})"
+
+# Conteúdo de um quadro arquivado (colunas, cartões, tarefas, comentários, anexos...)
+# em JSON comprimido com gzip, fora das tabelas e índices ativos. Enquanto `complete`
+# for falso, as linhas ativas ainda estão sendo removidas em lotes.
+class BoardArchive(models.Model):
+    fk_board = models.OneToOneField(Board, on_delete=models.CASCADE, related_name='archive')
+    archived_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, blank=True, null=True,
+                                    related_name='board_archives')
+    data = models.BinaryField()
+    raw_size = models.PositiveBigIntegerField(default=0)
+    counts = models.JSONField(default=dict, blank=True)
+    complete = models.BooleanField(default=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.fk_board_id} ({len(self.data)} bytes)"
+
+# Blobs de anexos citados por um arquivo de quadro (não podem ser removidos como órfãos).
+# Indexados pelo nome: o expurgo consulta só os nomes que pretende apagar.
+class BoardArchiveBlob(models.Model):
+    fk_archive = models.ForeignKey(BoardArchive, on_delete=models.CASCADE, related_name='blobs')
+    name = models.CharField(max_length=255, db_index=True)
+
+    class Meta:
+        unique_together = ('fk_archive', 'name')
+
+    def __str__(self):
+        return self.name
+
+# Feed de atividades dos quadros (quem criou, editou, moveu, comentou ou removeu o quê).
+# Tabela somente de inserção, lida por (fk_board, created_at) e podada por idade
+# (manage.py prune_activity). Sem restrições de FK, pode ser particionada por created_at.
+class Activity(models.Model):
+    VERB_CHOICES = (
+        ('created', 'Criou'),
+        ('updated', 'Editou'),
+        ('moved', 'Moveu'),
+        ('commented', 'Comentou'),
+        ('deleted', 'Removeu'),
+    )
+
+    fk_board = models.ForeignKey(Board, on_delete=models.DO_NOTHING, db_constraint=False, related_name='activities')
+    fk_user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.DO_NOTHING, db_constraint=False,
+                                related_name='activities', blank=True, null=True)
+    verb = models.CharField(max_length=10, choices=VERB_CHOICES)
+    target_type = models.CharField(max_length=30)
+    target_id = models.BigIntegerField()
+    summary = models.CharField(max_length=255, blank=True, default='')
+    created_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['fk_board', 'created_at'], name='activity_board_created_idx'),
+            models.Index(fields=['created_at'], name='activity_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.fk_user_id} {self.verb} {self.target_type}:{self.target_id}"
+
 # Modelo de anexo (para cartões)
 class Attachment(models.Model):
-    file = models.FileField(upload_to='attachments/')
+    # Blob endereçado pelo SHA-256 do conteúdo (kanban/storage.py): arquivos iguais são gravados uma vez
+    file = models.FileField(upload_to='attachments/', storage=attachment_storage, max_length=255)
+    original_name = models.CharField(max_length=255, blank=True, default='')
+    content_type = models.CharField(max_length=100, blank=True, default='')
+    size = models.PositiveBigIntegerField(default=0)
+    checksum = models.CharField(max_length=64, blank=True, default='', db_index=True)
+    # Miniatura gerada em segundo plano (kanban/thumbnails.py), gravada ao lado do blob
+    thumbnail = models.CharField(max_length=255, blank=True, default='')
     fk_card = models.ForeignKey(Card, on_delete=models.CASCADE, related_name='attachments')
     uploaded_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
-        return self.file.name
+        return self.original_name or self.file.name
+
+# Upload em partes (retomável) de um anexo: os bytes ficam em um arquivo parcial até completar `size`
+class UploadSession(models.Model):
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    fk_card = models.ForeignKey(Card, on_delete=models.CASCADE, related_name='upload_sessions')
+    uploaded_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='upload_sessions')
+    filename = models.CharField(max_length=255)
+    content_type = models.CharField(max_length=100)
+    size = models.PositiveBigIntegerField()
+    offset = models.PositiveBigIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    def __str__(self):
+        return f'{self.filename} ({self.offset}/{self.size})'
     
 # Modelo para gerenciar os colaboradores de um quadro Kanban
 class BoardCollaborator(models.Model):
@@ -207,3 +516,47 @@ class BoardCollaborator(models.Model):
 
     def __str__(self):
         return f"{self.fk_user.name} - {self.fk_board.name} ({self.get_permission_display()})"
+
+
+# Acesso materializado: uma linha por (usuário, quadro) para o dono e para cada colaborador,
+# mantida por kanban/access.py a cada mudança de dono ou de colaboradores
+class BoardAccess(models.Model):
+    PERMISSION_CHOICES = (('owner', 'Dono'),) + BoardCollaborator.PERMISSION_CHOICES
+
+    fk_user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='board_access', db_index=False)
+    fk_board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name='access')
+    permission = models.CharField(max_length=10, choices=PERMISSION_CHOICES)
+
+    class Meta:
+        constraints = [
+            # Também serve de índice para "quadros do usuário" (fk_user, fk_board)
+            models.UniqueConstraint(fields=['fk_user', 'fk_board'], name='board_access_user_board_uniq'),
+        ]
+
+    def __str__(self):
+        return f"{self.fk_user_id} -> {self.fk_board_id} ({self.permission})"
+
+
+# Entrada do índice de busca textual (cartões, comentários e tarefas).
+# O índice propriamente dito depende do banco: FTS5 no SQLite e GIN sobre
+# tsvector no PostgreSQL (ver migração 0005 e kanban/search.py).
+class SearchEntry(models.Model):
+    KIND_CHOICES = (
+        ('card', 'Cartão'),
+        ('comment', 'Comentário'),
+        ('task', 'Tarefa'),
+    )
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    fk_card = models.ForeignKey(Card, on_delete=models.CASCADE, related_name='search_entries')
+    fk_board = models.ForeignKey(Board, on_delete=models.CASCADE, related_name='search_entries')
+    title = models.CharField(max_length=100, default='', blank=True)
+    body = models.TextField(default='', blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('kind', 'object_id')
+
+    def __str__(self):
+        return f"{self.kind}:{self.object_id}"
@@ -0,0 +1,140 @@
+import hashlib
+import os
+import threading
+from functools import lru_cache
+from importlib import import_module
+from pathlib import Path
+
+import drf_yasg
+from django.apps import apps
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags
+from drf_yasg.renderers import OpenAPIRenderer, SwaggerJSONRenderer, SwaggerYAMLRenderer
+from drf_yasg.views import get_schema_view
+
+# Formatos gerados por manage.py generate_schema (openapi.json, openapi.yaml) e a versão do código
+KINDS = ('json', 'yaml')
+# Renderers do documento (os da UI só montam a página, que busca o documento por ?format=openapi)
+SPEC_RENDERERS = (OpenAPIRenderer, SwaggerJSONRenderer, SwaggerYAMLRenderer)
+VERSION_FILE = 'openapi.version'
+
+_memo = {}
+_memo_lock = threading.Lock()
+
+
+def schema_dir():
+    return Path(getattr(settings, 'KANBAN_SCHEMA_DIR', settings.BASE_DIR / 'openapi'))
+
+
+@lru_cache(maxsize=None)
+def code_version():
+    """
+    Versão do código que define o schema: KANBAN_CODE_VERSION (ex.: o commit do
+    build) ou, sem ela, um hash do código das apps do projeto e do urlconf.
+    Calculada uma vez por processo: mudar o código exige reiniciar o processo.
+    """
+    configured = getattr(settings, 'KANBAN_CODE_VERSION', None)
+    if configured:
+        return str(configured)
+    base = Path(settings.BASE_DIR).resolve()
+    roots = {Path(config.path).resolve() for config in apps.get_app_configs()}
+    roots.add(Path(import_module(settings.ROOT_URLCONF).__file__).resolve().parent)
+    digest = hashlib.sha256(drf_yasg.__version__.encode())
+    for root in sorted(root for root in roots if root.is_relative_to(base)):
+        for folder, subfolders, files in os.walk(root):
+            subfolders[:] = sorted(name for name in subfolders if name not in ('migrations', '__pycache__'))
+            for name in sorted(files):
+                if name.endswith('.py'):
+                    path = Path(folder, name)
+                    digest.update(str(path.relative_to(base)).encode())
+                    digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def _kind(renderer):
+    return 'yaml' if issubclass(renderer, SwaggerYAMLRenderer) else 'json'
+
+
+def encode(view_class, kind):
+    # Mesmo documento do drf_yasg, mas sem requisição: não depende de quem pede nem do host.
+    # O renderer é o da view (com os validadores configurados em get_schema_view)
+    generator = view_class.generator_class(view_class.schema_info, '', None, None, None)
+    schema = generator.get_schema(request=None, public=True)
+    renderer = next(
+        renderer for renderer in view_class.renderer_classes
+        if issubclass(renderer, SPEC_RENDERERS) and _kind(renderer) == kind
+    )
+    return renderer().render(schema)
+
+
+def _document(data):
+    return data, f'"{hashlib.sha256(data).hexdigest()[:32]}"'
+
+
+def _static(kind):
+    # Arquivo gerado no build; ignorado se foi gerado para outra versão do código
+    folder = schema_dir()
+    path = folder / f'openapi.{kind}'
+    try:
+        stat = path.stat()
+        version = (folder / VERSION_FILE).read_text().strip()
+    except OSError:
+        return None
+    if version != code_version():
+        return None
+    key = ('static', kind, stat.st_mtime_ns, stat.st_size)
+    cached = _memo.get(key)
+    if cached is None:
+        cached = _document(path.read_bytes())
+        with _memo_lock:
+            for stale in [other for other in _memo if other[:2] == key[:2]]:
+                del _memo[stale]
+            _memo[key] = cached
+    return cached
+
+
+def _memoized(view_class, kind):
+    # Gerado uma vez por versão do código e formato; gerações concorrentes esperam a primeira
+    key = ('generated', kind, code_version())
+    cached = _memo.get(key)
+    if cached is None:
+        with _memo_lock:
+            cached = _memo.get(key)
+            if cached is None:
+                cached = _memo[key] = _document(encode(view_class, kind))
+    return cached
+
+
+def document(view_class, kind):
+    return _static(kind) or _memoized(view_class, kind)
+
+
+def get_cached_schema_view(info, **kwargs):
+    """
+    get_schema_view do drf_yasg com o documento (JSON/YAML) servido do arquivo
+    gerado por manage.py generate_schema ou, na falta dele, gerado uma vez e
+    guardado em memória. Respostas levam ETag e aceitam If-None-Match. As
+    páginas de UI não mudam: já eram baratas e buscam o documento por ?format=openapi.
+    """
+    base = get_schema_view(info, **kwargs)
+
+    class CachedSchemaView(base):
+        schema_info = info
+
+        def get(self, request, version='', format=None):
+            renderer = request.accepted_renderer
+            if not isinstance(renderer, SPEC_RENDERERS):
+                return super().get(request, version, format)
+            data, etag = document(type(self), _kind(type(renderer)))
+            # Comparação fraca: a compressão (CompressionMiddleware) devolve o ETag como W/"..."
+            if etag in [tag.removeprefix('W/') for tag in parse_etags(request.headers.get('If-None-Match', ''))]:
+                response = HttpResponseNotModified()
+            else:
+                response = HttpResponse(data, content_type=renderer.media_type)
+            response['ETag'] = etag
+            patch_cache_control(response, no_cache=True)
+            return response
+
+    return CachedSchemaView
@@ -0,0 +1,155 @@
+import logging
+import re
+import time
+import traceback
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import partial
+
+from django.conf import settings
+
+logger = logging.getLogger('kanban.querywatch')
+
+# Inspetores ativos no contexto corrente (blocos inspect_queries podem ser aninhados)
+_active = ContextVar('kanban_query_inspectors', default=())
+
+DEFAULTS = {
+    # Liga a inspeção das queries de cada requisição (pensado para desenvolvimento/staging)
+    'ENABLED': False,
+    # Número de execuções da mesma query (mudando apenas os parâmetros) que caracteriza um N+1
+    'NPLUSONE_THRESHOLD': 5,
+    # Queries mais lentas que esse limite (em ms) são registradas como lentas
+    'SLOW_QUERY_MS': 100,
+    # Se True, levanta QueryProblem em vez de apenas registrar no log
+    'RAISE': False,
+    # Quantidade de frames da pilha exibidos em cada ocorrência
+    'STACK_DEPTH': 8,
+}
+
+# Módulos de instrumentação que não interessam na pilha exibida
+_SKIPPED_MODULES = ('querywatch.py', 'metrics.py', 'middleware.py')
+
+_IN_LIST = re.compile(r'\bIN \((?:%s, )*%s\)', re.IGNORECASE)
+_WHITESPACE = re.compile(r'\s+')
+
+
+def get_config(**overrides):
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, 'KANBAN_QUERY_INSPECTOR', {}))
+    config.update({key.upper(): value for key, value in overrides.items()})
+    return config
+
+
+class QueryProblem(Exception):
+    """Levantada quando o inspetor encontra um N+1 ou uma query lenta com RAISE ativo."""
+
+    def __init__(self, problems):
+        self.problems = problems
+        super().__init__('\n\n'.join(str(problem) for problem in problems))
+
+
+class Problem:
+    def __init__(self, kind, sql, count, duration, stack):
+        self.kind = kind
+        self.sql = sql
+        self.count = count
+        self.duration = duration
+        self.stack = stack
+
+    def __str__(self):
+        if self.kind == 'nplusone':
+            header = f'Possível N+1: query repetida {self.count} vezes ({self.duration * 1000:.1f} ms no total)'
+        else:
+            header = f'Query lenta: {self.duration * 1000:.1f} ms'
+        return f'{header}\n  {self.sql}\n' + ''.join(self.stack)
+
+
+def normalize(sql):
+    # Queries que diferem apenas nos parâmetros já chegam com os mesmos placeholders;
+    # listas IN de qualquer tamanho (inclusive de um só item) são colapsadas para o mesmo formato.
+    return _IN_LIST.sub('IN (%s...)', _WHITESPACE.sub(' ', sql.strip()))
+
+
+def _capture_stack(depth):
+    # Descarta os frames do Django, do DRF e da instrumentação para apontar o código da aplicação
+    frames = [
+        frame for frame in traceback.extract_stack()
+        if '/django/' not in frame.filename and 'rest_framework' not in frame.filename
+        and not frame.filename.endswith(_SKIPPED_MODULES)
+    ]
+    return traceback.format_list(frames[-depth:])
+
+
+class QueryInspector:
+    """execute_wrapper que agrupa as queries por SQL normalizado e aponta repetições e lentidão."""
+
+    def __init__(self, **overrides):
+        self.config = get_config(**overrides)
+        self.threshold = self.config['NPLUSONE_THRESHOLD']
+        self.slow = self.config['SLOW_QUERY_MS'] / 1000
+        self.counts = {}
+        self.durations = {}
+        self.problems = []
+        self._reported = set()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            key = normalize(sql)
+            count = self.counts.get(key, 0) + 1
+            self.counts[key] = count
+            self.durations[key] = self.durations.get(key, 0.0) + duration
+            if count == self.threshold and key not in self._reported:
+                self._reported.add(key)
+                self.problems.append(Problem('nplusone', key, count, 0.0, _capture_stack(self.config['STACK_DEPTH'])))
+            if duration >= self.slow:
+                self.problems.append(Problem('slow', key, 1, duration, _capture_stack(self.config['STACK_DEPTH'])))
+
+    def finish(self, label=''):
+        # Atualiza a contagem final e o tempo acumulado de cada N+1 encontrado
+        for problem in self.problems:
+            if problem.kind == 'nplusone':
+                problem.count = self.counts[problem.sql]
+                problem.duration = self.durations[problem.sql]
+        if not self.problems:
+            return
+        if self.config['RAISE']:
+            raise QueryProblem(self.problems)
+        for problem in self.problems:
+            logger.warning('%s%s', f'[{label}] ' if label else '', problem)
+
+
+def execute_wrapper(execute, sql, params, many, context):
+    # Instalado em todas as conexões (kanban/signals.py); repassa a query aos inspetores ativos
+    inspectors = _active.get()
+    for inspector in inspectors:
+        execute = partial(inspector, execute)
+    return execute(sql, params, many, context)
+
+
+@contextmanager
+def inspect_queries(label='', **overrides):
+    """
+    Inspeciona as queries executadas no bloco. Nos testes, use
+    `with inspect_queries(raise_=True)` ou `assert_no_n_plus_one()` para
+    fazer um N+1 detectado falhar o teste.
+    """
+    if 'raise_' in overrides:
+        overrides['raise'] = overrides.pop('raise_')
+    inspector = QueryInspector(**overrides)
+    token = _active.set(_active.get() + (inspector,))
+    try:
+        yield inspector
+    finally:
+        _active.reset(token)
+    inspector.finish(label)
+
+
+def assert_no_n_plus_one(threshold=None):
+    overrides = {'raise': True}
+    if threshold is not None:
+        overrides['nplusone_threshold'] = threshold
+    return inspect_queries(**overrides)
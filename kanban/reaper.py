@@ -0,0 +1,183 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from . import uploads
+from .models import (
+    Board, BoardAccess, Column, Card, Task, Tag, CardTemplate, Comment, Attachment, BoardCollaborator, CardReminder, CardTransition,
+    Activity, SearchEntry, UploadSession, BoardDeletion, BoardArchive, BoardArchiveBlob,
+)
+
+# Prazo padrão para restaurar um quadro removido antes do expurgo (KANBAN_BOARD_PURGE_DELAY)
+PURGE_DELAY = timedelta(days=1)
+# Um expurgo "em andamento" sem sinal de vida há mais tempo que isso é retomado por outro worker
+STALE_AFTER = timedelta(minutes=10)
+
+
+def _steps(board_id):
+    # Das folhas para a raiz: cada etapa só apaga linhas que já não têm dependentes
+    card_filter = Q(fk_card__fk_column__fk_board_id=board_id)
+    return (
+        ('attachments', Attachment.objects.filter(card_filter)),
+        # Vínculos em que o cartão ou a tag são do quadro: os dois lados são apagados depois
+        ('tag_links', Tag.cards.through.objects.filter(
+            Q(card__fk_column__fk_board_id=board_id) | Q(tag__fk_board_id=board_id),
+        )),
+        ('tags', Tag.objects.filter(fk_board_id=board_id)),
+        ('card_templates', CardTemplate.objects.filter(fk_board_id=board_id)),
+        ('comments', Comment.objects.filter(card_filter)),
+        ('tasks', Task.objects.filter(card_filter)),
+        ('reminders', CardReminder.objects.filter(card_filter)),
+        ('search_entries', SearchEntry.objects.filter(fk_board_id=board_id)),
+        ('cards', Card.objects.filter(fk_column__fk_board_id=board_id)),
+        ('columns', Column.objects.filter(fk_board_id=board_id)),
+        ('collaborators', BoardCollaborator.objects.filter(fk_board_id=board_id)),
+        ('access', BoardAccess.objects.filter(fk_board_id=board_id)),
+        ('transitions', CardTransition.objects.filter(fk_board_id=board_id)),
+        ('activities', Activity.objects.filter(fk_board_id=board_id)),
+        ('archive_blobs', BoardArchiveBlob.objects.filter(fk_archive__fk_board_id=board_id)),
+        ('archive', BoardArchive.objects.filter(fk_board_id=board_id)),
+        ('board', Board.objects.filter(id=board_id)),
+    )
+
+
+def soft_delete(board, user=None):
+    """Esconde o quadro imediatamente e agenda o expurgo do conteúdo."""
+    now = timezone.now()
+    with transaction.atomic():
+        Board.objects.filter(id=board.id).update(deleted_at=now)
+        board.deleted_at = now
+        return BoardDeletion.objects.create(
+            fk_board_id=board.id,
+            requested_by=user,
+            purge_after=now + getattr(settings, 'KANBAN_BOARD_PURGE_DELAY', PURGE_DELAY),
+        )
+
+
+def restore(board):
+    """Desfaz a remoção enquanto o expurgo não começou. Devolve False se já é tarde."""
+    with transaction.atomic():
+        cancelled = BoardDeletion.objects.filter(fk_board_id=board.id, status='pending').update(
+            status='cancelled', finished_at=timezone.now(),
+        )
+        if not cancelled:
+            return False
+        Board.objects.filter(id=board.id).update(deleted_at=None)
+        board.deleted_at = None
+    return True
+
+
+def _claim(now):
+    # Marca como "em andamento" um expurgo vencido (ou abandonado por outro worker).
+    # A atualização condicional garante que dois workers não peguem o mesmo expurgo.
+    due = BoardDeletion.objects.filter(
+        Q(status='pending', purge_after__lte=now) |
+        Q(status='running', heartbeat_at__lt=now - STALE_AFTER)
+    ).order_by('purge_after', 'id')
+    for deletion in due[:10]:
+        claimed = BoardDeletion.objects.filter(id=deletion.id, status=deletion.status, heartbeat_at=deletion.heartbeat_at).update(
+            status='running', heartbeat_at=now, started_at=deletion.started_at or now,
+        )
+        if claimed:
+            deletion.refresh_from_db()
+            return deletion
+    return None
+
+
+def blobs_in_use(names):
+    # Blobs são compartilhados por conteúdo e podem ser citados por anexos ou por arquivos de quadros
+    names = {name for name in names if name}
+    in_use = set(Attachment.objects.filter(file__in=names).values_list('file', flat=True))
+    in_use.update(Attachment.objects.filter(thumbnail__in=names).values_list('thumbnail', flat=True))
+    in_use.update(BoardArchiveBlob.objects.filter(name__in=names).values_list('name', flat=True))
+    return in_use
+
+
+def _delete_blobs(names):
+    storage = Attachment.file.field.storage
+    names = {name for name in names if name}
+    for name in names - blobs_in_use(names):
+        storage.delete(name)
+
+
+def _blob_names(batch):
+    if batch.model is Attachment:
+        return [name for pair in batch.values_list('file', 'thumbnail') for name in pair]
+    if batch.model is BoardArchiveBlob:
+        return list(batch.values_list('name', flat=True))
+    return []
+
+
+def _delete_rows(model, ids, using):
+    # DELETE direto pelas chaves, sem o Collector do ORM: nada de signals, cascatas ou
+    # leitura prévia das linhas (tests.py confere que o expurgo não dispara os signals)
+    table, pk = (connections[using].ops.quote_name(name) for name in (model._meta.db_table, model._meta.pk.column))
+    with connections[using].cursor() as cursor:
+        cursor.execute(f'DELETE FROM {table} WHERE {pk} IN ({", ".join(["%s"] * len(ids))})', ids)
+        return cursor.rowcount
+
+
+def delete_in_batches(queryset, batch_size, on_batch=None):
+    """
+    Apaga as linhas de `queryset` em lotes de até `batch_size`, cada um na própria
+    transação (`on_batch(removidas)` roda dentro dela). Os deletes não disparam
+    signals nem cascatas: quem chama apaga as tabelas das folhas para a raiz.
+    Blobs de anexos que deixarem de ser referenciados são removidos do storage.
+    """
+    total = 0
+    while True:
+        ids = list(queryset.order_by().values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            return total
+        with transaction.atomic():
+            batch = queryset.model.objects.filter(pk__in=ids)
+            blobs = _blob_names(batch)
+            removed = _delete_rows(queryset.model, ids, queryset.db)
+            if on_batch is not None:
+                on_batch(removed)
+        total += removed
+        if blobs:
+            _delete_blobs(blobs)
+
+
+def discard_uploads(board_id):
+    for session in UploadSession.objects.filter(fk_card__fk_column__fk_board_id=board_id).iterator():
+        uploads.discard(session)
+
+
+def purge(deletion, batch_size=1000):
+    """
+    Apaga o conteúdo do quadro em lotes, atualizando o progresso a cada lote.
+    Contadores, busca e feed não são atualizados: morrem junto com o quadro.
+    """
+    board_id = deletion.fk_board_id
+    if not deletion.total:
+        deletion.total = sum(queryset.count() for _, queryset in _steps(board_id))
+        BoardDeletion.objects.filter(id=deletion.id).update(total=deletion.total)
+
+    discard_uploads(board_id)
+    for step, queryset in _steps(board_id):
+        def on_batch(removed, step=step):
+            deletion.progress[step] = deletion.progress.get(step, 0) + removed
+            BoardDeletion.objects.filter(id=deletion.id).update(
+                removed=F('removed') + removed, progress=deletion.progress, heartbeat_at=timezone.now(),
+            )
+        delete_in_batches(queryset, batch_size, on_batch)
+
+    BoardDeletion.objects.filter(id=deletion.id).update(status='done', finished_at=timezone.now())
+    deletion.refresh_from_db()
+    return deletion
+
+
+def run(now=None, batch_size=1000):
+    """Expurga todos os quadros cujo prazo de restauração venceu. Devolve quantos foram expurgados."""
+    purged = 0
+    while True:
+        deletion = _claim(now or timezone.now())
+        if deletion is None:
+            return purged
+        purge(deletion, batch_size=batch_size)
+        purged += 1
@@ -0,0 +1,98 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+from .models import Card, CardReminder, Notification
+
+# Antecedência padrão do aviso de prazo próximo (KANBAN_DUE_SOON_WINDOW)
+DUE_SOON_WINDOW = timedelta(hours=24)
+# Até quanto tempo depois do vencimento um cartão atrasado ainda gera aviso (KANBAN_OVERDUE_LOOKBACK).
+# Limita a faixa lida do índice de due_date em vez de varrer todo o histórico.
+OVERDUE_LOOKBACK = timedelta(days=30)
+
+MESSAGES = {
+    'due_soon': 'O cartão "{title}" vence em {due:%d/%m/%Y %H:%M}.',
+    'overdue': 'O cartão "{title}" está atrasado desde {due:%d/%m/%Y %H:%M}.',
+}
+
+
+def _ranges(now):
+    window = getattr(settings, 'KANBAN_DUE_SOON_WINDOW', DUE_SOON_WINDOW)
+    lookback = getattr(settings, 'KANBAN_OVERDUE_LOOKBACK', OVERDUE_LOOKBACK)
+    return {
+        'due_soon': (now, now + window),
+        'overdue': (now - lookback, now),
+    }
+
+
+def _pending(threshold, start, end):
+    # Faixa do índice card_due_date_idx, excluindo os cartões já avisados nesse limiar para o prazo atual
+    already_sent = CardReminder.objects.filter(fk_card=OuterRef('pk'), threshold=threshold, due_date=OuterRef('due_date'))
+    return (
+        Card.objects.filter(due_date__gte=start, due_date__lt=end, fk_column__fk_board__deleted_at__isnull=True)
+        .filter(~Exists(already_sent))
+        .order_by('due_date', 'id')
+    )
+
+
+def _notification(threshold, card):
+    return Notification(
+        fk_user_id=card['fk_assigned_user_id'] or card['fk_user_id'],
+        notification_type=threshold,
+        message=MESSAGES[threshold].format(title=card['title'], due=timezone.localtime(card['due_date'])),
+    )
+
+
+def _reminder(threshold, card):
+    return CardReminder(fk_card_id=card['id'], threshold=threshold, due_date=card['due_date'])
+
+
+def _process_batch(threshold, cards):
+    # A restrição única (fk_card, threshold, due_date) garante a idempotência
+    try:
+        with transaction.atomic():
+            CardReminder.objects.bulk_create([_reminder(threshold, card) for card in cards])
+            Notification.objects.bulk_create([_notification(threshold, card) for card in cards])
+        return len(cards)
+    except IntegrityError:
+        pass
+    # Outra execução concorrente já avisou algum cartão do lote: segue cartão a cartão,
+    # pulando só os já avisados
+    created = 0
+    for card in cards:
+        try:
+            with transaction.atomic():
+                _reminder(threshold, card).save(force_insert=True)
+                _notification(threshold, card).save(force_insert=True)
+        except IntegrityError:
+            continue
+        created += 1
+    return created
+
+
+def run_due_reminders(now=None, batch_size=500):
+    """
+    Cria as notificações de prazo próximo e de atraso ainda não enviadas.
+    Recebe `now` explicitamente para que os testes sejam determinísticos.
+    Retorna um dicionário {limiar: notificações criadas}.
+    """
+    now = now or timezone.now()
+    created = {}
+    for threshold, (start, end) in _ranges(now).items():
+        created[threshold] = 0
+        pending = _pending(threshold, start, end).values('id', 'title', 'due_date', 'fk_user_id', 'fk_assigned_user_id')
+        last = None
+        while True:
+            # Paginação por chave (due_date, id): cada lote é uma leitura contínua do índice
+            batch = pending
+            if last:
+                batch = batch.filter(Q(due_date__gt=last[0]) | Q(due_date=last[0], id__gt=last[1]))
+            batch = list(batch[:batch_size])
+            if not batch:
+                break
+            created[threshold] += _process_batch(threshold, batch)
+            last = (batch[-1]['due_date'], batch[-1]['id'])
+    return created
@@ -0,0 +1,77 @@
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+from rest_framework.renderers import BaseRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+# Formatos binários opcionais: entram em REST_FRAMEWORK (setup/settings.py) só se a biblioteca
+# estiver instalada (msgpack para MessagePack, cbor2 para CBOR); as importações ficam nos métodos.
+
+
+def _fallback(value):
+    # Tipos sem representação nativa no formato (Decimal, UUID, date, textos traduzíveis...)
+    # viram o mesmo valor que teriam no JSON do DRF
+    return JSONEncoder().default(value)
+
+
+class BinaryRenderer(BaseRenderer):
+    """
+    Base dos formatos binários. Com `native_datetimes`, os serializers entregam
+    datas e horas como datetime (ver InstrumentedModelSerializer.get_fields) e o
+    renderer as grava no tipo compacto do formato em vez de texto ISO 8601.
+    """
+
+    charset = None
+    native_datetimes = True
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return self.encode(data)
+
+    def encode(self, data):
+        raise NotImplementedError
+
+
+class MessagePackRenderer(BinaryRenderer):
+    # datetime com fuso vira a extensão Timestamp (-1): 6 a 10 bytes em vez de ~27 do texto ISO
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+
+    def encode(self, data):
+        import msgpack
+        return msgpack.packb(data, datetime=True, default=_fallback)
+
+
+class CBORRenderer(BinaryRenderer):
+    # datetime vira a tag 1 (segundos desde a época, inteiro ou float)
+    media_type = 'application/cbor'
+    format = 'cbor'
+
+    def encode(self, data):
+        import cbor2
+        return cbor2.dumps(
+            data, datetime_as_timestamp=True, default=lambda encoder, value: encoder.encode(_fallback(value)),
+        )
+
+
+class MessagePackParser(BaseParser):
+    media_type = 'application/msgpack'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        import msgpack
+        try:
+            # Timestamps chegam como datetime em UTC, aceitos pelos DateTimeField do DRF
+            return msgpack.unpackb(stream.read(), timestamp=3)
+        except (ValueError, TypeError, msgpack.ExtraData, msgpack.FormatError, msgpack.StackError) as exc:
+            raise ParseError(f'MessagePack inválido: {exc or type(exc).__name__}')
+
+
+class CBORParser(BaseParser):
+    media_type = 'application/cbor'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        import cbor2
+        try:
+            return cbor2.loads(stream.read())
+        except (ValueError, cbor2.CBORDecodeError) as exc:
+            raise ParseError(f'CBOR inválido: {exc or type(exc).__name__}')
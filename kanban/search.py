@@ -0,0 +1,168 @@
+import base64
+import binascii
+import itertools
+import json
+
+from django.db import connection
+from django.db.models import Q
+
+from .models import Board, Column, Card, Task, Comment, SearchEntry
+
+FTS_TABLE = 'kanban_searchentry_fts'
+
+
+# --- Manutenção do índice (chamada pelos signals em kanban/signals.py) ---
+
+def _board_of_card(card_id):
+    return Card.objects.filter(id=card_id).values_list('fk_column__fk_board_id', flat=True).first()
+
+
+def index_card(card):
+    board_id = Column.objects.filter(id=card.fk_column_id).values_list('fk_board_id', flat=True).first()
+    SearchEntry.objects.update_or_create(
+        kind='card', object_id=card.id,
+        defaults={'fk_card_id': card.id, 'fk_board_id': board_id,
+                  'title': card.title, 'body': card.description or ''},
+    )
+    # Se o cartão mudou de quadro, comentários e tarefas acompanham
+    SearchEntry.objects.filter(fk_card_id=card.id).exclude(fk_board_id=board_id).update(fk_board_id=board_id)
+
+
+def index_comment(comment):
+    SearchEntry.objects.update_or_create(
+        kind='comment', object_id=comment.id,
+        defaults={'fk_card_id': comment.fk_card_id, 'fk_board_id': _board_of_card(comment.fk_card_id),
+                  'body': comment.comment_text or ''},
+    )
+
+
+def index_task(task):
+    SearchEntry.objects.update_or_create(
+        kind='task', object_id=task.id,
+        defaults={'fk_card_id': task.fk_card_id, 'fk_board_id': _board_of_card(task.fk_card_id),
+                  'title': task.title},
+    )
+
+
+def remove(kind, object_id):
+    SearchEntry.objects.filter(kind=kind, object_id=object_id).delete()
+
+
+def index_board(board_id, batch_size=1000):
+    """
+    Recria as entradas dos cartões, comentários e tarefas do quadro, lendo e inserindo
+    em lotes. Para conteúdo gravado sem signals (ex.: restauração de um quadro arquivado).
+    """
+    SearchEntry.objects.filter(fk_board_id=board_id).delete()
+    card_filter = {'fk_card__fk_column__fk_board_id': board_id}
+    cards = Card.objects.filter(fk_column__fk_board_id=board_id).values_list('id', 'title', 'description')
+    comments = Comment.objects.filter(**card_filter).values_list('id', 'fk_card_id', 'comment_text')
+    tasks = Task.objects.filter(**card_filter).values_list('id', 'fk_card_id', 'title')
+    entries = itertools.chain(
+        (SearchEntry(kind='card', object_id=card_id, fk_card_id=card_id, fk_board_id=board_id,
+                     title=title, body=description or '')
+         for card_id, title, description in cards.iterator(chunk_size=batch_size)),
+        (SearchEntry(kind='comment', object_id=comment_id, fk_card_id=card_id, fk_board_id=board_id, body=text or '')
+         for comment_id, card_id, text in comments.iterator(chunk_size=batch_size)),
+        (SearchEntry(kind='task', object_id=task_id, fk_card_id=card_id, fk_board_id=board_id, title=title)
+         for task_id, card_id, title in tasks.iterator(chunk_size=batch_size)),
+    )
+    total = 0
+    while batch := list(itertools.islice(entries, batch_size)):
+        SearchEntry.objects.bulk_create(batch)
+        total += len(batch)
+    return total
+
+
+def rebuild():
+    # Reconstrói o índice FTS5 a partir da tabela de conteúdo (apenas SQLite)
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+# --- Consulta ---
+
+def encode_cursor(score, entry_id):
+    return base64.urlsafe_b64encode(json.dumps([score, entry_id]).encode()).decode()
+
+
+def decode_cursor(value):
+    try:
+        score, entry_id = json.loads(base64.urlsafe_b64decode(value.encode()))
+        return float(score), int(entry_id)
+    except (ValueError, TypeError, binascii.Error):
+        return None
+
+
+def _fts5_query(text):
+    # Cada termo vira uma frase entre aspas (escapando aspas internas); o último aceita prefixo
+    terms = ['"%s"' % term.replace('"', '""') for term in text.split()]
+    if terms:
+        terms[-1] += '*'
+    return ' '.join(terms)
+
+
+def _ranked_sql(text, boards_sql, boards_params):
+    table = SearchEntry._meta.db_table
+    if connection.vendor == 'sqlite':
+        # bm25 retorna valores menores para resultados mais relevantes; título pesa o dobro do corpo
+        sql = (
+            f"SELECT e.id AS id, bm25({FTS_TABLE}, 2.0, 1.0) AS score "
+            f"FROM {FTS_TABLE} JOIN {table} e ON e.id = {FTS_TABLE}.rowid "
+            f"WHERE {FTS_TABLE} MATCH %s AND e.fk_board_id IN ({boards_sql})"
+        )
+        return sql, [_fts5_query(text), *boards_params]
+    if connection.vendor == 'postgresql':
+        # A expressão precisa ser idêntica à do índice GIN kanban_searchentry_tsv
+        vector = "to_tsvector('portuguese', e.title || ' ' || e.body)"
+        sql = (
+            f"SELECT e.id AS id, -ts_rank({vector}, q) AS score "
+            f"FROM {table} e, websearch_to_tsquery('portuguese', %s) q "
+            f"WHERE {vector} @@ q AND e.fk_board_id IN ({boards_sql})"
+        )
+        return sql, [text, *boards_params]
+    return None, None
+
+
+def search(user, text, cursor=None, limit=20):
+    """
+    Busca `text` nos cartões, comentários e tarefas dos quadros acessíveis
+    ao usuário. Retorna (entradas ordenadas por relevância, próximo cursor).
+    """
+    boards_sql, boards_params = Board.objects.accessible_to(user).values('id').query.sql_with_params()
+    position = decode_cursor(cursor) if cursor else None
+    inner_sql, params = _ranked_sql(text, boards_sql, boards_params)
+
+    if inner_sql is None:
+        # Bancos sem índice textual suportado: busca simples, sem ranking
+        queryset = SearchEntry.objects.filter(
+            Q(title__icontains=text) | Q(body__icontains=text),
+            fk_board__in=Board.objects.accessible_to(user),
+        )
+        if position:
+            queryset = queryset.filter(id__gt=position[1])
+        rows = [(entry_id, 0.0) for entry_id in queryset.order_by('id').values_list('id', flat=True)[:limit + 1]]
+    else:
+        sql = f"SELECT id, score FROM ({inner_sql}) ranked"
+        if position:
+            sql += " WHERE score > %s OR (score = %s AND id > %s)"
+            params += [position[0], position[0], position[1]]
+        sql += " ORDER BY score, id LIMIT %s"
+        params.append(limit + 1)
+        with connection.cursor() as db_cursor:
+            db_cursor.execute(sql, params)
+            rows = db_cursor.fetchall()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1][1], rows[-1][0])
+
+    entries = SearchEntry.objects.in_bulk([entry_id for entry_id, _ in rows])
+    results = []
+    for entry_id, score in rows:
+        entry = entries[entry_id]
+        entry.rank = -score
+        results.append(entry)
+    return results, next_cursor
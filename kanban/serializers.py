@@ -1,17 +1,79 @@
 import re
+from django.db import IntegrityError, transaction
+from django.db.models import Prefetch
+from django.db.models.functions import Lower
 from django.utils import timezone
+from django.urls import reverse
 from rest_framework import serializers
 from django.core.validators import RegexValidator
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
-from .models import User, Board, Column, Card, Task, Tag, Comment, Notification, Attachment, BoardCollaborator
+from .models import User, Board, Column, Card, Task, Tag, CardTemplate, Comment, Notification, Attachment, BoardCollaborator, SearchEntry, Activity, UploadSession, BoardDeletion
+from . import metrics, uploads
+from .storage import ContentAddressedStorage
+
+# Serializer base que contabiliza o tempo de serialização/validação nas métricas da requisição.
+# Para formatos binários (kanban/renderers.py) as datas e horas saem como datetime, e não como
+# texto ISO 8601, para o renderer gravá-las no tipo compacto do formato.
+class InstrumentedModelSerializer(serializers.ModelSerializer):
+    def get_fields(self):
+        fields = super().get_fields()
+        renderer = getattr(self.context.get('request'), 'accepted_renderer', None)
+        if getattr(renderer, 'native_datetimes', False):
+            for field in fields.values():
+                if isinstance(field, serializers.DateTimeField):
+                    field.format = None
+        return fields
+
+    def to_representation(self, instance):
+        with metrics.serializer_timer():
+            return super().to_representation(instance)
+
+    def run_validation(self, data=serializers.empty):
+        with metrics.serializer_timer():
+            return super().run_validation(data)
+
+# Unicidade garantida pelo banco (UniqueConstraint) em vez de uma consulta antes do save,
+# que duas requisições simultâneas passariam juntas. Só a violação de `unique_constraint`
+# vira erro de validação; qualquer outro IntegrityError (FK, NOT NULL...) segue adiante.
+class UniqueConstraintMixin:
+    unique_field = 'position'
+    unique_constraint = None
+    unique_error = None
+
+    def save(self, **kwargs):
+        try:
+            with transaction.atomic():
+                return super().save(**kwargs)
+        except IntegrityError as error:
+            if not self._violates_unique(error):
+                raise
+            raise serializers.ValidationError({self.unique_field: self.unique_error})
+
+    def _violates_unique(self, error):
+        # PostgreSQL e MySQL citam o nome da constraint; o SQLite cita o nome só nos índices de
+        # expressão e, nos de campos, as colunas ("UNIQUE constraint failed: tabela.a, tabela.b")
+        message = str(error)
+        if self.unique_constraint in message:
+            return True
+        opts = self.Meta.model._meta
+        constraint = next(constraint for constraint in opts.constraints if constraint.name == self.unique_constraint)
+        if not constraint.fields:
+            return False
+        columns = ', '.join(f'{opts.db_table}.{opts.get_field(name).column}' for name in constraint.fields)
+        return message.rstrip().endswith(columns)
 
 # Serializer para o modelo User
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(InstrumentedModelSerializer):
     class Meta:
         model = User
         fields = '__all__'
         read_only_fields = ['id', 'is_staff', 'is_active']
 
+    @classmethod
+    def prefetch(cls, prefix=''):
+        # Grupos e permissões (M2M incluídos em fields) de todos os usuários da página, uma query cada
+        return (f'{prefix}groups', f'{prefix}user_permissions')
+
     def validate_login(self, value):
         # Expressão regular para o padrão de login aceitável
         pattern = r"^(?!.*\.\.)(?!.*\.$)(?!^[0-9])(?!^[._])(?!.*[._]{2})[a-zA-Z0-9._]{1,30}$"
@@ -55,7 +117,7 @@ class UserSerializer(serializers.ModelSerializer):
         instance.save()
         return instance
     
-class BoardSerializer(serializers.ModelSerializer):
+class BoardSerializer(InstrumentedModelSerializer):
     fk_user = UserSerializer(read_only=True)
     fk_user_id = serializers.PrimaryKeyRelatedField(queryset=User.objects.all(), source='fk_user')
 
@@ -75,7 +137,7 @@ class BoardSerializer(serializers.ModelSerializer):
 
         if not fk_user:
             raise serializers.ValidationError("O usuário associado deve ser fornecido para o quadro.")
-        if Board.objects.filter(name=name, fk_user=fk_user).exists():
+        if Board.objects.filter(name=name, fk_user=fk_user, deleted_at__isnull=True).exists():
             raise serializers.ValidationError({
                 'name': 'Você já possui um quadro com esse nome.'
             })
@@ -83,11 +145,16 @@ class BoardSerializer(serializers.ModelSerializer):
         return data
 
 # Serializer para o modelo Column
-class ColumnSerializer(serializers.ModelSerializer):
+class ColumnSerializer(UniqueConstraintMixin, InstrumentedModelSerializer):
+    unique_constraint = 'column_board_position_uniq'
+    unique_error = 'Já existe uma coluna nessa posição neste quadro.'
+
     class Meta:
         model = Column
         fields = '__all__'
         read_only_fields = ['id', 'created_at', 'updated_at']
+        # A unicidade de (quadro, posição) fica só com a constraint do banco
+        validators = []
     # Método para validar o nome da coluna, não pode estar vazia
     def validate_name(self, value):
         if not value.strip():
@@ -99,36 +166,55 @@ class ColumnSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("A posição não pode ser um número negativo.")
         return value
     
-    # Método para validar a posição da coluna, não pode haver duas colunas com a mesma posição para o mesmo usuário
+    # Método para validar o usuário e o quadro da coluna (a posição única por quadro é garantida pelo banco)
     def validate(self, data):
         fk_user = data.get('fk_user')
-        position = data.get('position')
         fk_board = data.get('fk_board')
         # Valida se o usuário associado foi fornecido
         if not fk_user:
             raise serializers.ValidationError("O usuário associado deve ser fornecido para a coluna.")
-        # Valida se já existe uma coluna com a mesma posição para o mesmo usuário
-        if Column.objects.filter(position=position, fk_user=fk_user).exists():
-            raise serializers.ValidationError({
-                'position': 'Você já possui uma coluna nessa posição.'
-            })
         # Valida se o board pertence ao usuário autenticado
         if fk_board and fk_board.fk_user != fk_user:
             raise serializers.ValidationError("Você não tem permissão para adicionar ou editar colunas neste quadro.")
         
         return data
 
+# Tags resumidas dentro do cartão (carregadas com prefetch_related nas listagens)
+class CardTagSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Tag
+        fields = ['id', 'name', 'color']
+
+    @classmethod
+    def prefetch(cls, prefix=''):
+        # Uma query para as tags de todos os cartões da página, pela tabela de junção
+        return Prefetch(f'{prefix}tags', queryset=Tag.objects.only(*cls.Meta.fields).order_by(Lower('name'), 'id'))
+
 # Serializer para o modelo Card
-class CardSerializer(serializers.ModelSerializer):
+class CardSerializer(UniqueConstraintMixin, InstrumentedModelSerializer):
+    unique_constraint = 'card_column_position_uniq'
+    unique_error = 'Já existe um cartão nesta posição para esta coluna. Cada posição deve ser única dentro de uma coluna.'
+
     fk_column = ColumnSerializer(read_only=True)
     fk_user = UserSerializer(read_only=True)
     fk_column_id = serializers.PrimaryKeyRelatedField(queryset=Column.objects.all(), source='fk_column')
     fk_user_id = serializers.PrimaryKeyRelatedField(queryset=User.objects.all(), source='fk_user')
+    task_completion = serializers.ReadOnlyField()
+    tags = CardTagSerializer(many=True, read_only=True)
 
     class Meta:
         model = Card
-        fields = '__all__'
+        # priority_rank só serve à ordenação (?ordering=priority)
+        exclude = ['priority_rank']
         read_only_fields = ['id', 'created_at', 'updated_at']
+        validators = []
+
+    @classmethod
+    def optimize(cls, queryset, prefix=''):
+        # Carrega em lote o que a representação aninhada lê: coluna, autor (com grupos e permissões) e tags
+        return queryset.select_related(f'{prefix}fk_column', f'{prefix}fk_user').prefetch_related(
+            CardTagSerializer.prefetch(prefix), *UserSerializer.prefetch(f'{prefix}fk_user__'),
+        )
 
     # Método para validar a prioridade do cartão, deve ser uma das opções permitidas
     def validate_priority(self, value):
@@ -145,11 +231,10 @@ class CardSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("A posição não pode ser um número negativo.")
         return value
     
-    # Método para validar a relação entre data de início e data de prazo final. Valida posição única por coluna
+    # Método para validar a relação entre data de início e data de prazo final (a posição única por coluna é garantida pelo banco)
     def validate(self, data):
         fk_user = data.get('fk_user')
         fk_column = data.get('fk_column')
-        position = data.get('position')
         start_date = data.get('start_date')
         due_date = data.get('due_date')
 
@@ -158,18 +243,6 @@ class CardSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError(
                 "O usuário do cartão deve ser o mesmo que o usuário associado à coluna selecionada."
             )
-        # Validação de unicidade de `position` por coluna
-        if position is not None and fk_column:
-            # Exclui o próprio objeto da validação para casos de atualização
-            queryset = Card.objects.filter(position=position, fk_column=fk_column)
-            if self.instance:
-                queryset = queryset.exclude(id=self.instance.id)
-
-            if queryset.exists():
-                raise serializers.ValidationError({
-                    'position': 'Já existe um cartão nesta posição para esta coluna. Cada posição deve ser única dentro de uma coluna.'
-                })
-
         if start_date and due_date and due_date < start_date:
             raise serializers.ValidationError({
                 'due_date': 'A data de vencimento não pode ser anterior à data de início.'
@@ -177,9 +250,33 @@ class CardSerializer(serializers.ModelSerializer):
     
         return data
 
+    def update(self, instance, validated_data):
+        previous_board = instance.fk_column.fk_board_id
+        card = super().update(instance, validated_data)
+        if card.fk_column.fk_board_id != previous_board:
+            self._move_tags(card, card.fk_column.fk_board_id)
+        return card
+
+    # As tags são do quadro: ao mudar de quadro, o cartão fica com as tags de mesmo nome (sem
+    # diferenciar maiúsculas) do quadro de destino e perde as que não existem lá
+    def _move_tags(self, card, board_id):
+        TagCard = Tag.cards.through
+        links = TagCard.objects.filter(card_id=card.id).exclude(tag__fk_board_id=board_id)
+        names = {name.lower() for name in links.values_list('tag__name', flat=True)}
+        if not names:
+            return
+        targets = Tag.objects.annotate(lower_name=Lower('name')).filter(
+            fk_board_id=board_id, lower_name__in=names,
+        ).values_list('id', flat=True)
+        links.delete()
+        TagCard.objects.bulk_create([TagCard(tag_id=tag_id, card_id=card.id) for tag_id in targets], ignore_conflicts=True)
+
 
 # Serializer para o modelo Task
-class TaskSerializer(serializers.ModelSerializer):
+class TaskSerializer(UniqueConstraintMixin, InstrumentedModelSerializer):
+    unique_constraint = 'task_card_position_uniq'
+    unique_error = 'Já existe uma tarefa nesta posição para este cartão. A posição deve ser única dentro de cada cartão.'
+
     fk_card = CardSerializer(read_only=True)  # Se você quiser incluir os dados completos do cartão
     fk_card_id = serializers.PrimaryKeyRelatedField(queryset=Card.objects.all(), source='fk_card')
 
@@ -187,18 +284,17 @@ class TaskSerializer(serializers.ModelSerializer):
         model = Task
         fields = '__all__'
         read_only_fields = ['id', 'created_at', 'updated_at']
+        validators = []
 
     def validate(self, data):
         """
         Validações:
         - Garante que `completed_at` seja automaticamente preenchido se `completed=True`.
         - Exige `completed_at` caso `completed=True`.
-        - Garante que `position` é única dentro de cada `fk_card`.
+        A posição única dentro de cada `fk_card` é garantida pelo banco.
         """
         completed = data.get('completed')
         completed_at = data.get('completed_at')
-        position = data.get('position')
-        fk_card = data.get('fk_card')
 
         # Atribui automaticamente `completed_at` se `completed=True` e `completed_at` não estiver preenchido
         if completed and not completed_at:
@@ -210,23 +306,14 @@ class TaskSerializer(serializers.ModelSerializer):
                 'completed_at': 'A data de conclusão deve ser fornecida quando a tarefa é marcada como concluída.'
             })
 
-        # Verifica a unicidade de `position` para cada `fk_card`
-        if position is not None and fk_card:
-            # Exclui a instância atual da validação (para evitar conflito em atualizações)
-            queryset = Task.objects.filter(position=position, fk_card=fk_card)
-            if self.instance:
-                queryset = queryset.exclude(id=self.instance.id)
-
-            if queryset.exists():
-                raise serializers.ValidationError({
-                    'position': 'Já existe uma tarefa nesta posição para este cartão. A posição deve ser única dentro de cada cartão.'
-                })
-
         return data
 
 
 # Serializer para o modelo Tag
-class TagSerializer(serializers.ModelSerializer):
+class TagSerializer(UniqueConstraintMixin, InstrumentedModelSerializer):
+    unique_field = 'name'
+    unique_constraint = 'tag_board_name_uniq'
+    unique_error = 'Essa tag já existe neste quadro.'
     color = serializers.CharField(
         validators=[RegexValidator(
             regex=r'^#[0-9A-Fa-f]{6}$',
@@ -238,15 +325,86 @@ class TagSerializer(serializers.ModelSerializer):
         model = Tag
         fields = '__all__'
         read_only_fields = ['id', 'created_at', 'updated_at']
+        # O nome único por quadro (sem diferenciar maiúsculas) fica com a constraint do banco
+        validators = []
+        # A tag pode ser criada sem cartões e marcada depois (inclusive em lote: tags/assign/)
+        extra_kwargs = {'cards': {'required': False}}
 
     def validate_name(self, value):
-        if Tag.objects.filter(name=value).exists():
-            raise serializers.ValidationError("Essa tag já existe.")
-        return value
+        if not value.strip():
+            raise serializers.ValidationError("O nome da tag não pode estar vazio.")
+        return value.strip()
+
+    # A tag pertence a um quadro e só pode marcar cartões dele
+    def validate(self, data):
+        fk_board = data.get('fk_board')
+        if self.instance and fk_board and fk_board.id != self.instance.fk_board_id:
+            raise serializers.ValidationError({'fk_board': 'Uma tag não pode ser movida para outro quadro.'})
+        board_id = fk_board.id if fk_board else self.instance.fk_board_id
+        card_ids = [card.id for card in data.get('cards', [])]
+        if card_ids and Card.objects.filter(id__in=card_ids).exclude(fk_column__fk_board_id=board_id).exists():
+            raise serializers.ValidationError({'cards': 'Os cartões devem pertencer ao quadro da tag.'})
+        return data
+
+
+# Modelo de cartão. Com `source_card`, os campos não enviados (título, descrição, prioridade,
+# tarefas e tags) são copiados do cartão, que deve ser do mesmo quadro do modelo.
+class CardTemplateSerializer(UniqueConstraintMixin, InstrumentedModelSerializer):
+    unique_field = 'name'
+    unique_constraint = 'card_template_board_name_uniq'
+    unique_error = 'Já existe um modelo de cartão com esse nome neste quadro.'
+
+    source_card = serializers.PrimaryKeyRelatedField(queryset=Card.objects.all(), write_only=True, required=False)
+    tasks = serializers.ListField(child=serializers.CharField(max_length=100), required=False, max_length=100)
+    tags = serializers.ListField(child=serializers.CharField(max_length=100), required=False, max_length=50)
+
+    class Meta:
+        model = CardTemplate
+        fields = '__all__'
+        read_only_fields = ['id', 'fk_user', 'created_at', 'updated_at']
+        validators = []
+        extra_kwargs = {'title': {'required': False}}
+
+    def validate_name(self, value):
+        if not value.strip():
+            raise serializers.ValidationError("O nome do modelo não pode estar vazio.")
+        return value.strip()
+
+    def validate(self, data):
+        fk_board = data.get('fk_board')
+        if self.instance and fk_board and fk_board.id != self.instance.fk_board_id:
+            raise serializers.ValidationError({'fk_board': 'Um modelo de cartão não pode ser movido para outro quadro.'})
+        board_id = fk_board.id if fk_board else self.instance.fk_board_id
+        card = data.pop('source_card', None)
+        if card is not None:
+            if card.get_board_id() != board_id:
+                raise serializers.ValidationError({'source_card': 'O cartão deve pertencer ao quadro do modelo.'})
+            data.setdefault('title', card.title)
+            data.setdefault('description', card.description)
+            data.setdefault('priority', card.priority or 'M')
+            data.setdefault('tasks', list(card.tasks.order_by('position', 'id').values_list('title', flat=True)))
+            data.setdefault('tags', list(card.tags.order_by(Lower('name'), 'id').values_list('name', flat=True)))
+        if not data.get('title', self.instance.title if self.instance else None):
+            raise serializers.ValidationError({'title': 'Informe o título ou o cartão de origem (source_card).'})
+        return data
+
+
+# Parâmetros da cópia de um quadro (boards/{id}/clone/)
+class BoardCloneSerializer(serializers.Serializer):
+    name = serializers.CharField(max_length=100, required=False)
+    cards = serializers.BooleanField(default=True)
+    tasks = serializers.BooleanField(default=True)
+    reset_progress = serializers.BooleanField(default=True)
+
+
+# Parâmetros da criação de cartões a partir de um modelo (card-templates/{id}/instantiate/)
+class CardTemplateInstantiateSerializer(serializers.Serializer):
+    column = serializers.PrimaryKeyRelatedField(queryset=Column.objects.all())
+    count = serializers.IntegerField(min_value=1, max_value=100, default=1)
 
 
 # Serializer para o modelo Comment
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(InstrumentedModelSerializer):
     fk_card = CardSerializer(read_only=True)
     fk_user = UserSerializer(read_only=True)
     fk_card_id = serializers.PrimaryKeyRelatedField(queryset=Card.objects.all(), source='fk_card')
@@ -263,7 +421,7 @@ class CommentSerializer(serializers.ModelSerializer):
         return value
 
 # Serializer para o modelo Notification
-class NotificationSerializer(serializers.ModelSerializer):
+class NotificationSerializer(InstrumentedModelSerializer):
     fk_user = UserSerializer(read_only=True)
     fk_user_id = serializers.PrimaryKeyRelatedField(queryset=User.objects.all(), source='fk_user')
 
@@ -280,33 +438,96 @@ class NotificationSerializer(serializers.ModelSerializer):
     
     # Método para validar o tipo de notificação está entre as opções permitidas.
     def validate_notification_type(self, value):
-        valid_types = dict(Notification.NOTIFICATION_TYPES).keys()  # Obtém as chaves válidas ('comment', 'task_completed', 'card_moved')
+        valid_types = dict(Notification.NOTIFICATION_TYPES).keys()  # Obtém as chaves válidas ('comment', 'task_completed', 'card_moved', 'due_soon', 'overdue')
         if value not in valid_types:
             raise serializers.ValidationError(
-                "Tipo de notificação inválido. Escolha uma das seguintes opções: 'comment' (Comentário), 'task_completed' (Tarefa Concluída), 'card_moved' (Cartão Movido)."
+                "Tipo de notificação inválido. Escolha uma das seguintes opções: 'comment' (Comentário), 'task_completed' (Tarefa Concluída), 'card_moved' (Cartão Movido), "
+                "'due_soon' (Prazo Próximo), 'overdue' (Cartão Atrasado)."
             )
         return value
 
 
 # Serializer para o modelo Attachment
-class AttachmentSerializer(serializers.ModelSerializer):
+class AttachmentSerializer(InstrumentedModelSerializer):
     fk_card = CardSerializer(read_only=True)
     uploaded_by = UserSerializer(read_only=True)
     fk_card_id = serializers.PrimaryKeyRelatedField(queryset=Card.objects.all(), source='fk_card')
     uploaded_by_id = serializers.PrimaryKeyRelatedField(queryset=User.objects.all(), source='uploaded_by')
+    download_url = serializers.SerializerMethodField()
+    thumbnail_url = serializers.SerializerMethodField()
 
     class Meta:
         model = Attachment
-        fields = '__all__'
-        read_only_fields = ['id', 'created_at', 'updated_at']
+        exclude = ['thumbnail']
+        read_only_fields = ['id', 'original_name', 'content_type', 'size', 'checksum', 'created_at', 'updated_at']
+
+    def _absolute_url(self, name, obj):
+        request = self.context.get('request')
+        url = reverse(name, kwargs={'id': obj.id})
+        return request.build_absolute_uri(url) if request else url
+
+    def get_download_url(self, obj):
+        return self._absolute_url('attachment-download', obj)
+
+    def get_thumbnail_url(self, obj):
+        # None enquanto a miniatura não foi gerada (ou para tipos sem miniatura)
+        return self._absolute_url('attachment-thumbnail', obj) if obj.thumbnail else None
 
     def validate_file(self, value):
-        if value.size > 1024 * 1024 * 5:  # Limitar o tamanho do arquivo a 5MB (1KB * 1MB * 5 = 5MB)
-            raise serializers.ValidationError("O arquivo não pode ter mais de 5MB.")
-        if not value.name.endswith(('.jpg', '.png', '.pdf')):
-            raise serializers.ValidationError("Formato de arquivo não permitido. Use .jpg, .png ou .pdf.")
+        # Tamanho e extensão também são checados durante o upload (uploads.LimitedUploadHandler)
+        error = uploads.size_error(value.size) or uploads.type_error(value.name)
+        if error:
+            raise serializers.ValidationError(error)
+        error = uploads.signature_error(value.name, next(value.chunks(), b''))
+        value.seek(0)
+        if error:
+            raise serializers.ValidationError(error)
+        return value
+
+    def _file_metadata(self, validated_data):
+        file = validated_data.get('file')
+        if file is not None:
+            # O hash calculado aqui é reaproveitado pelo storage ao gravar o blob
+            file.checksum = ContentAddressedStorage.digest(file)
+            validated_data.update(
+                original_name=file.name[:255], content_type=uploads.content_type_for(file.name),
+                size=file.size, checksum=file.checksum, thumbnail='',
+            )
+        return validated_data
+
+    def create(self, validated_data):
+        return super().create(self._file_metadata(validated_data))
+
+    def update(self, instance, validated_data):
+        return super().update(instance, self._file_metadata(validated_data))
+
+# Sessão de upload em partes: tamanho e tipo são validados antes de qualquer byte do arquivo
+class UploadSessionSerializer(InstrumentedModelSerializer):
+    fk_card_id = serializers.PrimaryKeyRelatedField(queryset=Card.objects.all(), source='fk_card')
+
+    class Meta:
+        model = UploadSession
+        fields = ['id', 'fk_card_id', 'filename', 'content_type', 'size', 'offset', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'content_type', 'offset', 'created_at', 'updated_at']
+
+    def validate_filename(self, value):
+        error = uploads.type_error(value)
+        if error:
+            raise serializers.ValidationError(error)
+        return value
+
+    def validate_size(self, value):
+        error = uploads.size_error(value)
+        if error:
+            raise uploads.PayloadTooLarge(error)
+        if value == 0:
+            raise serializers.ValidationError("O arquivo não pode ser vazio.")
         return value
 
+    def create(self, validated_data):
+        validated_data['content_type'] = uploads.content_type_for(validated_data['filename'])
+        return super().create(validated_data)
+
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
     username_field = 'login'  # Especifica 'login' como o campo de identificação
 
@@ -325,8 +546,32 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
 
         return super().validate(attrs)
 
-class BoardCollaboratorSerializer(serializers.ModelSerializer):
+class BoardCollaboratorSerializer(InstrumentedModelSerializer):
     class Meta:
         model = BoardCollaborator
         fields = '__all__'
         read_only_fields = ['id', 'created_at']
+
+# Serializer para os resultados da busca textual
+class SearchEntrySerializer(InstrumentedModelSerializer):
+    rank = serializers.FloatField(read_only=True)
+
+    class Meta:
+        model = SearchEntry
+        fields = ['kind', 'object_id', 'fk_card', 'fk_board', 'title', 'body', 'rank', 'updated_at']
+        read_only_fields = fields
+
+# Serializer para o feed de atividades dos quadros
+class ActivitySerializer(InstrumentedModelSerializer):
+    class Meta:
+        model = Activity
+        fields = ['id', 'fk_user', 'verb', 'target_type', 'target_id', 'summary', 'created_at']
+        read_only_fields = fields
+
+# Progresso do expurgo de um quadro removido
+class BoardDeletionSerializer(InstrumentedModelSerializer):
+    class Meta:
+        model = BoardDeletion
+        fields = ['id', 'fk_board', 'requested_by', 'status', 'purge_after', 'total', 'removed', 'progress',
+                  'created_at', 'started_at', 'finished_at']
+        read_only_fields = fields
@@ -0,0 +1,135 @@
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_init, post_save, pre_delete, post_delete
+from django.dispatch import receiver
+
+from . import access, activity, analytics, counters, metrics, querywatch, search, thumbnails
+from .models import Board, BoardCollaborator, Card, Task, Comment, Attachment
+
+
+# Instrumentação de queries (métricas e inspetor de N+1) em toda conexão aberta
+@receiver(connection_created)
+def install_query_wrappers(sender, connection, **kwargs):
+    for wrapper in (metrics.execute_wrapper, querywatch.execute_wrapper):
+        if wrapper not in connection.execute_wrappers:
+            connection.execute_wrappers.append(wrapper)
+
+# Mantém o índice de busca textual atualizado
+@receiver(post_save, sender=Card)
+def index_card(sender, instance, **kwargs):
+    search.index_card(instance)
+
+@receiver(post_save, sender=Comment)
+def index_comment(sender, instance, **kwargs):
+    search.index_comment(instance)
+
+@receiver(post_save, sender=Task)
+def index_task(sender, instance, **kwargs):
+    search.index_task(instance)
+
+# As entradas de cartões são removidas em cascata pela FK; comentários e tarefas precisam de remoção explícita
+@receiver(post_delete, sender=Comment)
+def unindex_comment(sender, instance, **kwargs):
+    search.remove('comment', instance.id)
+
+@receiver(post_delete, sender=Task)
+def unindex_task(sender, instance, **kwargs):
+    search.remove('task', instance.id)
+
+
+# Contadores desnormalizados (Column.card_count, Board.urgent_card_count, Card.tasks_*).
+# O estado carregado é guardado em post_init para detectar movimentações e conclusões.
+@receiver(post_init, sender=Card)
+def remember_card_state(sender, instance, **kwargs):
+    instance._counter_state = counters.snapshot_card(instance) if instance.pk else None
+
+@receiver(post_save, sender=Card)
+def update_card_counters(sender, instance, **kwargs):
+    previous, current = instance._counter_state, counters.snapshot_card(instance)
+    counters.card_changed(previous, current)
+    # Registra também a movimentação no log usado pelas métricas de fluxo (o quadro é resolvido uma vez)
+    board_id = instance.get_board_id()
+    analytics.record_transition(instance, previous[0] if previous else None, current[0], board_id=board_id)
+    if previous is None:
+        activity.record(instance, 'created', board_id=board_id)
+    else:
+        activity.record(instance, 'moved' if previous[0] != current[0] else 'updated', board_id=board_id)
+    instance._counter_state = current
+
+@receiver(post_delete, sender=Card)
+def release_card_counters(sender, instance, **kwargs):
+    counters.card_changed(instance._counter_state, None)
+    if instance._counter_state:
+        analytics.record_transition(instance, instance._counter_state[0], None, board_id=activity.deleted_board_id(instance))
+
+@receiver(post_init, sender=Task)
+def remember_task_state(sender, instance, **kwargs):
+    instance._counter_state = counters.snapshot_task(instance) if instance.pk else None
+
+@receiver(post_save, sender=Task)
+def update_task_counters(sender, instance, **kwargs):
+    current = counters.snapshot_task(instance)
+    counters.task_changed(instance._counter_state, current)
+    instance._counter_state = current
+
+@receiver(post_delete, sender=Task)
+def release_task_counters(sender, instance, **kwargs):
+    counters.task_changed(instance._counter_state, None)
+
+
+# Acesso materializado (BoardAccess): dono do quadro e colaboradores. O estado é lido de
+# __dict__ para não carregar campos adiados (only/defer) dentro do post_init.
+@receiver(post_init, sender=Board)
+def remember_board_owner(sender, instance, **kwargs):
+    instance._access_owner = instance.__dict__.get('fk_user_id') if instance.pk else None
+
+@receiver(post_save, sender=Board)
+def update_board_access(sender, instance, **kwargs):
+    access.owner_changed(instance.pk, instance._access_owner, instance.fk_user_id)
+    instance._access_owner = instance.fk_user_id
+
+def _collaborator_pair(instance):
+    return (instance.__dict__.get('fk_board_id'), instance.__dict__.get('fk_user_id'))
+
+@receiver(post_init, sender=BoardCollaborator)
+def remember_collaborator(sender, instance, **kwargs):
+    instance._access_pair = _collaborator_pair(instance) if instance.pk else None
+
+@receiver(post_save, sender=BoardCollaborator)
+def update_collaborator_access(sender, instance, **kwargs):
+    current = _collaborator_pair(instance)
+    access.collaborator_changed(instance._access_pair, current)
+    instance._access_pair = current
+
+@receiver(post_delete, sender=BoardCollaborator)
+def release_collaborator_access(sender, instance, **kwargs):
+    access.collaborator_changed(instance._access_pair, None)
+
+
+# Miniatura/preview de anexos gerada pelo pool em segundo plano, após o commit
+@receiver(post_save, sender=Attachment)
+def schedule_thumbnail(sender, instance, **kwargs):
+    if not instance.thumbnail:
+        thumbnails.schedule(instance)
+
+
+# Feed de atividades dos demais modelos (cartões são tratados em update_card_counters)
+def record_saved(sender, instance, created, **kwargs):
+    if created and sender is Comment:
+        activity.record(instance, 'commented')
+    else:
+        activity.record(instance, 'created' if created else 'updated')
+
+def record_deleted(sender, instance, **kwargs):
+    activity.record(instance, 'deleted')
+
+# Anota os pais antes da cascata: o quadro de todos os removidos sai de uma query por modelo
+def remember_deleted(sender, instance, origin=None, **kwargs):
+    activity.deleting(instance, origin)
+
+for model in (Card, Task, Comment, Attachment):
+    pre_delete.connect(remember_deleted, sender=model, dispatch_uid=f'activity_deleting_{model._meta.model_name}')
+
+for model in activity.TRACKED_MODELS:
+    if model is not Card:
+        post_save.connect(record_saved, sender=model, dispatch_uid=f'activity_saved_{model._meta.model_name}')
+    post_delete.connect(record_deleted, sender=model, dispatch_uid=f'activity_deleted_{model._meta.model_name}')
@@ -0,0 +1,180 @@
+import hashlib
+import posixpath
+import re
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.http import content_disposition_header
+
+# Bloco de leitura usado no hash e no streaming dos downloads
+CHUNK_SIZE = 64 * 1024
+
+_RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Armazena cada arquivo pelo SHA-256 do conteúdo (`<pasta>/ab/cd/<sha256>`):
+    arquivos idênticos ocupam um único blob, e um blob nunca é sobrescrito.
+    Como os blobs são compartilhados, excluir um anexo não apaga o arquivo
+    (os órfãos são removidos por `manage.py prune_uploads --orphans`).
+    """
+
+    @staticmethod
+    def digest(content):
+        # Quem já calculou o hash (ex.: upload em partes) o repassa em `content.checksum`
+        checksum = getattr(content, 'checksum', None)
+        if checksum:
+            return checksum
+        sha256 = hashlib.sha256()
+        if hasattr(content, 'seek'):
+            content.seek(0)
+        for chunk in content.chunks(CHUNK_SIZE):
+            sha256.update(chunk)
+        if hasattr(content, 'seek'):
+            content.seek(0)
+        return sha256.hexdigest()
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, 'chunks'):
+            content = File(content, name)
+        checksum = self.digest(content)
+        name = posixpath.join(posixpath.dirname(name), checksum[:2], checksum[2:4], checksum)
+        if self.exists(name):
+            return name
+        return self._save(name, content)
+
+    def save_derived(self, name, content):
+        # Arquivos derivados de um blob (ex.: miniaturas) ficam ao lado dele, com nome fixo
+        if self.exists(name):
+            return name
+        return self._save(name, content)
+
+
+_storage = None
+
+
+def attachment_storage():
+    # Callable para que a migração não congele o caminho do storage
+    global _storage
+    if _storage is None:
+        _storage = ContentAddressedStorage()
+    return _storage
+
+
+def _parse_range(header, size):
+    # Suporta um único intervalo (bytes=a-b, bytes=a-, bytes=-n); None = intervalo inválido
+    match = _RANGE_RE.match(header.strip())
+    if not match or match.groups() == ('', ''):
+        return None
+    first, last = match.groups()
+    if first == '':
+        length = int(last)
+        if length == 0:
+            return None
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return None
+    return start, end
+
+
+def _stream(handle, start, length):
+    try:
+        handle.seek(start)
+        while length > 0:
+            chunk = handle.read(min(CHUNK_SIZE, length))
+            if not chunk:
+                break
+            length -= len(chunk)
+            yield chunk
+    finally:
+        handle.close()
+
+
+def serve(request, attachment):
+    """
+    Resposta de download de um anexo. Com KANBAN_SENDFILE configurado, o envio
+    é delegado ao servidor web (X-Sendfile / X-Accel-Redirect); caso contrário o
+    arquivo é enviado em streaming, com suporte a Range e If-Range.
+    """
+    storage = attachment.file.storage
+    name = attachment.file.name
+    etag = f'"{attachment.checksum}"' if attachment.checksum else None
+    filename = attachment.original_name or posixpath.basename(name)
+    content_type = attachment.content_type or 'application/octet-stream'
+
+    if etag and request.headers.get('If-None-Match') == etag:
+        response = HttpResponse(status=304)
+        response['ETag'] = etag
+        return response
+
+    backend = getattr(settings, 'KANBAN_SENDFILE', None)
+    if backend:
+        response = HttpResponse(content_type=content_type)
+        if backend == 'x-accel-redirect':
+            prefix = getattr(settings, 'KANBAN_SENDFILE_PREFIX', '/protected/')
+            response['X-Accel-Redirect'] = posixpath.join(prefix, name)
+        else:
+            response['X-Sendfile'] = storage.path(name)
+    else:
+        size = attachment.size or storage.size(name)
+        byte_range = None
+        range_header = request.headers.get('Range')
+        if_range = request.headers.get('If-Range')
+        # If-Range divergente: o arquivo mudou para o cliente, envia-se o conteúdo inteiro
+        if range_header and (not if_range or if_range == etag):
+            byte_range = _parse_range(range_header, size)
+            if byte_range is None:
+                response = HttpResponse(status=416)
+                response['Content-Range'] = f'bytes */{size}'
+                return response
+        if byte_range is None:
+            response = FileResponse(storage.open(name, 'rb'), content_type=content_type)
+            response['Content-Length'] = size
+        else:
+            start, end = byte_range
+            response = StreamingHttpResponse(
+                _stream(storage.open(name, 'rb'), start, end - start + 1), status=206, content_type=content_type,
+            )
+            response['Content-Range'] = f'bytes {start}-{end}/{size}'
+            response['Content-Length'] = end - start + 1
+        response['Accept-Ranges'] = 'bytes'
+
+    response['Content-Disposition'] = content_disposition_header(True, filename)
+    if etag:
+        response['ETag'] = etag
+        # O conteúdo de um blob nunca muda; o cache é privado por depender de autenticação
+        response['Cache-Control'] = 'private, max-age=31536000, immutable'
+    return response
+
+
+def serve_thumbnail(request, attachment):
+    # Miniaturas são pequenas: enviadas direto, com o mesmo ETag imutável do blob de origem
+    etag = f'"{attachment.checksum}-thumb"'
+    if request.headers.get('If-None-Match') == etag:
+        response = HttpResponse(status=304)
+    else:
+        response = FileResponse(attachment.file.storage.open(attachment.thumbnail, 'rb'), content_type='image/jpeg')
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, max-age=31536000, immutable'
+    return response
+
+
+def orphan_blobs(prefix, referenced):
+    """Nomes dos blobs (e derivados) em `prefix` que não são referenciados por nenhum anexo."""
+    storage = attachment_storage()
+    if not storage.exists(prefix):
+        return
+    for first in storage.listdir(prefix)[0]:
+        for second in storage.listdir(posixpath.join(prefix, first))[0]:
+            folder = posixpath.join(prefix, first, second)
+            for filename in storage.listdir(folder)[1]:
+                name = posixpath.join(folder, filename)
+                if name not in referenced:
+                    yield name
@@ -1,3 +1,1435 @@
-from django.test import TestCase
+import base64
+import importlib
+import gzip
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta, timezone as dt_timezone
+from importlib.util import find_spec
+from io import StringIO
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.apps import apps as django_apps
+from django.conf import settings as django_settings
+from django.core.cache import caches
+from django.db import IntegrityError, connection
+from django.db.migrations.executor import MigrationExecutor
+from django.db.models.signals import post_delete
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.files.base import ContentFile
+from django.core.management import CommandError, call_command
+from django.test import AsyncClient, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+from rest_framework.views import APIView
+
+from . import activity, archive, idempotency, metrics, openapi, reaper, reminders, search, storage, throttling, thumbnails, uploads, views
+from .models import (
+    User, Board, BoardAccess, Column, Card, Task, Tag, CardTemplate, Comment, Attachment, UploadSession, CardReminder, Notification,
+    BoardArchive, BoardArchiveBlob, Activity, CardTransition, SearchEntry,
+)
+from .querywatch import QueryProblem, assert_no_n_plus_one, inspect_queries, normalize
+from .serializers import ColumnSerializer, TagSerializer
+
+# Hash rápido: a autenticação Basic verifica a senha a cada requisição
+FAST_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+PASSWORD = 'Senha@123'
+
+
+def basic(user):
+    return 'Basic ' + base64.b64encode(f'{user.login}:{PASSWORD}'.encode()).decode()
+
+
+def throttle_rates(**rates):
+    return {'REST_FRAMEWORK': {
+        **api_settings.user_settings,
+        'DEFAULT_THROTTLE_RATES': {**api_settings.DEFAULT_THROTTLE_RATES, **rates},
+    }}
+
+
+@override_settings(PASSWORD_HASHERS=FAST_HASHERS)
+class KanbanTestCase(TestCase):
+    """Dono, colaborador e um usuário de fora; um quadro com uma coluna e três cartões com uma tarefa cada."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('dono', 'Dono', PASSWORD)
+        cls.member = User.objects.create_user('membro', 'Membro', PASSWORD)
+        cls.outsider = User.objects.create_user('fora', 'Fora', PASSWORD)
+        cls.board = Board.objects.create(name='Quadro', fk_user=cls.owner)
+        cls.board.collaborators.create(fk_user=cls.member, permission='edit')
+        cls.column = Column.objects.create(name='A fazer', position=0, fk_user=cls.owner, fk_board=cls.board)
+        cls.cards = []
+        for position in range(3):
+            card = Card.objects.create(title=f'Cartão {position}', position=position, fk_column=cls.column, fk_user=cls.owner)
+            Task.objects.create(title='Tarefa', position=0, fk_card=card)
+            cls.cards.append(card)
+
+    def setUp(self):
+        caches['default'].clear()
+        throttling.store.clear()
+
+    def api(self, user):
+        self.client.defaults['HTTP_AUTHORIZATION'] = basic(user)
+        return self.client
+
+    def use_temp_media(self):
+        # MEDIA_ROOT (blobs e uploads em partes) numa pasta descartada ao fim do teste
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media, ignore_errors=True)
+        settings = override_settings(MEDIA_ROOT=media, KANBAN_UPLOAD_DIR=os.path.join(media, 'uploads'))
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+
+# --- Throttling (kanban/throttling.py) ---
+
+class BoardThrottleTests(KanbanTestCase):
+
+    @override_settings(**throttle_rates(board_read='2/min'))
+    def test_outsider_does_not_drain_board_bucket(self):
+        for _ in range(5):
+            self.assertEqual(self.api(self.outsider).get(f'/boards/{self.board.id}/').status_code, 404)
+        for _ in range(2):
+            self.assertEqual(self.api(self.member).get(f'/boards/{self.board.id}/').status_code, 200)
+        response = self.api(self.owner).get(f'/boards/{self.board.id}/')
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response)
+
+    @override_settings(**throttle_rates(board_read='2/min'))
+    def test_free_form_board_param_is_ignored(self):
+        for _ in range(5):
+            self.assertEqual(self.api(self.outsider).get('/users/', {'board': self.board.id}).status_code, 200)
+        self.assertEqual(self.api(self.member).get(f'/boards/{self.board.id}/').status_code, 200)
+
+
+class FixedThrottle(throttling.TokenBucketThrottle):
+    def get_rate(self, scope):
+        return (5, 60)
+
+    def get_buckets(self, request, view):
+        return [('teste', 'teste')]
+
+
+class BucketAtomicityTests(TransactionTestCase):
+
+    def setUp(self):
+        caches['default'].clear()
+        throttling.store.clear()
+
+    def consume_concurrently(self, attempts=20):
+        barrier = threading.Barrier(attempts)
+        allowed = []
+
+        def attempt():
+            barrier.wait()
+            allowed.append(FixedThrottle().allow_request(None, None))
+
+        threads = [threading.Thread(target=attempt) for _ in range(attempts)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return allowed.count(True)
+
+    def test_shared_cache_spends_each_token_once(self):
+        # Latência de rede simulada entre a leitura e a escrita do bucket
+        get_many = LocMemCache.get_many
+
+        def slow_get_many(cache, *args, **kwargs):
+            values = get_many(cache, *args, **kwargs)
+            time.sleep(0.01)
+            return values
+
+        with mock.patch.object(LocMemCache, 'get_many', slow_get_many):
+            self.assertEqual(self.consume_concurrently(), 5)
+
+    @override_settings(KANBAN_THROTTLE_CACHE=None)
+    def test_local_fallback_spends_each_token_once(self):
+        self.assertEqual(self.consume_concurrently(), 5)
+
+
+# --- Upload em partes (kanban/uploads.py) ---
+
+PNG = b'\x89PNG\r\n\x1a\n' + b'0' * 24
+
+
+class ChunkedUploadTests(KanbanTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.use_temp_media()
+
+    def start(self):
+        response = self.api(self.member).post('/attachments/uploads/', {
+            'fk_card_id': self.cards[0].id, 'filename': 'foto.png', 'size': len(PNG),
+        }, content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        return UploadSession.objects.get(id=response.data['id'])
+
+    def patch(self, session, offset, body):
+        return self.client.patch(f'/attachments/uploads/{session.id}/', body, content_type='application/offset+octet-stream',
+                                 HTTP_UPLOAD_OFFSET=str(offset))
+
+    def test_chunks_are_assembled_into_attachment(self):
+        session = self.start()
+        self.assertEqual(self.patch(session, 0, PNG[:16]).status_code, 204)
+        response = self.patch(session, 16, PNG[16:])
+        self.assertEqual(response.status_code, 201)
+        with Attachment.objects.get(id=response.data['id']).file.open('rb') as handle:
+            self.assertEqual(handle.read(), PNG)
+
+    def test_losing_request_does_not_touch_part_file(self):
+        session = self.start()
+        stale = UploadSession.objects.get(id=session.id)
+        uploads.append_chunk(session, io.BytesIO(PNG[:16]), 0, 16)
+        # Segunda requisição que leu a sessão antes do avanço e disputa o mesmo offset
+        with self.assertRaises(uploads.UploadConflict):
+            uploads.append_chunk(stale, io.BytesIO(PNG[:8] + b'x' * 24), 0, 32)
+        with open(uploads.part_path(session), 'rb') as handle:
+            self.assertEqual(handle.read(), PNG[:16])
+        self.assertEqual(UploadSession.objects.get(id=session.id).offset, 16)
+
+    def test_direct_upload_is_checked_while_streaming(self):
+        response = self.api(self.member).post('/attachments/', {
+            'fk_card_id': self.cards[0].id, 'file': SimpleUploadedFile('foto.png', b'GIF89a' + b'0' * 24),
+        })
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data['file'], [uploads.signature_error('foto.png', b'GIF89a')])
+
+
+# --- Inspetor de N+1 (kanban/querywatch.py) ---
+
+class QueryWatchTests(KanbanTestCase):
+    # Três cartões bastam: qualquer query repetida por cartão aparece ao menos três vezes
+    LIST_ENDPOINTS = ['/boards/', '/columns/', '/cards/', '/tasks/', '/tags/', '/comments/', '/board-collaborators/',
+                      '/search/?q=Cart']
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        tag = Tag.objects.create(name='Urgente', color='#ff0000', fk_board=cls.board)
+        for card in cls.cards:
+            tag.cards.add(card)
+            Comment.objects.create(comment_text='Comentário', fk_card=card, fk_user=cls.member)
+
+    def test_list_endpoints_have_no_n_plus_one(self):
+        for path in self.LIST_ENDPOINTS:
+            with self.subTest(path=path), assert_no_n_plus_one(threshold=len(self.cards)):
+                self.assertEqual(self.api(self.member).get(path).status_code, 200)
+
+    def test_detects_n_plus_one(self):
+        with self.assertRaises(QueryProblem) as raised, assert_no_n_plus_one(threshold=len(self.cards)):
+            for card in Card.objects.all():
+                card.fk_column.name
+        self.assertEqual(raised.exception.problems[0].count, len(self.cards))
+
+    def test_in_lists_of_any_size_share_one_shape(self):
+        self.assertEqual(normalize('SELECT 1 WHERE id IN (%s)'), normalize('SELECT 1 WHERE id IN (%s, %s)'))
+        with inspect_queries() as inspector:
+            for ids in ([1], [1, 2], [1, 2, 3]):
+                list(Card.objects.filter(id__in=ids))
+        self.assertEqual(list(inspector.counts.values()), [3])
+
+
+# --- Acesso materializado (BoardAccess, kanban/access.py) ---
+
+class BoardAccessTests(KanbanTestCase):
+
+    def permissions(self):
+        return dict(BoardAccess.objects.filter(fk_board=self.board).values_list('fk_user__login', 'permission'))
+
+    def test_collaborator_added_changed_and_removed(self):
+        self.assertEqual(self.permissions(), {'dono': 'owner', 'membro': 'edit'})
+        collaborator = self.board.collaborators.create(fk_user=self.outsider, permission='view')
+        self.assertEqual(self.permissions()['fora'], 'view')
+        collaborator.permission = 'admin'
+        collaborator.save()
+        self.assertEqual(self.permissions()['fora'], 'admin')
+        collaborator.delete()
+        self.assertNotIn('fora', self.permissions())
+        self.assertEqual(self.api(self.outsider).get(f'/boards/{self.board.id}/').status_code, 404)
+
+    def test_owner_change(self):
+        self.board.fk_user = self.outsider
+        self.board.save()
+        self.assertEqual(self.permissions(), {'fora': 'owner', 'membro': 'edit'})
+        # O novo dono também colaborador continua dono; ao deixar de sê-lo, volta à permissão de colaborador
+        self.board.fk_user = self.member
+        self.board.save()
+        self.assertEqual(self.permissions(), {'membro': 'owner'})
+        self.board.fk_user = self.owner
+        self.board.save()
+        self.assertEqual(self.permissions(), {'dono': 'owner', 'membro': 'edit'})
+
+    def test_scoped_lists_do_not_deduplicate(self):
+        # Listagens filtradas pelo acesso: nem DISTINCT no SQL nem deduplicação no plano de execução
+        markers = {'sqlite': ('TEMP B-TREE FOR DISTINCT',), 'postgresql': ('Unique', 'HashAggregate')}
+        for viewset in (views.BoardViewSet, views.ColumnViewSet, views.CardViewSet, views.TaskViewSet,
+                        views.TagViewSet, views.CardTemplateViewSet, views.CommentViewSet,
+                        views.NotificationViewSet, views.AttachmentViewSet, views.BoardCollaboratorViewSet):
+            with self.subTest(viewset=viewset.__name__):
+                request = APIRequestFactory().get('/')
+                force_authenticate(request, user=self.member)
+                view = viewset(action_map={'get': 'list'}, args=(), kwargs={}, format_kwarg=None)
+                view.request = view.initialize_request(request)
+                queryset = view.filter_queryset(view.get_queryset())
+                sql, _ = queryset.query.get_compiler(queryset.db).as_sql()
+                self.assertNotIn('DISTINCT', sql.upper())
+                plan = queryset.explain()
+                for marker in markers.get(connection.vendor, ()):
+                    self.assertNotIn(marker, plan)
+
+
+
+class BoardScopeTests(KanbanTestCase):
+    """Cada endpoint de conteúdo de quadro: quem não tem acesso não vê nem altera; quadros removidos ou arquivados não aceitam escrita."""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.viewer = User.objects.create_user('leitor', 'Leitor', PASSWORD)
+        cls.board.collaborators.create(fk_user=cls.viewer, permission='view')
+        card = cls.cards[0]
+        cls.objects = {
+            'columns': cls.column,
+            'cards': card,
+            'tasks': card.tasks.get(),
+            'comments': Comment.objects.create(comment_text='Ok', fk_card=card, fk_user=cls.owner),
+            'attachments': Attachment.objects.create(file='attachments/nota.txt', original_name='nota.txt', content_type='text/plain',
+                                                     size=3, fk_card=card, uploaded_by=cls.owner),
+            'tags': Tag.objects.create(name='Urgente', color='#ff0000', fk_board=cls.board),
+            'card-templates': CardTemplate.objects.create(name='Bug', title='Bug', fk_board=cls.board, fk_user=cls.owner),
+        }
+
+    def setUp(self):
+        super().setUp()
+        self.use_temp_media()
+
+    def payloads(self, user):
+        # Corpo válido de criação e de alteração por endpoint, apontando para o quadro de teste
+        card = self.cards[0]
+        return {
+            'columns': ({'name': 'Nova', 'position': 9, 'fk_board': self.board.id, 'fk_user': self.owner.id},
+                        {'name': 'Renomeada', 'fk_user': self.owner.id}),
+            'cards': ({'title': 'Novo', 'position': 9, 'fk_column_id': self.column.id, 'fk_user_id': self.owner.id},
+                      {'title': 'Renomeado', 'fk_user_id': self.owner.id}),
+            'tasks': ({'title': 'Nova', 'position': 9, 'fk_card_id': card.id}, {'title': 'Renomeada'}),
+            'comments': ({'comment_text': 'Novo', 'fk_card_id': card.id, 'fk_user_id': user.id}, {'comment_text': 'Editado'}),
+            'attachments': ({'file': SimpleUploadedFile('nota.pdf', b'%PDF-1.4\n'), 'fk_card_id': card.id, 'uploaded_by_id': user.id},
+                            {'fk_card_id': card.id}),
+            'tags': ({'name': 'Nova', 'color': '#00ff00', 'fk_board': self.board.id}, {'color': '#0000ff'}),
+            'card-templates': ({'name': 'Novo', 'title': 'Novo', 'fk_board': self.board.id}, {'title': 'Renomeado'}),
+        }
+
+    def create(self, client, endpoint, body):
+        if endpoint == 'attachments':
+            return client.post(f'/{endpoint}/', body)
+        return client.post(f'/{endpoint}/', body, content_type='application/json')
+
+    def assert_hidden(self, user):
+        client = self.api(user)
+        for endpoint, obj in self.objects.items():
+            with self.subTest(endpoint):
+                self.assertNotIn(obj.id, [row['id'] for row in client.get(f'/{endpoint}/').json()['results']])
+                self.assertEqual(client.get(f'/{endpoint}/{obj.id}/').status_code, 404)
+                self.assertEqual(client.patch(f'/{endpoint}/{obj.id}/', {}, content_type='application/json').status_code, 404)
+                self.assertEqual(client.delete(f'/{endpoint}/{obj.id}/').status_code, 404)
+                self.assertTrue(type(obj).objects.filter(id=obj.id).exists())
+
+    def assert_not_writable(self, user, expected=(403,)):
+        client = self.api(user)
+        for endpoint, (created, changed) in self.payloads(user).items():
+            with self.subTest(endpoint):
+                model = type(self.objects[endpoint])
+                count = model.objects.count()
+                self.assertIn(self.create(client, endpoint, created).status_code, expected)
+                self.assertEqual(model.objects.count(), count)
+
+    def test_outsider_sees_nothing_and_cannot_write(self):
+        self.assert_hidden(self.outsider)
+        self.assert_not_writable(self.outsider)
+
+    def test_viewer_reads_but_cannot_write(self):
+        client = self.api(self.viewer)
+        payloads = self.payloads(self.viewer)
+        for endpoint, obj in self.objects.items():
+            with self.subTest(endpoint):
+                self.assertIn(obj.id, [row['id'] for row in client.get(f'/{endpoint}/').json()['results']])
+                self.assertEqual(client.get(f'/{endpoint}/{obj.id}/').status_code, 200)
+                changed = payloads[endpoint][1]
+                self.assertEqual(client.patch(f'/{endpoint}/{obj.id}/', changed, content_type='application/json').status_code, 403)
+                self.assertEqual(client.delete(f'/{endpoint}/{obj.id}/').status_code, 403)
+                self.assertTrue(type(obj).objects.filter(id=obj.id).exists())
+        self.assert_not_writable(self.viewer)
+
+    def test_member_can_write(self):
+        client = self.api(self.member)
+        for endpoint, (created, changed) in self.payloads(self.member).items():
+            with self.subTest(endpoint):
+                obj = self.objects[endpoint]
+                response = self.create(client, endpoint, created)
+                self.assertEqual(response.status_code, 201, response.content)
+                self.assertEqual(client.patch(f'/{endpoint}/{obj.id}/', changed, content_type='application/json').status_code, 200)
+
+    def test_soft_deleted_board_is_hidden_and_not_writable(self):
+        reaper.soft_delete(self.board, self.owner)
+        self.assertEqual(self.api(self.owner).get(f'/boards/{self.board.id}/').status_code, 404)
+        self.assert_hidden(self.owner)
+        # Colunas validam o quadro (400); os demais endpoints negam a escrita (403)
+        self.assert_not_writable(self.owner, expected=(400, 403))
+
+    def test_archived_board_is_readable_but_content_is_hidden_and_not_writable(self):
+        archive.archive_board(self.board, self.owner)
+        client = self.api(self.owner)
+        self.assertEqual(client.get(f'/boards/{self.board.id}/').status_code, 200)
+        self.assertEqual(client.get(f'/boards/{self.board.id}/snapshot/').status_code, 200)
+        # Modelos de cartão ficam na tabela ativa, mas fora do escopo; o resto saiu com o arquivamento
+        template = self.objects['card-templates']
+        self.assertEqual(client.get('/card-templates/').json()['results'], [])
+        self.assertEqual(client.get(f'/card-templates/{template.id}/').status_code, 404)
+        self.assertEqual(client.patch(f'/card-templates/{template.id}/', {}, content_type='application/json').status_code, 404)
+        payloads = self.payloads(self.owner)
+        for endpoint, expected in (('columns', 400), ('tags', 403), ('card-templates', 403)):
+            with self.subTest(endpoint):
+                response = self.create(client, endpoint, payloads[endpoint][0])
+                self.assertEqual(response.status_code, expected, response.content)
+        self.assertFalse(Column.objects.filter(fk_board=self.board).exists())
+        self.assertFalse(Tag.objects.filter(fk_board=self.board).exists())
+        self.assertEqual(list(CardTemplate.objects.filter(fk_board=self.board)), [template])
+
+# --- Avisos de prazo (kanban/reminders.py) ---
+
+NOW = datetime(2026, 1, 15, 12, 0, tzinfo=dt_timezone.utc)
+
+
+class DueReminderTests(KanbanTestCase):
+
+    def due(self, card, delta):
+        card.due_date = NOW + delta
+        card.save()
+
+    def test_reminds_once_per_due_date(self):
+        soon, late = self.cards[0], self.cards[1]
+        self.due(soon, timedelta(hours=2))
+        self.due(late, -timedelta(hours=3))
+        self.assertEqual(reminders.run_due_reminders(now=NOW), {'due_soon': 1, 'overdue': 1})
+        self.assertEqual(reminders.run_due_reminders(now=NOW), {'due_soon': 0, 'overdue': 0})
+        # Prazo adiado: o novo prazo é avisado de novo
+        self.due(soon, timedelta(hours=5))
+        self.assertEqual(reminders.run_due_reminders(now=NOW), {'due_soon': 1, 'overdue': 0})
+        self.assertEqual(Notification.objects.filter(fk_user=self.owner, notification_type='due_soon').count(), 2)
+
+    def test_concurrent_reminder_skips_only_that_card(self):
+        for card in self.cards:
+            self.due(card, timedelta(hours=1))
+        # Outra execução avisou o primeiro cartão depois que este lote foi lido
+        batch = list(reminders._pending('due_soon', NOW, NOW + timedelta(hours=24)).values(
+            'id', 'title', 'due_date', 'fk_user_id', 'fk_assigned_user_id',
+        ))
+        CardReminder.objects.create(fk_card=self.cards[0], threshold='due_soon', due_date=self.cards[0].due_date)
+        self.assertEqual(reminders._process_batch('due_soon', batch), 2)
+        self.assertEqual(CardReminder.objects.count(), 3)
+        self.assertEqual(Notification.objects.filter(notification_type='due_soon').count(), 2)
+
+    def test_command_validates_now(self):
+        self.due(self.cards[0], timedelta(hours=2))
+        for value in ('ontem', '2026-01-15T12:00:00', '2026-13-40T12:00:00Z'):
+            with self.subTest(now=value), self.assertRaises(CommandError):
+                call_command('send_due_reminders', '--now', value, stdout=StringIO())
+        with self.assertRaises(CommandError):
+            call_command('send_due_reminders', '--now', NOW.isoformat(), '--interval', '60', stdout=StringIO())
+        output = StringIO()
+        call_command('send_due_reminders', '--now', NOW.isoformat(), stdout=output)
+        self.assertIn('Prazo próximo: 1', output.getvalue())
+
+
+# --- Expurgo de quadros removidos (kanban/reaper.py) ---
+
+class PurgeTests(KanbanTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.use_temp_media()
+
+    def test_purge_removes_board_rows_and_unshared_blobs(self):
+        other = Board.objects.create(name='Outro', fk_user=self.owner)
+        other_column = Column.objects.create(name='A fazer', position=0, fk_user=self.owner, fk_board=other)
+        other_card = Card.objects.create(title='Outro', position=0, fk_column=other_column, fk_user=self.owner)
+        tag = Tag.objects.create(name='Urgente', color='#ff0000', fk_board=self.board)
+        other_tag = Tag.objects.create(name='Urgente', color='#ff0000', fk_board=other)
+        # Vínculos entre quadros: a tag deste quadro num cartão do outro e vice-versa
+        tag.cards.add(self.cards[0], other_card)
+        other_tag.cards.add(self.cards[1], other_card)
+
+        blobs = storage.attachment_storage()
+        shared = blobs.save('attachments/compartilhado', ContentFile(b'compartilhado'))
+        unique = blobs.save('attachments/exclusivo', ContentFile(b'exclusivo'))
+        Attachment.objects.bulk_create([
+            Attachment(fk_card=self.cards[0], uploaded_by=self.owner, file=name) for name in (shared, unique)
+        ])
+        archive = BoardArchive.objects.create(fk_board=other, data=b'')
+        BoardArchiveBlob.objects.create(fk_archive=archive, name=shared)
+
+        deletion = reaper.soft_delete(self.board, self.owner)
+        receiver = mock.Mock()
+        post_delete.connect(receiver, dispatch_uid='purge-test')
+        self.addCleanup(post_delete.disconnect, dispatch_uid='purge-test')
+        deletion = reaper.purge(deletion, batch_size=2)
+
+        receiver.assert_not_called()
+        self.assertEqual(deletion.status, 'done')
+        self.assertEqual(deletion.removed, deletion.total)
+        self.assertFalse(Board.objects.filter(id=self.board.id).exists())
+        self.assertFalse(Card.objects.filter(id__in=[card.id for card in self.cards]).exists())
+        links = Tag.cards.through.objects.values_list('tag_id', 'card_id')
+        self.assertEqual(list(links), [(other_tag.id, other_card.id)])
+        self.assertTrue(blobs.exists(shared))
+        self.assertFalse(blobs.exists(unique))
+
+
+# --- Arquivamento de quadros (kanban/archive.py) ---
+
+class ArchiveTests(KanbanTestCase):
+
+    def rows(self):
+        cards = Card.objects.filter(fk_column__fk_board=self.board).order_by('id')
+        return (
+            list(cards.values_list('id', 'title', 'position', 'created_at', 'updated_at')),
+            list(Task.objects.filter(fk_card__in=cards).order_by('id').values_list('id', 'fk_card_id', 'created_at')),
+            sorted(Tag.cards.through.objects.filter(card__in=cards).values_list('tag_id', 'card_id')),
+        )
+
+    def unarchive(self):
+        return self.api(self.owner).post('/boards/unarchive/', {'boards': [self.board.id]}, content_type='application/json')
+
+    def rewrite(self, change):
+        # Simula um arquivo gravado por uma versão anterior (ou com dados que hoje conflitam)
+        stored = BoardArchive.objects.get(fk_board=self.board)
+        document = archive.load(stored)
+        change(document)
+        stored.data = gzip.compress(json.dumps(document).encode())
+        stored.save()
+
+    def test_restore_brings_back_rows_and_timestamps(self):
+        Tag.objects.create(name='Urgente', color='#ff0000', fk_board=self.board).cards.add(*self.cards)
+        before = self.rows()
+        self.assertEqual(self.api(self.owner).post(f'/boards/{self.board.id}/archive/').status_code, 200)
+        self.assertFalse(Card.objects.filter(fk_column__fk_board=self.board).exists())
+        self.assertEqual(self.unarchive().data, {'restored': [self.board.id], 'failed': {}})
+        self.assertEqual(self.rows(), before)
+
+    def test_restore_resolves_legacy_duplicates(self):
+        first = Tag.objects.create(name='Urgente', color='#ff0000', fk_board=self.board)
+        first.cards.add(self.cards[0])
+        archive.archive_board(self.board, self.owner)
+
+        def legacy(document):
+            for row in document['cards']:
+                row['position'] = 0
+            document['tags'].append({**document['tags'][0], 'id': first.id + 100, 'name': 'urgente'})
+            link = document['tag_links'][0]
+            document['tag_links'] += [{**link, 'id': link['id'] + 100, 'tag_id': first.id + 100},
+                                      {**link, 'id': link['id'] + 101, 'tag_id': first.id + 100, 'card_id': self.cards[1].id}]
+        self.rewrite(legacy)
+
+        self.assertEqual(self.unarchive().data['restored'], [self.board.id])
+        self.assertEqual(list(Card.objects.filter(fk_column=self.column).order_by('id').values_list('position', flat=True)), [0, 1, 2])
+        self.assertEqual(list(Tag.objects.filter(fk_board=self.board).values_list('id', flat=True)), [first.id])
+        self.assertEqual(sorted(first.cards.values_list('id', flat=True)), [self.cards[0].id, self.cards[1].id])
+
+    def test_restore_reindexes_restored_cards(self):
+        # Índice desatualizado no arquivamento: a restauração o refaz a partir dos registros
+        SearchEntry.objects.filter(fk_board=self.board, kind='card').delete()
+        archive.archive_board(self.board, self.owner)
+
+        def stale(document):
+            document['cards'][0]['title'] = 'Cartão renomeado'
+        self.rewrite(stale)
+
+        self.assertEqual(self.unarchive().data['restored'], [self.board.id])
+        entries = SearchEntry.objects.filter(fk_board=self.board)
+        self.assertEqual(sorted(entries.filter(kind='card').values_list('object_id', flat=True)),
+                         [card.id for card in self.cards])
+        self.assertEqual(entries.filter(kind='task').count(), 3)
+        results, _ = search.search(self.member, 'renomeado')
+        self.assertEqual([entry.object_id for entry in results], [self.cards[0].id])
+
+    def test_conflicting_restore_fails_cleanly(self):
+        archive.archive_board(self.board, self.owner)
+        other = Board.objects.create(name='Outro', fk_user=self.owner)
+        column = Column.objects.create(name='A fazer', position=0, fk_user=self.owner, fk_board=other)
+        taken = Card.objects.create(title='Outro', position=0, fk_column=column, fk_user=self.owner)
+
+        def collide(document):
+            document['cards'][0]['id'] = taken.id
+        self.rewrite(collide)
+
+        response = self.unarchive()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['restored'], [])
+        self.assertIn(self.board.id, response.data['failed'])
+        self.assertTrue(BoardArchive.objects.filter(fk_board=self.board).exists())
+        self.board.refresh_from_db()
+        self.assertIsNotNone(self.board.archived_at)
+
+    def test_failed_dump_unmarks_board(self):
+        with mock.patch.object(archive, 'dump', side_effect=RuntimeError), self.assertRaises(RuntimeError):
+            archive.archive_board(self.board, self.owner)
+        self.board.refresh_from_db()
+        self.assertIsNone(self.board.archived_at)
+        self.assertEqual(Card.objects.filter(fk_column=self.column).count(), 3)
+
+
+# --- Feed de atividades (kanban/activity.py) ---
+
+class ActivityDeleteTests(KanbanTestCase):
+    # Feed e log de transições (kanban/analytics.py) resolvem o quadro uma vez para toda a cascata
+
+    def test_cascade_resolves_board_once(self):
+        # Fora de requisição os eventos vão para o buffer do processo: nada fica nele para os próximos testes
+        self.addCleanup(activity.flush)
+        with self.captureOnCommitCallbacks(execute=True), inspect_queries() as inspector:
+            self.column.delete()
+        lookups = {sql: count for sql, count in inspector.counts.items() if sql.startswith('SELECT') and 'fk_board_id' in sql}
+        self.assertEqual(list(lookups.values()), [1, 1])
+        self.assertEqual(list(CardTransition.objects.filter(to_column=None).values_list('fk_board_id', flat=True)), [self.board.id] * 3)
+        activity.flush()
+        self.assertEqual(
+            sorted(Activity.objects.values_list('target_type', 'fk_board_id')),
+            [('card', self.board.id)] * 3 + [('column', self.board.id)] + [('task', self.board.id)] * 3,
+        )
+
+
+@override_settings(KANBAN_ACTIVITY_FLUSH_INTERVAL=0.05)
+class ActivityFlushTests(TransactionTestCase):
+
+    def test_buffer_outside_request_is_flushed_by_time(self):
+        owner = User.objects.create_user('dono', 'Dono', PASSWORD)
+        board = Board.objects.create(name='Quadro', fk_user=owner)
+        for _ in range(100):
+            if Activity.objects.filter(fk_board=board, target_type='board').exists():
+                break
+            time.sleep(0.01)
+        self.assertTrue(Activity.objects.filter(fk_board=board, target_type='board', verb='created').exists())
+
+
+# --- Compressão e cache HTTP (kanban/middleware.py, kanban/caching.py) ---
+
+@override_settings(KANBAN_COMPRESS_MIN_SIZE=200)
+class CompressionTests(KanbanTestCase):
+
+    def test_json_is_gzipped_with_random_filename(self):
+        response = self.api(self.member).get('/cards/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        # Mitigação de BREACH do GZipMiddleware: nome de arquivo aleatório no cabeçalho gzip
+        self.assertTrue(response.content[3] & gzip.FNAME)
+        self.assertEqual(len(json.loads(gzip.decompress(response.content))['results']), len(self.cards))
+
+    def test_streaming_snapshot_is_gzipped(self):
+        response = self.api(self.member).get(f'/boards/{self.board.id}/snapshot/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        document = json.loads(gzip.decompress(b''.join(response.streaming_content)))
+        self.assertEqual(len(document['cards']), len(self.cards))
+
+    def test_unaccepted_responses_are_not_gzipped(self):
+        self.assertFalse(self.api(self.member).get('/cards/').has_header('Content-Encoding'))
+
+    @override_settings(KANBAN_COMPRESS_MIN_SIZE=1024 * 1024)
+    def test_small_responses_are_not_gzipped(self):
+        self.assertFalse(self.api(self.member).get('/cards/', HTTP_ACCEPT_ENCODING='gzip').has_header('Content-Encoding'))
+
+    def test_tag_list_is_private(self):
+        response = self.api(self.member).get('/tags/')
+        self.assertIn('private', response['Cache-Control'])
+        self.assertNotIn('public', response['Cache-Control'])
+
+
+# --- Idempotency-Key (kanban/idempotency.py) ---
+
+class SlowCreateView(APIView):
+    authentication_classes = permission_classes = throttle_classes = []
+    calls = 0
+
+    @idempotency.idempotent
+    def post(self, request):
+        type(self).calls += 1
+        time.sleep(0.5)
+        return Response({'criado': type(self).calls}, status=201)
+
+
+class IdempotencyTests(TestCase):
+
+    def setUp(self):
+        caches['idempotency'].clear()
+        SlowCreateView.calls = 0
+
+    def send(self, responses):
+        request = APIRequestFactory().post('/lento/', {'titulo': 'x'}, format='json', HTTP_IDEMPOTENCY_KEY='chave')
+        force_authenticate(request, user=User(pk=1, login='dono'))
+        responses.append(SlowCreateView.as_view()(request))
+
+    @mock.patch.object(idempotency, 'PENDING_TIMEOUT', 0.3)
+    def test_reservation_outlives_pending_timeout_while_running(self):
+        responses = []
+        first = threading.Thread(target=self.send, args=(responses,))
+        first.start()
+        time.sleep(0.45)
+        self.send(responses)
+        first.join()
+        self.assertEqual(SlowCreateView.calls, 1)
+        self.assertEqual(sorted(response.status_code for response in responses), [201, 409])
+        replay = []
+        self.send(replay)
+        self.assertEqual((replay[0].status_code, replay[0]['Idempotent-Replayed']), (201, 'true'))
+        self.assertEqual(SlowCreateView.calls, 1)
+
+
+class ProductionSettingsTests(TestCase):
+
+    def load(self, **env):
+        sys.modules.pop('setup.settings_production', None)
+        self.addCleanup(sys.modules.pop, 'setup.settings_production', None)
+        with mock.patch.dict(os.environ, {'DJANGO_SECRET_KEY': 'segredo', **env}):
+            for name in ('KANBAN_REDIS_URL', 'KANBAN_LOCAL_CACHE'):
+                if name not in env:
+                    os.environ.pop(name, None)
+            return importlib.import_module('setup.settings_production')
+
+    def test_requires_shared_cache(self):
+        with self.assertRaises(ImproperlyConfigured):
+            self.load()
+        self.assertEqual(self.load(KANBAN_LOCAL_CACHE='1').CACHES['idempotency']['BACKEND'],
+                         'django.core.cache.backends.locmem.LocMemCache')
+        self.assertEqual(self.load(KANBAN_REDIS_URL='redis://localhost:6379/0').CACHES['idempotency']['BACKEND'],
+                         'django.core.cache.backends.redis.RedisCache')
+
+
+
+# Roda num processo novo com DJANGO_SETTINGS_MODULE=setup.settings_api (o perfil não troca dentro do processo):
+# system checks, banco de teste em memória e uma requisição autenticada (Basic), sem importar o drf_yasg
+API_PROFILE_SCRIPT = '''
+import base64, json, sys
+import django
+from django.conf import settings
+settings.PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+django.setup()
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client
+from django.test.utils import setup_test_environment
+call_command('check', verbosity=0)
+setup_test_environment()
+connection.creation.create_test_db(verbosity=0)
+from kanban.models import Board, User
+owner = User.objects.create_user('dono', 'Dono', 'Senha@123')
+Board.objects.create(name='Quadro', fk_user=owner)
+client = Client()
+anonymous = client.get('/boards/')
+response = client.get('/boards/', HTTP_AUTHORIZATION='Basic ' + base64.b64encode(b'dono:Senha@123').decode())
+token = client.post('/token/', {'login': 'dono', 'password': 'Senha@123'}, content_type='application/json')
+print(json.dumps({
+    'anonymous': anonymous.status_code,
+    'status': response.status_code,
+    'content_type': response['Content-Type'],
+    'boards': [board['name'] for board in response.json()['results']],
+    'token': token.status_code,
+    'html': client.get('/boards/', HTTP_ACCEPT='text/html').status_code,
+    'sessions': 'django.contrib.sessions' in settings.INSTALLED_APPS,
+    'drf_yasg': sorted(name for name in sys.modules if name.split('.')[0] == 'drf_yasg'),
+}))
+'''
+
+
+class APIProfileTests(TestCase):
+
+    def test_boots_without_drf_yasg_and_serves_authenticated_request(self):
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': 'setup.settings_api'}
+        result = subprocess.run([sys.executable, '-c', API_PROFILE_SCRIPT], cwd=django_settings.BASE_DIR, env=env,
+                                capture_output=True, text=True, timeout=120)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        report = json.loads(result.stdout.strip().splitlines()[-1])
+        self.assertEqual(report, {
+            'anonymous': 401, 'status': 200, 'content_type': 'application/json', 'boards': ['Quadro'],
+            'token': 200, 'html': 406, 'sessions': False, 'drf_yasg': [],
+        })
+
+
+# --- Unicidade pelo banco (UniqueConstraintMixin em kanban/serializers.py) ---
+
+class UniqueConstraintTests(KanbanTestCase):
+
+    def test_constraint_violations_become_validation_errors(self):
+        column = ColumnSerializer(data={'name': 'Outra', 'position': 0, 'fk_user': self.owner.id, 'fk_board': self.board.id})
+        self.assertTrue(column.is_valid(), column.errors)
+        with self.assertRaises(ValidationError) as raised:
+            column.save()
+        self.assertIn('position', raised.exception.detail)
+        Tag.objects.create(name='Urgente', color='#FF0000', fk_board=self.board)
+        tag = TagSerializer(data={'name': 'urgente', 'color': '#00FF00', 'fk_board': self.board.id})
+        self.assertTrue(tag.is_valid(), tag.errors)
+        with self.assertRaises(ValidationError) as raised:
+            tag.save()
+        self.assertIn('name', raised.exception.detail)
+
+    def test_other_integrity_errors_are_not_masked(self):
+        column = ColumnSerializer(data={'name': 'Outra', 'position': 5, 'fk_user': self.owner.id, 'fk_board': self.board.id})
+        self.assertTrue(column.is_valid(), column.errors)
+        error = IntegrityError('FOREIGN KEY constraint failed')
+        with mock.patch.object(Column, 'save', side_effect=error), self.assertRaises(IntegrityError):
+            column.save()
+
+
+# --- Rotas assíncronas (kanban/async_views.py) ---
+
+class AsyncReadViewTests(KanbanTestCase):
+
+    def test_board_scope_matches_viewset(self):
+        archived = Board.objects.create(name='Arquivado', fk_user=self.owner)
+        removed = Board.objects.create(name='Removido', fk_user=self.owner)
+        Board.objects.filter(id=archived.id).update(archived_at=NOW)
+        Board.objects.filter(id=removed.id).update(deleted_at=NOW)
+        client = self.api(self.owner)
+        synced = {board['id'] for board in client.get('/boards/').json()['results']}
+        listed = [board['id'] for board in client.get('/async/boards/').json()['results']]
+        self.assertEqual(listed, [self.board.id, archived.id])
+        self.assertEqual(set(listed), synced)
+        self.assertEqual(client.get(f'/async/boards/{archived.id}/').status_code, 200)
+        self.assertEqual(client.get(f'/async/boards/{removed.id}/').status_code, 404)
+
+    def test_pagination_matches_viewset(self):
+        for position in range(3, 8):
+            Card.objects.create(title=f'Cartão {position}', position=position, fk_column=self.column, fk_user=self.owner)
+        client = self.api(self.member)
+        for page in (1, 2):
+            expected = client.get('/cards/', {'page': page}).json()
+            response = client.get('/async/cards/', {'page': page}).json()
+            self.assertEqual([card['id'] for card in response['results']], [card['id'] for card in expected['results']])
+            self.assertEqual(response['count'], expected['count'])
+            self.assertEqual((response['next'] is None, response['previous'] is None),
+                             (expected['next'] is None, expected['previous'] is None))
+        self.assertEqual(client.get('/async/cards/', {'page': 'last'}).json()['results'], response['results'])
+        self.assertEqual(client.get('/async/cards/', {'page': 9}).status_code, 404)
+
+    def test_authentication_and_throttling_use_rest_framework(self):
+        self.client.defaults.pop('HTTP_AUTHORIZATION', None)
+        response = self.client.get('/async/boards/')
+        self.assertEqual(response.status_code, 401)
+        self.assertIn('Basic', response['WWW-Authenticate'])
+        with override_settings(**throttle_rates(user_read='1/min')):
+            self.assertEqual(self.api(self.owner).get('/async/boards/').status_code, 200)
+            response = self.api(self.owner).get('/async/boards/')
+        self.assertEqual(response.status_code, 429)
+        self.assertIn('Retry-After', response)
+
+
+# --- Documento OpenAPI (kanban/openapi.py) ---
+
+class OpenAPITests(TestCase):
+
+    def setUp(self):
+        # Sem o arquivo gerado no build: o documento é gerado e memoizado
+        folder = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, folder, ignore_errors=True)
+        settings = override_settings(KANBAN_SCHEMA_DIR=folder)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.addCleanup(openapi._memo.clear)
+
+    def test_spec_documents_are_cached_with_etag(self):
+        response = self.client.get('/swagger.json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['info']['title'], 'API Kanban')
+        revalidated = self.client.get('/swagger.json', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(revalidated.status_code, 304)
+        response = self.client.get('/swagger.yaml')
+        self.assertEqual((response.status_code, response['Content-Type']), (200, 'application/yaml'))
+        self.assertEqual(response.content, openapi.encode(response.resolver_match.func.cls, 'yaml'))
+
+    def test_ui_pages_are_not_cached_documents(self):
+        response = self.client.get('/swagger/')
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.has_header('ETag'))
+
+
+# --- Contadores desnormalizados (kanban/counters.py) ---
+
+class CounterTests(KanbanTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.done = Column.objects.create(name='Feito', position=1, fk_user=cls.owner, fk_board=cls.board)
+
+    def counts(self):
+        return (
+            Column.objects.get(id=self.column.id).card_count,
+            Column.objects.get(id=self.done.id).card_count,
+            Board.objects.get(id=self.board.id).urgent_card_count,
+        )
+
+    def test_card_lifecycle(self):
+        self.assertEqual(self.counts(), (3, 0, 0))
+        card = Card.objects.create(title='Novo', position=3, fk_column=self.column, fk_user=self.owner, priority='U')
+        self.assertEqual(self.counts(), (4, 0, 1))
+        card.fk_column = self.done
+        card.position = 0
+        card.save()
+        self.assertEqual(self.counts(), (3, 1, 1))
+        card.priority = 'B'
+        card.save()
+        self.assertEqual(self.counts(), (3, 1, 0))
+        card.priority = 'U'
+        card.save()
+        card.delete()
+        self.assertEqual(self.counts(), (3, 0, 0))
+
+    def test_task_counters(self):
+        card = self.cards[0]
+        task = Task.objects.create(title='Outra', position=1, fk_card=card, completed=True)
+        card.refresh_from_db()
+        self.assertEqual((card.tasks_total, card.tasks_completed), (2, 1))
+        task.completed = False
+        task.save()
+        task.delete()
+        card.refresh_from_db()
+        self.assertEqual((card.tasks_total, card.tasks_completed), (1, 0))
+
+    def test_decrements_stop_at_zero(self):
+        # Contadores dessincronizados (ex.: alterados por fora dos signals) não quebram a remoção
+        Column.objects.filter(id=self.column.id).update(card_count=0)
+        Card.objects.filter(id=self.cards[0].id).update(tasks_total=0)
+        self.cards[0].tasks.get().delete()
+        self.cards[0].delete()
+        self.assertEqual(Column.objects.get(id=self.column.id).card_count, 0)
+
+
+# --- Índice de busca (kanban/search.py e o preenchimento inicial em 0005_searchentry) ---
+
+class SearchIndexTests(KanbanTestCase):
+
+    def entries(self):
+        return sorted(SearchEntry.objects.values_list('kind', 'object_id', 'fk_board_id', 'title'))
+
+    def test_backfill_and_index_board_match_signals(self):
+        Comment.objects.create(fk_card=self.cards[0], fk_user=self.member, comment_text='Comentário')
+        indexed = self.entries()
+        SearchEntry.objects.all().delete()
+        migration = importlib.import_module('kanban.migrations.0005_searchentry')
+        with mock.patch.object(migration, 'BATCH_SIZE', 2):
+            migration.backfill(django_apps, None)
+        self.assertEqual(self.entries(), indexed)
+        SearchEntry.objects.all().delete()
+        self.assertEqual(search.index_board(self.board.id, batch_size=2), len(indexed))
+        self.assertEqual(self.entries(), indexed)
+
+
+# --- Cópia de quadros e modelos de cartão (kanban/cloning.py) ---
+
+class CloneTests(KanbanTestCase):
+
+    def test_clone_skips_links_to_tags_of_other_boards(self):
+        # Cartão que veio de outro quadro com a tag de lá (vínculo anterior às tags por quadro)
+        other = Board.objects.create(name='Outro', fk_user=self.owner)
+        foreign = Tag.objects.create(name='De fora', color='#000000', fk_board=other)
+        local = Tag.objects.create(name='Local', color='#ffffff', fk_board=self.board)
+        Tag.cards.through.objects.bulk_create([
+            Tag.cards.through(tag_id=foreign.id, card_id=self.cards[0].id),
+            Tag.cards.through(tag_id=local.id, card_id=self.cards[0].id),
+        ])
+        response = self.api(self.owner).post(f'/boards/{self.board.id}/clone/')
+        self.assertEqual(response.status_code, 201)
+        copy = Card.objects.get(fk_column__fk_board_id=response.data['id'], title=self.cards[0].title)
+        self.assertEqual([(tag.name, tag.fk_board_id) for tag in copy.tags.all()], [('Local', response.data['id'])])
+
+    def test_clone_copies_content_with_new_ids(self):
+        tag = Tag.objects.create(name='Urgente', color='#ff0000', fk_board=self.board)
+        tag.cards.add(self.cards[0])
+        Task.objects.filter(fk_card=self.cards[0]).update(completed=True, completed_at=NOW)
+        response = self.api(self.member).post(f'/boards/{self.board.id}/clone/', {'name': 'Cópia'},
+                                              content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        copy = Board.objects.get(id=response.data['id'])
+        self.assertEqual((copy.name, copy.fk_user), ('Cópia', self.member))
+
+        column = Column.objects.get(fk_board=copy)
+        self.assertNotEqual(column.id, self.column.id)
+        self.assertEqual((column.name, column.position, column.card_count), ('A fazer', 0, 3))
+        cards = list(Card.objects.filter(fk_column=column).order_by('position'))
+        self.assertEqual([card.title for card in cards], [card.title for card in self.cards])
+        self.assertFalse({card.id for card in cards} & {card.id for card in self.cards})
+        self.assertEqual([(card.tasks_total, card.tasks_completed) for card in cards], [(1, 0)] * 3)
+        self.assertFalse(Task.objects.filter(fk_card__in=cards, completed=True).exists())
+        copied_tag = Tag.objects.get(fk_board=copy)
+        self.assertNotEqual(copied_tag.id, tag.id)
+        self.assertEqual(list(copied_tag.cards.all()), [cards[0]])
+        entries = SearchEntry.objects.filter(fk_board=copy)
+        self.assertEqual(sorted(entries.filter(kind='card').values_list('object_id', flat=True)), [card.id for card in cards])
+        self.assertEqual(entries.filter(kind='task').count(), 3)
+
+    def test_clone_keeps_progress_on_request(self):
+        Task.objects.filter(fk_card=self.cards[0]).update(completed=True, completed_at=NOW)
+        response = self.api(self.owner).post(f'/boards/{self.board.id}/clone/', {'reset_progress': False, 'tasks': True},
+                                             content_type='application/json')
+        card = Card.objects.get(fk_column__fk_board_id=response.data['id'], position=0)
+        self.assertEqual((card.tasks_total, card.tasks_completed), (1, 1))
+        self.assertEqual(card.tasks.get().completed_at, NOW)
+
+    def test_clone_requires_edit_permission(self):
+        self.board.collaborators.create(fk_user=self.outsider, permission='view')
+        self.assertEqual(self.api(self.outsider).get(f'/boards/{self.board.id}/').status_code, 200)
+        self.assertEqual(self.api(self.outsider).post(f'/boards/{self.board.id}/clone/').status_code, 403)
+        self.assertEqual(Board.objects.count(), 1)
+
+    def test_instantiate_appends_cards_to_column(self):
+        Tag.objects.create(name='Revisão', color='#00ff00', fk_board=self.board)
+        template = CardTemplate.objects.create(
+            name='Bug', fk_board=self.board, fk_user=self.owner, title='Corrigir', priority='U',
+            tasks=['Reproduzir', 'Corrigir'], tags=['revisão', 'inexistente'],
+        )
+        response = self.api(self.member).post(f'/card-templates/{template.id}/instantiate/',
+                                              {'column': self.column.id, 'count': 2}, content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([card['position'] for card in response.data], [3, 4])
+        self.assertEqual([[tag['name'] for tag in card['tags']] for card in response.data], [['Revisão'], ['Revisão']])
+        cards = Card.objects.filter(id__in=[card['id'] for card in response.data])
+        self.assertEqual(list(Task.objects.filter(fk_card__in=cards).order_by('fk_card', 'position')
+                              .values_list('title', 'completed')), [('Reproduzir', False), ('Corrigir', False)] * 2)
+        self.assertEqual(Column.objects.get(id=self.column.id).card_count, 5)
+        self.assertEqual(Board.objects.get(id=self.board.id).urgent_card_count, 2)
+        self.assertEqual(SearchEntry.objects.filter(fk_card__in=cards).count(), 6)
+        self.board.collaborators.create(fk_user=self.outsider, permission='view')
+        response = self.api(self.outsider).post(f'/card-templates/{template.id}/instantiate/',
+                                                {'column': self.column.id}, content_type='application/json')
+        self.assertEqual(response.status_code, 403)
+
+
+# --- Tags por quadro (TagSerializer, TagViewSet e o filtro ?tags= de CardFilter) ---
+
+class TagTests(KanbanTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.urgent = Tag.objects.create(name='Urgente', color='#ff0000', fk_board=cls.board)
+        cls.review = Tag.objects.create(name='Revisão', color='#00ff00', fk_board=cls.board)
+        cls.other = Board.objects.create(name='Outro', fk_user=cls.owner)
+        cls.other_column = Column.objects.create(name='A fazer', position=0, fk_user=cls.owner, fk_board=cls.other)
+        cls.other_tag = Tag.objects.create(name='urgente', color='#000000', fk_board=cls.other)
+
+    def test_moving_card_to_another_board_remaps_tags_by_name(self):
+        card = self.cards[0]
+        card.tags.add(self.urgent, self.review)
+        response = self.api(self.owner).patch(f'/cards/{card.id}/', {'fk_column_id': self.other_column.id, 'fk_user_id': self.owner.id},
+                                              content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([tag['id'] for tag in response.data['tags']], [self.other_tag.id])
+        self.assertEqual(list(card.tags.values_list('id', flat=True)), [self.other_tag.id])
+        # Dentro do mesmo quadro as tags ficam como estão
+        self.cards[1].tags.add(self.review)
+        column = Column.objects.create(name='Feito', position=1, fk_user=self.owner, fk_board=self.board)
+        response = self.api(self.owner).patch(f'/cards/{self.cards[1].id}/', {'fk_column_id': column.id, 'fk_user_id': self.owner.id},
+                                              content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(self.cards[1].tags.all()), [self.review])
+
+    def post(self, action, tags, cards, user=None):
+        return self.api(user or self.member).post(f'/tags/{action}/', {'tags': tags, 'cards': cards},
+                                                  content_type='application/json')
+
+    def test_assign_and_unassign(self):
+        cards = [card.id for card in self.cards]
+        self.assertEqual(self.post('assign', [self.urgent.id, self.review.id], cards[:2]).data, {'assigned': 4})
+        # Repetir a marcação não duplica vínculos
+        self.assertEqual(self.post('assign', [self.urgent.id], cards).data, {'assigned': 1})
+        self.assertEqual(self.urgent.cards.count(), 3)
+        self.assertEqual(self.post('unassign', [self.urgent.id, self.review.id], cards).data, {'removed': 5})
+        self.assertFalse(Tag.cards.through.objects.exists())
+
+    def test_assign_rejects_invalid_requests(self):
+        foreign_card = Card.objects.create(title='Fora', position=0, fk_column=self.other_column, fk_user=self.owner)
+        cases = [
+            ([self.urgent.id, self.other_tag.id], [self.cards[0].id], 'tags'),
+            ([self.urgent.id], [self.cards[0].id, foreign_card.id], 'cards'),
+            ([self.urgent.id], [], 'cards'),
+            (['1'], [self.cards[0].id], 'tags'),
+        ]
+        for tags, cards, field in cases:
+            for action in ('assign', 'unassign'):
+                response = self.post(action, tags, cards, user=self.owner)
+                self.assertEqual(response.status_code, 400, (action, tags, cards))
+                self.assertIn(field, response.data)
+        self.assertEqual(self.post('assign', [self.other_tag.id], [foreign_card.id]).status_code, 400)
+        with mock.patch.object(views.TagViewSet, 'max_bulk_cards', 2), mock.patch.object(views.TagViewSet, 'max_bulk_tags', 1):
+            self.assertIn('cards', self.post('assign', [self.urgent.id], [card.id for card in self.cards]).data)
+            self.assertIn('tags', self.post('assign', [self.urgent.id, self.review.id], [self.cards[0].id]).data)
+        self.assertFalse(Tag.cards.through.objects.exists())
+
+    def test_viewers_cannot_assign(self):
+        self.board.collaborators.create(fk_user=self.outsider, permission='view')
+        self.assertEqual(self.post('assign', [self.urgent.id], [self.cards[0].id], user=self.outsider).status_code, 403)
+
+    def test_cards_filter_by_any_tag(self):
+        self.urgent.cards.add(self.cards[0], self.cards[1])
+        self.review.cards.add(self.cards[1], self.cards[2])
+        client = self.api(self.member)
+        ids = lambda params: [card['id'] for card in client.get('/cards/', params).data['results']]
+        self.assertEqual(ids({'tags': f'{self.urgent.id}'}), [self.cards[0].id, self.cards[1].id])
+        # Cartão com as duas tags aparece uma vez (EXISTS, sem JOIN)
+        self.assertEqual(ids({'tags': f'{self.urgent.id},{self.review.id}'}), [card.id for card in self.cards])
+        self.assertEqual(ids({'tags': f'{self.other_tag.id}'}), [])
+        self.assertEqual(client.get('/cards/', {'tags': 'x'}).status_code, 400)
+
+    def test_names_are_unique_per_board_ignoring_case(self):
+        client = self.api(self.member)
+        # lower() do SQLite só converte ASCII: o caso é exercitado com um nome sem acentos
+        response = client.post('/tags/', {'name': ' URGENTE ', 'color': '#123456', 'fk_board': self.board.id},
+                               content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('name', response.data)
+        response = client.post('/tags/', {'name': 'Revisão', 'color': '#123456', 'fk_board': self.other.id},
+                               content_type='application/json')
+        self.assertEqual(response.status_code, 403)
+        response = self.api(self.owner).post('/tags/', {'name': 'Revisão', 'color': '#123456', 'fk_board': self.other.id},
+                                             content_type='application/json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['name'], 'Revisão')
+
+
+# --- Migração para tags por quadro (0016_board_tags) ---
+
+class ScopeTagsMigrationTests(TransactionTestCase):
+
+    def migrate(self, *targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(list(targets))
+        return executor.loader.project_state(list(targets)).apps
+
+    def setUp(self):
+        self.old = self.migrate(('kanban', '0015_optimistic_concurrency'))
+        self.addCleanup(self.migrate, *MigrationExecutor(connection).loader.graph.leaf_nodes('kanban'))
+
+    def data(self, boards):
+        User = self.old.get_model('kanban', 'User')
+        Board = self.old.get_model('kanban', 'Board')
+        Column = self.old.get_model('kanban', 'Column')
+        Card = self.old.get_model('kanban', 'Card')
+        Tag = self.old.get_model('kanban', 'Tag')
+        user = User.objects.create(login='dono', name='Dono', password='!')
+        cards = []
+        for number in range(boards):
+            board = Board.objects.create(name=f'Quadro {number}', fk_user=user)
+            column = Column.objects.create(name='A fazer', position=0, fk_user=user, fk_board=board)
+            cards.append(Card.objects.create(title='Cartão', position=0, fk_column=column, fk_user=user))
+        Tag.objects.create(name='Usada', color='#ff0000').cards.add(*cards)
+        Tag.objects.create(name='Solta', color='#00ff00')
+
+    def tags(self, apps):
+        Tag = apps.get_model('kanban', 'Tag')
+        return sorted(Tag.objects.values_list('name', 'fk_board__name'))
+
+    def test_unused_tags_go_to_the_only_board(self):
+        self.data(boards=1)
+        new = self.migrate(('kanban', '0016_board_tags'))
+        self.assertEqual(self.tags(new), [('Solta', 'Quadro 0'), ('Usada', 'Quadro 0')])
+
+    def test_unused_tags_are_logged_when_dropped(self):
+        self.data(boards=2)
+        with self.assertLogs('kanban.migrations.0016_board_tags', 'WARNING') as logs:
+            new = self.migrate(('kanban', '0016_board_tags'))
+        self.assertEqual(self.tags(new), [('Usada', 'Quadro 0'), ('Usada', 'Quadro 1')])
+        self.assertIn("'Solta', '#00ff00'", logs.output[0])
+
+
+# --- Filtros e ordenação da listagem de cartões (kanban/filters.py) ---
+
+class CardFilterTests(KanbanTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.done = Column.objects.create(name='Feito', position=1, fk_user=cls.owner, fk_board=cls.board)
+        # Cartões 0..2 em A fazer e 3..4 em Feito: prioridades e prazos distintos
+        specs = [('B', NOW - timedelta(days=2), None), ('U', NOW + timedelta(days=3), cls.member), ('M', None, None)]
+        for card, (priority, due, assignee) in zip(cls.cards, specs):
+            Card.objects.filter(id=card.id).update(priority=priority, due_date=due, fk_assigned_user=assignee)
+        cls.cards += [
+            Card.objects.create(title='Cartão 3', position=0, fk_column=cls.done, fk_user=cls.owner, priority='I',
+                                due_date=NOW + timedelta(days=1)),
+            Card.objects.create(title='Cartão 4', position=1, fk_column=cls.done, fk_user=cls.owner, priority='U',
+                                due_date=NOW - timedelta(days=1)),
+        ]
+        cls.tag = Tag.objects.create(name='Urgente', color='#ff0000', fk_board=cls.board)
+        cls.tag.cards.add(cls.cards[1], cls.cards[4])
+
+    def ids(self, user=None, **params):
+        response = self.api(user or self.member).get('/cards/', params)
+        self.assertEqual(response.status_code, 200, response.content)
+        numbers = {card.id: number for number, card in enumerate(self.cards)}
+        return [numbers[row['id']] for row in response.data['results']]
+
+    def test_filters(self):
+        self.assertEqual(self.ids(board=self.board.id), [0, 1, 2, 3, 4])
+        self.assertEqual(self.ids(column=self.done.id), [3, 4])
+        self.assertEqual(self.ids(assignee=self.member.id), [1])
+        self.assertEqual(self.ids(priority=['U', 'I']), [1, 3, 4])
+        self.assertEqual(self.ids(tag=self.tag.id), [1, 4])
+        self.assertEqual(self.ids(due_after=NOW.isoformat(), due_before=(NOW + timedelta(days=2)).isoformat()), [3])
+        with mock.patch('kanban.filters.timezone.now', return_value=NOW):
+            self.assertEqual(self.ids(overdue='true'), [0, 4])
+            self.assertEqual(self.ids(overdue='false'), [1, 2, 3])
+
+    def test_ordering(self):
+        self.assertEqual(self.ids(ordering='priority'), [1, 4, 3, 2, 0])
+        self.assertEqual(self.ids(ordering='-priority'), [0, 2, 3, 1, 4])
+        self.assertEqual(self.ids(ordering='priority,due_date'), [4, 1, 3, 2, 0])
+        self.assertEqual(self.ids(ordering='due_date', due_after=(NOW - timedelta(days=30)).isoformat()), [0, 4, 3, 1])
+        self.assertEqual(self.ids(ordering='position', column=self.done.id), [3, 4])
+        # A ordenação por prioridade lê a coluna gerada (indexada), sem CASE na query
+        with CaptureQueriesContext(connection) as queries:
+            self.ids(ordering='priority')
+        listing = next(query['sql'] for query in queries if 'ORDER BY' in query['sql'] and 'kanban_card' in query['sql'])
+        self.assertIn('priority_rank', listing)
+        self.assertNotIn('CASE', listing)
+
+    def test_invalid_values_are_rejected(self):
+        for params in ({'board': 'x'}, {'priority': 'Z'}, {'due_after': 'ontem'}, {'ordering': 'title'}, {'tags': '1,x'}):
+            self.assertEqual(self.api(self.member).get('/cards/', params).status_code, 400, params)
+
+    def test_outsider_sees_nothing(self):
+        self.assertEqual(self.ids(user=self.outsider, board=self.board.id), [])
+        self.assertEqual(self.ids(user=self.outsider, tag=self.tag.id, ordering='priority'), [])
+        self.assertEqual(self.api(self.outsider).get(f'/cards/{self.cards[0].id}/').status_code, 404)
+
+
+# --- Métricas por requisição (QueryMetricsMiddleware e /metrics) ---
+
+class MetricsTests(KanbanTestCase):
+
+    def setUp(self):
+        super().setUp()
+        metrics.registry.reset()
+        self.addCleanup(metrics.registry.reset)
+
+    def timing(self, response):
+        return dict(
+            (part.strip().split(';', 1) + [''])[:2] for part in response['Server-Timing'].split(',')
+        )
+
+    def test_server_timing_counts_queries(self):
+        client = self.api(self.member)
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get('/cards/')
+        timing = self.timing(response)
+        self.assertEqual(set(timing), {'db', 'serializer', 'total', 'size'})
+        self.assertIn(f'desc="{len(queries)} queries"', timing['db'])
+        self.assertEqual(timing['size'], f'desc="{len(response.content)} bytes"')
+        recorded = metrics.registry.snapshot()[('CardViewSet', 'list')]
+        self.assertEqual((recorded['requests'], recorded['queries'], recorded['response_bytes']),
+                         (1, len(queries), len(response.content)))
+        self.assertGreater(recorded['serializer_time'], 0)
+
+    def test_metrics_endpoint_is_admin_only(self):
+        self.api(self.member).get(f'/cards/{self.cards[0].id}/')
+        self.assertEqual(self.api(self.member).get('/metrics').status_code, 403)
+        admin = User.objects.create_user('admin', 'Admin', PASSWORD, is_staff=True)
+        response = self.api(admin).get('/metrics')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        body = response.content.decode()
+        self.assertIn('# TYPE kanban_requests_total counter', body)
+        self.assertIn('kanban_requests_total{view="CardViewSet",action="retrieve"} 1', body)
+
+    async def test_async_views_are_measured(self):
+        response = await AsyncClient().get('/async/cards/', headers={'Authorization': basic(self.member)})
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertNotIn('desc="0 queries"', response['Server-Timing'])
+        recorded = metrics.registry.snapshot()[('AsyncCardView', 'get')]
+        self.assertEqual(recorded['requests'], 1)
+        self.assertGreater(recorded['queries'], 0)
+
+
+# --- Formatos binários (kanban/renderers.py) ---
+
+BINARY_FORMATS = {}
+if find_spec('msgpack'):
+    import msgpack
+    BINARY_FORMATS['application/msgpack'] = (lambda data: msgpack.unpackb(data, timestamp=3),
+                                             lambda data: msgpack.packb(data, datetime=True))
+if find_spec('cbor2'):
+    import cbor2
+    BINARY_FORMATS['application/cbor'] = (cbor2.loads, lambda data: cbor2.dumps(data, datetime_as_timestamp=True))
+
+
+def native_datetimes(value):
+    # Resposta JSON com os textos ISO 8601 convertidos em datetime, como chegam dos formatos binários
+    if isinstance(value, dict):
+        return {key: native_datetimes(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [native_datetimes(item) for item in value]
+    if isinstance(value, str):
+        try:
+            return parse_datetime(value) or value
+        except ValueError:
+            return value
+    return value
+
+
+@skipUnless(BINARY_FORMATS, 'msgpack e cbor2 não instalados')
+class BinaryFormatTests(KanbanTestCase):
+
+    def test_card_list_round_trip(self):
+        client = self.api(self.member)
+        expected = client.get('/cards/', HTTP_ACCEPT='application/json').json()
+        for media_type, (decode, _) in BINARY_FORMATS.items():
+            with self.subTest(media_type):
+                response = client.get('/cards/', HTTP_ACCEPT=media_type)
+                self.assertEqual(response['Content-Type'], media_type)
+                data = decode(response.content)
+                self.assertEqual(data['count'], expected['count'])
+                # Datas e horas no tipo nativo do formato, com o mesmo instante do texto ISO do JSON
+                self.assertIsInstance(data['results'][0]['created_at'], datetime)
+                self.assertEqual(data['results'], native_datetimes(expected['results']))
+
+    def test_snapshot_document_keeps_native_datetimes(self):
+        card = Card.objects.get(id=self.cards[0].id)
+        for media_type, (decode, _) in BINARY_FORMATS.items():
+            with self.subTest(media_type):
+                response = self.api(self.member).get(f'/boards/{self.board.id}/snapshot/', HTTP_ACCEPT=media_type)
+                self.assertEqual(response.status_code, 200)
+                document = decode(response.content)
+                row = next(row for row in document['cards'] if row['id'] == card.id)
+                self.assertEqual((row['title'], row['created_at'], row['updated_at']),
+                                 (card.title, card.created_at, card.updated_at))
+                self.assertEqual(document['board']['created_at'], Board.objects.get(id=self.board.id).created_at)
+
+    def test_negotiation(self):
+        client = self.api(self.member)
+        self.assertEqual(client.get('/cards/', HTTP_ACCEPT='application/xml').status_code, 406)
+        self.assertEqual(client.get('/cards/', HTTP_ACCEPT='application/cbor;q=0.5, application/msgpack')['Content-Type'],
+                         'application/msgpack' if 'application/msgpack' in BINARY_FORMATS else 'application/cbor')
+        self.assertTrue(client.get('/cards/')['Content-Type'].startswith('application/json'))
+
+    def test_create_with_binary_body(self):
+        client = self.api(self.owner)
+        due = datetime(2026, 3, 1, 9, 30, tzinfo=dt_timezone.utc)
+        for position, (media_type, (decode, encode)) in enumerate(BINARY_FORMATS.items(), start=3):
+            with self.subTest(media_type):
+                body = encode({'title': f'Binário {position}', 'position': position, 'priority': 'U', 'due_date': due,
+                               'fk_column_id': self.column.id, 'fk_user_id': self.owner.id})
+                response = client.post('/cards/', body, content_type=media_type, HTTP_ACCEPT=media_type)
+                self.assertEqual(response.status_code, 201, response.content)
+                self.assertEqual(decode(response.content)['due_date'], due)
+                self.assertEqual(Card.objects.get(title=f'Binário {position}').due_date, due)
+                self.assertEqual(client.post('/cards/', b'\xc1\xff', content_type=media_type).status_code, 400)
+
+
+# --- Miniaturas (kanban/thumbnails.py) ---
+
+def image_bytes(kind, size=(800, 600)):
+    from PIL import Image
+
+    output = io.BytesIO()
+    Image.new('RGB', size, 'navy').save(output, kind)
+    return output.getvalue()
+
+
+@skipUnless(find_spec('PIL'), 'Pillow não instalado')
+@override_settings(KANBAN_THUMBNAIL_WORKERS=0)
+class ThumbnailTests(KanbanTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.use_temp_media()
+        # Os callbacks rodam depois da requisição: os eventos de atividade vão para o buffer do
+        # processo e são gravados aqui, ainda dentro da transação do teste
+        self.addCleanup(activity.flush)
+
+    def upload(self, filename, data):
+        # Com KANBAN_THUMBNAIL_WORKERS=0 a miniatura é gerada na própria thread, no on_commit
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.api(self.member).post('/attachments/', {
+                'fk_card_id': self.cards[0].id, 'uploaded_by_id': self.member.id, 'file': SimpleUploadedFile(filename, data),
+            })
+        self.assertEqual(response.status_code, 201, response.content)
+        return Attachment.objects.get(id=response.data['id'])
+
+    def test_upload_gets_thumbnail_after_commit(self):
+        from PIL import Image
+
+        for filename, kind in (('foto.png', 'PNG'), ('foto.jpg', 'JPEG')):
+            with self.subTest(filename):
+                attachment = self.upload(filename, image_bytes(kind))
+                self.assertEqual(attachment.thumbnail, attachment.file.name + thumbnails.SUFFIX)
+                with attachment.file.storage.open(attachment.thumbnail, 'rb') as handle:
+                    image = Image.open(handle)
+                    self.assertEqual((image.format, max(image.size)), ('JPEG', thumbnails.SIZE))
+
+    def test_same_blob_reuses_thumbnail(self):
+        data = image_bytes('PNG')
+        first = self.upload('foto.png', data)
+        with mock.patch.object(thumbnails, '_render_image', side_effect=AssertionError('miniatura gerada de novo')):
+            second = self.upload('copia.png', data)
+        self.assertNotEqual(first.id, second.id)
+        self.assertEqual(second.thumbnail, first.thumbnail)
+
+    def test_not_scheduled_before_commit(self):
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            response = self.api(self.member).post('/attachments/', {
+                'fk_card_id': self.cards[0].id, 'uploaded_by_id': self.member.id,
+                'file': SimpleUploadedFile('foto.png', image_bytes('PNG')),
+            })
+        attachment = Attachment.objects.get(id=response.data['id'])
+        self.assertEqual(attachment.thumbnail, '')
+        for callback in callbacks:
+            callback()
+        attachment.refresh_from_db()
+        self.assertEqual(attachment.thumbnail, attachment.file.name + thumbnails.SUFFIX)
+
+    def test_available(self):
+        with mock.patch.object(thumbnails.shutil, 'which', return_value='/usr/bin/pdftoppm'):
+            self.assertTrue(thumbnails.available('image/png'))
+            self.assertTrue(thumbnails.available('application/pdf'))
+            self.assertFalse(thumbnails.available('text/plain'))
+            with mock.patch.object(thumbnails, '_has_pillow', return_value=False):
+                for content_type in ('image/png', 'image/jpeg', 'application/pdf'):
+                    self.assertFalse(thumbnails.available(content_type))
+        with mock.patch.object(thumbnails.shutil, 'which', return_value=None):
+            self.assertFalse(thumbnails.available('application/pdf'))
+            self.assertTrue(thumbnails.available('image/jpeg'))
+
+    def test_endpoint_etag_and_not_modified(self):
+        attachment = self.upload('foto.png', image_bytes('PNG'))
+        client = self.api(self.member)
+        response = client.get(f'/attachments/{attachment.id}/thumbnail/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'image/jpeg')
+        etag = response['ETag']
+        self.assertEqual(etag, f'"{attachment.checksum}-thumb"')
+        with attachment.file.storage.open(attachment.thumbnail, 'rb') as handle:
+            self.assertEqual(b''.join(response.streaming_content), handle.read())
+        response = client.get(f'/attachments/{attachment.id}/thumbnail/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual((response.status_code, response.content, response['ETag']), (304, b'', etag))
+        self.assertEqual(self.api(self.outsider).get(f'/attachments/{attachment.id}/thumbnail/').status_code, 404)
+
+    def test_endpoint_without_thumbnail(self):
+        with self.captureOnCommitCallbacks(execute=False):
+            response = self.api(self.member).post('/attachments/', {
+                'fk_card_id': self.cards[0].id, 'uploaded_by_id': self.member.id,
+                'file': SimpleUploadedFile('foto.png', image_bytes('PNG')),
+            })
+        self.assertEqual(self.client.get(f'/attachments/{response.data["id"]}/thumbnail/').status_code, 404)
@@ -0,0 +1,224 @@
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+
+from .models import BoardAccess
+
+# Cache compartilhado onde ficam os buckets (KANBAN_THROTTLE_CACHE); None usa só a memória do processo
+CACHE_ALIAS = 'default'
+# Acima disso o armazenamento em memória descarta as chaves já expiradas
+LOCAL_MAX_KEYS = 10000
+# Trava de cada bucket no cache: validade (se o processo morrer segurando) e espera máxima por ela
+LOCK_TIMEOUT = 1
+LOCK_WAIT = 0.1
+
+_PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_rate(rate):
+    # Mesmo formato do DRF ("100/min", "10/s", "1000/day"): capacidade e período em segundos
+    if rate is None:
+        return None
+    num, period = rate.split('/')
+    return int(num), _PERIODS[period[0]]
+
+
+class BucketBusy(Exception):
+    """Outra requisição segurou a trava do bucket além de LOCK_WAIT."""
+
+
+class BucketStore:
+    """
+    Estado dos token buckets no algoritmo GCRA: por chave, guarda-se apenas o
+    instante teórico de chegada (TAT), em que o bucket estaria cheio de novo.
+    Usa o cache compartilhado e, se ele falhar (ou não estiver configurado), a
+    memória do processo. A leitura, a decisão e a escrita de cada bucket são
+    atômicas: no cache, sob uma trava por chave tomada com `cache.add` (atômico
+    no Redis, no Memcached e no LocMemCache); na memória, sob o lock do processo.
+    """
+
+    def __init__(self):
+        self._local = {}
+        self._lock = threading.Lock()
+
+    def _cache(self):
+        alias = getattr(settings, 'KANBAN_THROTTLE_CACHE', CACHE_ALIAS)
+        return caches[alias] if alias else None
+
+    def update(self, keys, decide):
+        """
+        Chama `decide(stored)` com os TATs atuais ({chave: tat}) das chaves travadas e grava
+        o que ela devolver ({chave: novo tat}, ou vazio para não consumir nada).
+        """
+        cache = self._cache()
+        if cache is not None:
+            try:
+                return self._update_shared(cache, sorted(keys), decide)
+            except BucketBusy:
+                raise
+            except Exception:
+                pass
+        with self._lock:
+            now = time.time()
+            if len(self._local) > LOCAL_MAX_KEYS:
+                self._local = {key: value for key, value in self._local.items() if value[1] > now}
+            updates = decide({key: self._local[key][0] for key in keys if key in self._local and self._local[key][1] > now})
+            for key, tat in updates.items():
+                self._local[key] = (tat, tat)
+
+    def _update_shared(self, cache, keys, decide):
+        # Travas tomadas em ordem de chave: duas requisições com os mesmos buckets não se bloqueiam em ciclo
+        acquired = []
+        try:
+            for key in keys:
+                lock = f'{key}:lock'
+                deadline = time.monotonic() + LOCK_WAIT
+                while not cache.add(lock, 1, LOCK_TIMEOUT):
+                    if time.monotonic() > deadline:
+                        raise BucketBusy()
+                    time.sleep(0.001)
+                acquired.append(lock)
+            updates = decide(cache.get_many(keys))
+            now = time.time()
+            # Cada chave expira quando o bucket estaria cheio
+            for key, tat in updates.items():
+                cache.set(key, tat, max(int(tat - now) + 1, 1))
+        finally:
+            if acquired:
+                cache.delete_many(acquired)
+
+    def clear(self):
+        with self._lock:
+            self._local.clear()
+
+
+store = BucketStore()
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """
+    Throttle por token bucket. As subclasses dizem quais buckets a requisição
+    consome (`get_buckets`); o pedido só é aceito, e só consome fichas, se
+    houver ficha em todos. As taxas vêm de REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'].
+    """
+
+    def get_rate(self, scope):
+        return parse_rate(api_settings.DEFAULT_THROTTLE_RATES.get(scope))
+
+    def get_buckets(self, request, view):
+        # Lista de (chave, escopo da taxa)
+        raise NotImplementedError
+
+    def kind(self, request):
+        # Leituras baratas e escritas caras têm taxas separadas
+        return 'read' if request.method in SAFE_METHODS else 'write'
+
+    def actor(self, request):
+        user = getattr(request, 'user', None)
+        if user is not None and user.is_authenticated:
+            return f'user:{user.pk}'
+        return f'anon:{self.get_ident(request)}'
+
+    def board_id(self, request, view):
+        # Só o quadro que a própria view declara (o da URL ou o filtro dela), e só se o usuário
+        # tem acesso a ele: os throttles rodam antes das permissões, e quem não é membro não
+        # pode esgotar o bucket compartilhado pelos membros do quadro
+        resolver = getattr(view, 'get_throttle_board_id', None)
+        board_id = resolver(request) if resolver else None
+        user = getattr(request, 'user', None)
+        if not board_id or not str(board_id).isdigit() or user is None or not user.is_authenticated:
+            return None
+        board_id = int(board_id)
+        # Viewsets com BoardScopedMixin já resolvem (e guardam para a requisição) os quadros do usuário
+        permissions = getattr(view, 'board_permissions', None)
+        if permissions is not None:
+            return board_id if board_id in permissions() else None
+        return board_id if BoardAccess.objects.filter(fk_user=user, fk_board_id=board_id).exists() else None
+
+    def allow_request(self, request, view):
+        self.retry_after = None
+        buckets = []
+        for key, scope in self.get_buckets(request, view):
+            rate = self.get_rate(scope)
+            if rate is not None:
+                buckets.append((f'kanban:throttle:{key}', rate))
+        if not buckets:
+            return True
+
+        def consume(stored):
+            now = time.time()
+            updates = {}
+            for key, (capacity, period) in buckets:
+                interval = period / capacity
+                tat = max(stored.get(key, now), now)
+                # O bucket comporta `capacity` fichas: recusa se a próxima ficha ainda não "chegou"
+                allowed_at = tat + interval - capacity * interval
+                if now < allowed_at:
+                    self.retry_after = max(self.retry_after or 0, allowed_at - now)
+                    continue
+                updates[key] = tat + interval
+            # Só consome se houver ficha em todos os buckets
+            return {} if self.retry_after is not None else updates
+
+        try:
+            store.update([key for key, _ in buckets], consume)
+        except BucketBusy:
+            # Bucket disputado além de LOCK_WAIT: recusa em vez de liberar sem contar
+            self.retry_after = 1
+        return self.retry_after is None
+
+    def wait(self):
+        return self.retry_after
+
+
+class UserRateThrottle(TokenBucketThrottle):
+    """Por usuário (ou IP, para anônimos): escopos `user_read`/`user_write` e `anon`."""
+
+    def get_buckets(self, request, view):
+        actor = self.actor(request)
+        scope = f'user_{self.kind(request)}' if actor.startswith('user:') else 'anon'
+        return [(f'{actor}:{scope}', scope)]
+
+
+class BoardRateThrottle(TokenBucketThrottle):
+    """
+    Por quadro, somando todos os usuários: escopos `board_read`/`board_write`. O
+    quadro vem de `view.get_throttle_board_id(request)` e só conta para quem tem acesso a ele.
+    """
+
+    def get_buckets(self, request, view):
+        board_id = self.board_id(request, view)
+        if not board_id:
+            return []
+        scope = f'board_{self.kind(request)}'
+        return [(f'board:{board_id}:{scope}', scope)]
+
+
+class EndpointRateThrottle(TokenBucketThrottle):
+    """
+    Por usuário e classe de endpoint: views e actions caras declaram
+    `throttle_scope` (ex.: 'export', 'search', 'upload') com taxa própria.
+    """
+
+    def get_buckets(self, request, view):
+        scope = getattr(view, 'throttle_scope', None)
+        if not scope:
+            return []
+        return [(f'{self.actor(request)}:{scope}', scope)]
+
+
+class KanbanRateThrottle(TokenBucketThrottle):
+    """Combina os buckets de usuário, quadro e endpoint numa única verificação."""
+
+    parts = (UserRateThrottle, BoardRateThrottle, EndpointRateThrottle)
+
+    def get_buckets(self, request, view):
+        buckets = []
+        for part in self.parts:
+            buckets.extend(part.get_buckets(self, request, view))
+        return buckets
@@ -0,0 +1,125 @@
+import importlib.util
+import io
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import close_old_connections, transaction
+
+from .models import Attachment
+
+logger = logging.getLogger(__name__)
+
+# Lado máximo da miniatura, em pixels (KANBAN_THUMBNAIL_SIZE)
+SIZE = 320
+# Threads do pool em processo (KANBAN_THUMBNAIL_WORKERS); 0 gera na própria thread, após o commit
+WORKERS = 2
+# Sufixo da miniatura, gravada ao lado do blob original
+SUFFIX = '.thumb.jpg'
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def _has_pillow():
+    # Pillow é opcional (sem ele não há miniaturas) e só é importado ao gerar a primeira,
+    # para não pesar no boot de cada worker
+    return importlib.util.find_spec('PIL') is not None
+
+
+def available(content_type):
+    if not _has_pillow():
+        return False
+    if content_type == 'application/pdf':
+        return shutil.which('pdftoppm') is not None
+    return content_type in ('image/jpeg', 'image/png')
+
+
+def _pool():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=getattr(settings, 'KANBAN_THUMBNAIL_WORKERS', WORKERS), thread_name_prefix='kanban-thumbnail',
+            )
+        return _executor
+
+
+def schedule(attachment):
+    """Agenda a miniatura do anexo para depois do commit da transação que o criou."""
+    if not available(attachment.content_type):
+        return
+    attachment_id = attachment.pk
+    if getattr(settings, 'KANBAN_THUMBNAIL_WORKERS', WORKERS):
+        transaction.on_commit(lambda: _pool().submit(_run, attachment_id))
+    else:
+        transaction.on_commit(lambda: generate(attachment_id))
+
+
+def _run(attachment_id):
+    # Threads do pool abrem as próprias conexões; são descartadas ao final de cada job
+    close_old_connections()
+    try:
+        generate(attachment_id)
+    except Exception:
+        logger.exception('Falha ao gerar a miniatura do anexo %s', attachment_id)
+    finally:
+        close_old_connections()
+
+
+def _render_image(handle, size):
+    from PIL import Image
+
+    image = Image.open(handle)
+    # Em JPEGs, decodifica direto numa escala reduzida (bem mais rápido que decodificar inteiro)
+    image.draft('RGB', (size, size))
+    image.thumbnail((size, size))
+    if image.mode not in ('RGB', 'L'):
+        background = Image.new('RGB', image.size, 'white')
+        background.paste(image, mask=image.convert('RGBA').getchannel('A'))
+        image = background
+    output = io.BytesIO()
+    image.save(output, 'JPEG', quality=80, optimize=True)
+    return output.getvalue()
+
+
+def _render_pdf(path, size):
+    # Primeira página rasterizada pelo poppler já no tamanho da miniatura
+    with tempfile.TemporaryDirectory() as folder:
+        prefix = os.path.join(folder, 'page')
+        subprocess.run(
+            ['pdftoppm', '-f', '1', '-l', '1', '-singlefile', '-jpeg', '-scale-to', str(size), path, prefix],
+            check=True, capture_output=True, timeout=30,
+        )
+        with open(f'{prefix}.jpg', 'rb') as handle:
+            return _render_image(handle, size)
+
+
+def generate(attachment_id):
+    """
+    Gera (ou reaproveita) a miniatura do anexo. Como o blob é endereçado por
+    conteúdo, anexos com o mesmo arquivo compartilham a mesma miniatura.
+    """
+    attachment = Attachment.objects.filter(pk=attachment_id).first()
+    if attachment is None or attachment.thumbnail or not available(attachment.content_type):
+        return None
+    storage = attachment.file.storage
+    name = attachment.file.name + SUFFIX
+    if not storage.exists(name):
+        size = getattr(settings, 'KANBAN_THUMBNAIL_SIZE', SIZE)
+        if attachment.content_type == 'application/pdf':
+            data = _render_pdf(storage.path(attachment.file.name), size)
+        else:
+            with storage.open(attachment.file.name, 'rb') as handle:
+                data = _render_image(handle, size)
+        storage.save_derived(name, ContentFile(data))
+    Attachment.objects.filter(pk=attachment_id).update(thumbnail=name)
+    return name
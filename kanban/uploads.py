@@ -0,0 +1,202 @@
+import hashlib
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.uploadhandler import FileUploadHandler, StopUpload
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+
+from .models import Attachment, UploadSession
+from .storage import CHUNK_SIZE
+
+# Tamanho máximo padrão de um anexo (KANBAN_ATTACHMENT_MAX_SIZE)
+MAX_SIZE = 1024 * 1024 * 5
+# Sessões de upload em partes sem atividade há mais tempo que isso são descartadas
+EXPIRY = timedelta(hours=24)
+
+# Extensões aceitas, com o tipo MIME gravado no anexo e a assinatura dos primeiros bytes
+ALLOWED_TYPES = {
+    '.jpg': ('image/jpeg', b'\xff\xd8\xff'),
+    '.png': ('image/png', b'\x89PNG\r\n\x1a\n'),
+    '.pdf': ('application/pdf', b'%PDF-'),
+}
+
+
+class PayloadTooLarge(APIException):
+    status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    default_detail = 'O arquivo enviado é grande demais.'
+    default_code = 'payload_too_large'
+
+
+class UploadConflict(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = 'O offset informado não corresponde ao recebido até agora.'
+    default_code = 'upload_conflict'
+
+
+def max_size():
+    return getattr(settings, 'KANBAN_ATTACHMENT_MAX_SIZE', MAX_SIZE)
+
+
+def size_error(size):
+    if size > max_size():
+        return f'O arquivo não pode ter mais de {max_size() // (1024 * 1024)}MB.'
+    return None
+
+
+def type_error(filename):
+    if os.path.splitext(filename or '')[1].lower() not in ALLOWED_TYPES:
+        return 'Formato de arquivo não permitido. Use .jpg, .png ou .pdf.'
+    return None
+
+
+def content_type_for(filename):
+    return ALLOWED_TYPES[os.path.splitext(filename)[1].lower()][0]
+
+
+def signature_error(filename, head):
+    # Confere os primeiros bytes com a assinatura esperada para a extensão
+    signature = ALLOWED_TYPES[os.path.splitext(filename)[1].lower()][1]
+    if not head.startswith(signature):
+        return 'O conteúdo do arquivo não corresponde à extensão informada.'
+    return None
+
+
+def content_length(request):
+    try:
+        return int(request.META.get('CONTENT_LENGTH') or 0)
+    except ValueError:
+        return 0
+
+
+class LimitedUploadHandler(FileUploadHandler):
+    """
+    Primeiro handler do upload multipart: recusa o arquivo pela extensão assim
+    que o cabeçalho da parte chega, confere a assinatura no primeiro bloco e
+    interrompe a leitura ao passar do limite, sem bufferizar o restante.
+    """
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.error = None
+        self.too_large = False
+        self.received = 0
+
+    def new_file(self, field_name, file_name, *args, **kwargs):
+        super().new_file(field_name, file_name, *args, **kwargs)
+        self.received = 0
+        self.error = type_error(file_name)
+        if self.error:
+            raise StopUpload(connection_reset=True)
+
+    def receive_data_chunk(self, raw_data, start):
+        if start == 0:
+            self.error = signature_error(self.file_name, raw_data)
+        self.received += len(raw_data)
+        if not self.error and size_error(self.received):
+            self.error, self.too_large = size_error(self.received), True
+        if self.error:
+            raise StopUpload(connection_reset=True)
+        return raw_data
+
+    def file_complete(self, file_size):
+        # O arquivo em si é montado pelos handlers padrão do Django
+        return None
+
+
+def upload_dir():
+    return getattr(settings, 'KANBAN_UPLOAD_DIR', os.path.join(settings.MEDIA_ROOT, 'uploads'))
+
+
+def part_path(session):
+    return os.path.join(upload_dir(), f'{session.id}.part')
+
+
+def append_chunk(session, stream, offset, length):
+    """
+    Grava no arquivo parcial da sessão `length` bytes lidos de `stream`, a partir
+    de `offset`. O corpo é recebido num arquivo temporário próprio da requisição;
+    o arquivo parcial só é alterado depois que o avanço condicional do offset é
+    confirmado, com a linha da sessão bloqueada até o fim da cópia. Se outra
+    requisição avançou a sessão antes, nada é gravado e UploadConflict é levantada.
+    """
+    path = part_path(session)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    remaining = length
+    with tempfile.TemporaryFile(dir=os.path.dirname(path)) as received:
+        while remaining > 0:
+            chunk = stream.read(min(CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            # O tipo é conferido já no primeiro bloco do arquivo, não ao final do upload
+            if offset == 0 and remaining == length:
+                error = signature_error(session.filename, chunk)
+                if error:
+                    raise ValidationError({'file': [error]})
+            received.write(chunk)
+            remaining -= len(chunk)
+        if remaining:
+            raise ValidationError('O corpo da requisição terminou antes do tamanho informado.')
+        received.seek(0)
+        with transaction.atomic():
+            # O UPDATE bloqueia a linha (o banco, no SQLite) até o commit: quem disputar o
+            # mesmo offset espera e não encontra mais a linha; se a cópia falhar, o offset volta
+            updated = UploadSession.objects.filter(id=session.id, offset=offset).update(
+                offset=offset + length, updated_at=timezone.now(),
+            )
+            if not updated:
+                raise UploadConflict()
+            with open(path, 'r+b' if os.path.exists(path) else 'wb') as handle:
+                handle.seek(offset)
+                shutil.copyfileobj(received, handle, CHUNK_SIZE)
+                handle.truncate()
+    session.offset = offset + length
+
+
+def complete(session):
+    """Move o arquivo montado para o storage endereçado por conteúdo e cria o anexo."""
+    path = part_path(session)
+    sha256 = hashlib.sha256()
+    with open(path, 'rb') as handle:
+        for chunk in iter(lambda: handle.read(CHUNK_SIZE), b''):
+            sha256.update(chunk)
+    with open(path, 'rb') as handle, transaction.atomic():
+        content = File(handle, session.filename)
+        content.checksum = sha256.hexdigest()
+        attachment = Attachment(
+            fk_card_id=session.fk_card_id,
+            uploaded_by_id=session.uploaded_by_id,
+            original_name=session.filename,
+            content_type=session.content_type,
+            size=session.size,
+            checksum=content.checksum,
+        )
+        attachment.file.save(session.filename, content, save=False)
+        attachment.save()
+        session.delete()
+    os.remove(path)
+    return attachment
+
+
+def discard(session):
+    path = part_path(session)
+    session.delete()
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def prune_sessions(before=None):
+    """Descarta as sessões de upload paradas há mais tempo que KANBAN_UPLOAD_EXPIRY."""
+    if before is None:
+        before = timezone.now() - getattr(settings, 'KANBAN_UPLOAD_EXPIRY', EXPIRY)
+    removed = 0
+    for session in UploadSession.objects.filter(updated_at__lt=before).iterator():
+        discard(session)
+        removed += 1
+    return removed
@@ -1,17 +1,38 @@
-from django.shortcuts import render
+import gzip
+
+from django.shortcuts import render, get_object_or_404
+from django.urls import reverse
+from django.http import HttpResponse, StreamingHttpResponse
+from datetime import timedelta
+from django.utils import timezone
+from django.utils.dateparse import parse_date
 from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.views import APIView
+from rest_framework.pagination import CursorPagination
+from django.db import IntegrityError
 from django.db.models import Q
-from .models import User, Board, Column, Card, Task, Tag, Comment, Notification, Attachment, BoardCollaborator
-from .serializers import UserSerializer, BoardSerializer, ColumnSerializer, CardSerializer, TaskSerializer, TagSerializer, CommentSerializer, NotificationSerializer, AttachmentSerializer, BoardCollaboratorSerializer
-from rest_framework.permissions import IsAuthenticated
-from rest_framework.exceptions import PermissionDenied
+from django.db.models.functions import Lower
+from .models import User, Board, BoardAccess, Column, Card, Task, Tag, CardTemplate, Comment, Notification, Attachment, BoardCollaborator, Activity, UploadSession
+from .serializers import UserSerializer, BoardSerializer, BoardCloneSerializer, CardTemplateSerializer, CardTemplateInstantiateSerializer, ColumnSerializer, CardSerializer, TaskSerializer, TagSerializer, CommentSerializer, NotificationSerializer, AttachmentSerializer, BoardCollaboratorSerializer, SearchEntrySerializer, ActivitySerializer, UploadSessionSerializer, BoardDeletionSerializer
+from rest_framework.permissions import IsAuthenticated, IsAdminUser
+from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework_simplejwt.views import TokenObtainPairView
 from .serializers import CustomTokenObtainPairSerializer
 from rest_framework.authentication import BasicAuthentication
+from django_filters.rest_framework import DjangoFilterBackend
+from . import analytics, archive, cloning, counters, metrics, reaper, search, storage, uploads
+from .filters import CardFilter
+from .access import BoardScopedMixin
+from .caching import CachePolicyMixin
+from .concurrency import OptimisticConcurrencyMixin
+from .idempotency import IdempotencyMixin, idempotent
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(CachePolicyMixin, IdempotencyMixin, viewsets.ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     lookup_field = 'id'
@@ -19,93 +40,478 @@ class UserViewSet(viewsets.ModelViewSet):
     #authentication_classes = [JWTAuthentication] # Adiciona autenticação JWT
     permission_classes = [IsAuthenticated] # Adiciona permissão de autenticação
 
-class BoardViewSet(viewsets.ModelViewSet):
+# Paginação por cursor do feed de atividades: cada página é uma leitura do índice
+# (fk_board, created_at) a partir da posição anterior, sem OFFSET nem COUNT
+class ActivityPagination(CursorPagination):
+    ordering = '-created_at'
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+class BoardViewSet(CachePolicyMixin, IdempotencyMixin, viewsets.ModelViewSet):
     queryset = Board.objects.all()
     serializer_class = BoardSerializer
     permission_classes = [IsAuthenticated]
+    max_analytics_days = 731
+    # Actions caras (exportação, arquivamento) declaram o próprio escopo de throttling
+    throttle_scope = None
 
     def get_queryset(self):
+        # Na geração do schema (drf_yasg) a view não tem requisição nem usuário
+        if getattr(self, 'swagger_fake_view', False):
+            return Board.objects.none()
         user = self.request.user
-        # Retorna apenas os quadros que o usuário possui ou tem permissão
-        return Board.objects.filter(
-            Q(fk_user=user) |
-            Q(collaborators__fk_user=user)
-        ).distinct()
+        # Quadros removidos só são visíveis para acompanhar o expurgo ou restaurá-los
+        if self.action in ('restore', 'deletion'):
+            return Board.objects.accessible_to(user, include_inactive=True).filter(deleted_at__isnull=False)
+        # Retorna apenas os quadros que o usuário possui ou tem permissão (arquivados inclusive)
+        return Board.objects.accessible_to(user, include_inactive=True).filter(deleted_at__isnull=True)
 
     def perform_create(self, serializer):
         serializer.save(fk_user=self.request.user)
 
+    # Quadro cujo bucket a requisição consome (kanban/throttling.py)
+    def get_throttle_board_id(self, request):
+        return self.kwargs.get('pk')
+
+    # Estatísticas do quadro lidas dos contadores desnormalizados (kanban/counters.py)
+    @action(detail=True, methods=['get'], cache_control={'private': True, 'max_age': 30})
+    def stats(self, request, pk=None):
+        return Response(counters.board_stats(self.get_object(), timezone.now()))
+
+    # Fluxo cumulativo, throughput e lead/cycle time no período (?start=AAAA-MM-DD&end=AAAA-MM-DD)
+    @action(detail=True, methods=['get'], throttle_scope='export', cache_control={'private': True, 'max_age': 300})
+    def analytics(self, request, pk=None):
+        board = self.get_object()
+        today = timezone.localdate()
+        try:
+            end = self._parse_day('end') or today
+            start = self._parse_day('start') or end - timedelta(days=29)
+        except ValueError:
+            raise ValidationError('As datas devem estar no formato AAAA-MM-DD.')
+        if start > end:
+            raise ValidationError({'start': 'A data inicial não pode ser posterior à data final.'})
+        if (end - start).days > self.max_analytics_days:
+            raise ValidationError(f'O período não pode passar de {self.max_analytics_days} dias.')
+        return Response(analytics.board_analytics(board, start, min(end, today)))
+
+    # Feed de atividades recentes do quadro
+    @action(detail=True, methods=['get'])
+    def activity(self, request, pk=None):
+        board = self.get_object()
+        paginator = ActivityPagination()
+        page = paginator.paginate_queryset(Activity.objects.filter(fk_board=board), request, view=self)
+        return paginator.get_paginated_response(ActivitySerializer(page, many=True).data)
+
+    def _parse_day(self, param):
+        value = self.request.query_params.get(param)
+        if not value:
+            return None
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(value)
+        return day
+
     def perform_update(self, serializer):
         board = self.get_object()
         if not board.has_permission(self.request.user, permission_type='edit'):
             raise PermissionDenied("Você não tem permissão para editar este quadro.")
         serializer.save()
 
-    def perform_destroy(self, instance):
-        if not instance.has_permission(self.request.user, permission_type='admin'):
+    # A remoção é lógica: o quadro some na hora e o conteúdo é expurgado em lotes
+    # pelo reaper (manage.py reap_boards) depois de KANBAN_BOARD_PURGE_DELAY
+    def destroy(self, request, *args, **kwargs):
+        board = self.get_object()
+        if not board.has_permission(request.user, permission_type='admin'):
             raise PermissionDenied("Você não tem permissão para deletar este quadro.")
-        instance.delete()
+        deletion = reaper.soft_delete(board, request.user)
+        return Response(BoardDeletionSerializer(deletion).data, status=202)
 
+    # Cópia do quadro (colunas, tags, modelos e, por padrão, cartões e tarefas) em uma transação,
+    # com inserções em lote (kanban/cloning.py): {"name": ..., "cards": true, "tasks": true, "reset_progress": true}.
+    # Exige edição: quem só visualiza não leva o conteúdo do quadro para um quadro próprio
+    @action(detail=True, methods=['post'], throttle_scope='export', serializer_class=BoardCloneSerializer)
+    @idempotent
+    def clone(self, request, pk=None):
+        board = self.get_object()
+        if not board.has_permission(request.user, permission_type='edit'):
+            raise PermissionDenied("Você não tem permissão para copiar este quadro.")
+        if board.archived_at:
+            raise ValidationError('Restaure o quadro arquivado antes de copiá-lo.')
+        params = BoardCloneSerializer(data=request.data)
+        params.is_valid(raise_exception=True)
+        new_board = cloning.clone_board(board, request.user, **params.validated_data)
+        return Response(BoardSerializer(new_board, context=self.get_serializer_context()).data, status=201)
+
+    # Move colunas, cartões e filhos para um arquivo comprimido (kanban/archive.py)
+    @action(detail=True, methods=['post'], throttle_scope='export')
+    def archive(self, request, pk=None):
+        board = self.get_object()
+        if not board.has_permission(request.user, permission_type='admin'):
+            raise PermissionDenied("Você não tem permissão para arquivar este quadro.")
+        try:
+            stored = archive.archive_board(board, request.user)
+        except archive.ArchiveError as exc:
+            return Response({'detail': str(exc)}, status=409)
+        return Response({'board': board.id, 'archived_at': board.archived_at, 'counts': stored.counts,
+                         'raw_size': stored.raw_size, 'compressed_size': len(stored.data)})
+
+    # Conteúdo completo do quadro em JSON. Quadros ativos: gerado em streaming, comprimido pelo
+    # CompressionMiddleware conforme os trechos saem. Arquivados: o JSON já é guardado comprimido
+    # e é enviado como está para clientes que aceitam gzip.
+    # Com Accept de um formato binário (MessagePack/CBOR), o documento é convertido para ele.
+    @action(detail=True, methods=['get'], throttle_scope='export')
+    def snapshot(self, request, pk=None):
+        board = self.get_object()
+        renderer = request.accepted_renderer
+        if getattr(renderer, 'native_datetimes', False):
+            return HttpResponse(renderer.render(archive.snapshot_document(board)), content_type=renderer.media_type)
+        data = archive.stored_snapshot(board)
+        if data is None:
+            return StreamingHttpResponse(archive.iter_document(board), content_type='application/json')
+        if 'gzip' in request.headers.get('Accept-Encoding', ''):
+            response = HttpResponse(data, content_type='application/json')
+            response['Content-Encoding'] = 'gzip'
+        else:
+            response = HttpResponse(gzip.decompress(data), content_type='application/json')
+        response['Vary'] = 'Accept-Encoding'
+        return response
+
+    # Restauração em lote: {"boards": [1, 2, ...]}
+    @action(detail=False, methods=['post'], throttle_scope='export')
+    def unarchive(self, request):
+        ids = request.data.get('boards')
+        if not isinstance(ids, list) or not all(isinstance(value, int) for value in ids):
+            raise ValidationError({'boards': 'Informe a lista de ids dos quadros a restaurar.'})
+        boards = Board.objects.accessible_to(request.user, include_inactive=True).filter(
+            id__in=ids, archived_at__isnull=False, deleted_at__isnull=True,
+        )
+        restored, failed = [], {}
+        for board in boards:
+            if not board.has_permission(request.user, permission_type='admin'):
+                failed[board.id] = "Você não tem permissão para restaurar este quadro."
+                continue
+            try:
+                archive.restore_board(board)
+            except archive.ArchiveError as exc:
+                failed[board.id] = str(exc)
+            else:
+                restored.append(board.id)
+        for board_id in set(ids) - set(restored) - set(failed):
+            failed[board_id] = 'Quadro não encontrado ou não arquivado.'
+        return Response({'restored': restored, 'failed': failed})
 
-class ColumnViewSet(viewsets.ModelViewSet):
+    # Progresso do expurgo de um quadro removido
+    @action(detail=True, methods=['get'])
+    def deletion(self, request, pk=None):
+        board = self.get_object()
+        deletion = board.deletions.order_by('-created_at', '-id').first()
+        return Response(BoardDeletionSerializer(deletion).data)
+
+    @action(detail=True, methods=['post'])
+    def restore(self, request, pk=None):
+        board = self.get_object()
+        if not board.has_permission(request.user, permission_type='admin'):
+            raise PermissionDenied("Você não tem permissão para restaurar este quadro.")
+        if not reaper.restore(board):
+            return Response({'detail': 'O expurgo deste quadro já começou; não é possível restaurá-lo.'}, status=409)
+        return Response(BoardSerializer(board, context=self.get_serializer_context()).data)
+
+
+class ColumnViewSet(CachePolicyMixin, IdempotencyMixin, BoardScopedMixin, OptimisticConcurrencyMixin, viewsets.ModelViewSet):
     queryset = Column.objects.all()
     serializer_class = ColumnSerializer
     permission_classes = [IsAuthenticated]
-
-    def get_queryset(self):
-        user = self.request.user
-        # Retorna apenas as colunas de quadros que o usuário possui ou tem permissão
-        return Column.objects.filter(
-            fk_board__fk_user=user
-        ) | Column.objects.filter(
-            fk_board__collaborators__fk_user=user
-        )
+    # Apenas colunas dos quadros acessíveis; alterar ou remover exige edição no quadro (BoardScopedMixin)
+    board_field = 'fk_board'
+    write_denied = 'Você não tem permissão para alterar as colunas deste quadro.'
 
     def perform_create(self, serializer):
         fk_board = serializer.validated_data.get('fk_board')
         if not fk_board.has_permission(self.request.user, permission_type='edit'):
             raise PermissionDenied("Você não tem permissão para adicionar colunas a este quadro.")
+        if fk_board.archived_at or fk_board.deleted_at:
+            raise ValidationError({'fk_board': 'O quadro está arquivado ou foi removido.'})
         serializer.save(fk_user=self.request.user)
 
-class CardViewSet(viewsets.ModelViewSet):
+class CardViewSet(CachePolicyMixin, IdempotencyMixin, BoardScopedMixin, OptimisticConcurrencyMixin, viewsets.ModelViewSet):
     queryset = Card.objects.all()
     serializer_class = CardSerializer
     lookup_field = 'id'
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = CardFilter
+    board_field = 'fk_column__fk_board'
+    write_denied = 'Você não tem permissão para alterar os cartões deste quadro.'
 
-class TaskViewSet(viewsets.ModelViewSet):
+    def get_queryset(self):
+        # Apenas cartões dos quadros acessíveis ao usuário, na ordem do índice (coluna, posição)
+        return CardSerializer.optimize(super().get_queryset()).order_by('fk_column', 'position', 'id')
+
+    # Com o filtro ?board= (CardFilter), a listagem consome o bucket do quadro
+    def get_throttle_board_id(self, request):
+        return request.query_params.get('board')
+
+class TaskViewSet(CachePolicyMixin, IdempotencyMixin, BoardScopedMixin, OptimisticConcurrencyMixin, viewsets.ModelViewSet):
     queryset = Task.objects.all()
     serializer_class = TaskSerializer
     lookup_field = 'id'
+    board_field = 'fk_card__fk_column__fk_board'
+    write_denied = 'Você não tem permissão para alterar as tarefas deste quadro.'
+
+    def get_queryset(self):
+        # Tarefas dos cartões acessíveis, na ordem do índice único (cartão, posição)
+        return CardSerializer.optimize(super().get_queryset(), 'fk_card__').order_by('fk_card', 'position', 'id')
 
-class TagViewSet(viewsets.ModelViewSet):
+class TagViewSet(CachePolicyMixin, IdempotencyMixin, BoardScopedMixin, viewsets.ModelViewSet):
     queryset = Tag.objects.all()
     serializer_class = TagSerializer
     lookup_field = 'id'
+    board_field = 'fk_board'
+    write_denied = 'Você não tem permissão para editar as tags deste quadro.'
+    # Tags mudam pouco: o navegador pode reaproveitar a listagem por um minuto (a resposta depende do usuário)
+    cache_control = {'private': True, 'max_age': 60}
+    # Limites das operações em lote (cartões x tags por requisição)
+    max_bulk_cards = 500
+    max_bulk_tags = 50
+
+    def get_queryset(self):
+        # Tags dos quadros acessíveis; com ?board=ID, só as daquele quadro (índice único quadro + nome)
+        queryset = super().get_queryset()
+        board_id = self.request.query_params.get('board')
+        if board_id:
+            if not board_id.isdigit():
+                raise ValidationError({'board': 'Informe o id numérico do quadro.'})
+            queryset = queryset.filter(fk_board_id=board_id)
+        return queryset.prefetch_related('cards').order_by('fk_board', Lower('name'), 'id')
+
+    def get_throttle_board_id(self, request):
+        return request.query_params.get('board')
+
+    # Marca ou desmarca vários cartões de uma vez: {"tags": [ids], "cards": [ids]}, tudo do mesmo quadro.
+    # Escreve direto na tabela de junção (um INSERT/DELETE em lote), sem carregar os cartões.
+    @action(detail=False, methods=['post'])
+    def assign(self, request):
+        TagCard = Tag.cards.through
+        pairs = self._bulk_pairs(request)
+        existing = set(TagCard.objects.filter(
+            tag_id__in={tag_id for tag_id, _ in pairs}, card_id__in={card_id for _, card_id in pairs},
+        ).values_list('tag_id', 'card_id'))
+        links = [TagCard(tag_id=tag_id, card_id=card_id) for tag_id, card_id in pairs if (tag_id, card_id) not in existing]
+        # ignore_conflicts cobre vínculos criados por outra requisição entre a leitura e o INSERT
+        TagCard.objects.bulk_create(links, ignore_conflicts=True)
+        return Response({'assigned': len(links)})
+
+    @action(detail=False, methods=['post'])
+    def unassign(self, request):
+        pairs = self._bulk_pairs(request)
+        removed, _ = Tag.cards.through.objects.filter(
+            tag_id__in={tag_id for tag_id, _ in pairs}, card_id__in={card_id for _, card_id in pairs},
+        ).delete()
+        return Response({'removed': removed})
+
+    def _bulk_pairs(self, request):
+        tag_ids, card_ids = request.data.get('tags'), request.data.get('cards')
+        for name, ids, limit in (('tags', tag_ids, self.max_bulk_tags), ('cards', card_ids, self.max_bulk_cards)):
+            if not isinstance(ids, list) or not ids or not all(isinstance(value, int) for value in ids):
+                raise ValidationError({name: 'Informe uma lista de ids.'})
+            if len(ids) > limit:
+                raise ValidationError({name: f'Informe no máximo {limit} ids por requisição.'})
+        tags = list(self.get_queryset().filter(id__in=tag_ids).select_related('fk_board').prefetch_related(None))
+        missing = set(tag_ids) - {tag.id for tag in tags}
+        if missing:
+            raise ValidationError({'tags': f'Tags não encontradas: {sorted(missing)}.'})
+        boards = {tag.fk_board for tag in tags}
+        if len(boards) > 1:
+            raise ValidationError({'tags': 'As tags devem ser do mesmo quadro.'})
+        board = boards.pop()
+        self.check_board(board.id)
+        found = set(Card.objects.filter(id__in=card_ids, fk_column__fk_board=board).values_list('id', flat=True))
+        if len(found) < len(set(card_ids)):
+            raise ValidationError({'cards': f'Cartões não encontrados neste quadro: {sorted(set(card_ids) - found)}.'})
+        return [(tag.id, card_id) for tag in tags for card_id in found]
+
+class CardTemplateViewSet(CachePolicyMixin, IdempotencyMixin, BoardScopedMixin, viewsets.ModelViewSet):
+    queryset = CardTemplate.objects.all()
+    serializer_class = CardTemplateSerializer
+    lookup_field = 'id'
+    board_field = 'fk_board'
+    write_denied = 'Você não tem permissão para editar os modelos de cartão deste quadro.'
+
+    def get_queryset(self):
+        # Modelos dos quadros acessíveis; com ?board=ID, só os daquele quadro (índice único quadro + nome)
+        queryset = super().get_queryset()
+        board_id = self.request.query_params.get('board')
+        if board_id:
+            if not board_id.isdigit():
+                raise ValidationError({'board': 'Informe o id numérico do quadro.'})
+            queryset = queryset.filter(fk_board_id=board_id)
+        return queryset.order_by('fk_board', Lower('name'), 'id')
+
+    def get_throttle_board_id(self, request):
+        return request.query_params.get('board')
+
+    def perform_create(self, serializer):
+        self.check_board(self.board_id_of(serializer.validated_data))
+        serializer.save(fk_user=self.request.user)
 
-class CommentViewSet(viewsets.ModelViewSet):
+    # Cria cartões do modelo no fim de uma coluna, em lote: {"column": id, "count": 1}
+    @action(detail=True, methods=['post'], serializer_class=CardTemplateInstantiateSerializer)
+    @idempotent
+    def instantiate(self, request, id=None):
+        template = self.get_object()
+        params = CardTemplateInstantiateSerializer(data=request.data)
+        params.is_valid(raise_exception=True)
+        column = params.validated_data['column']
+        self.check_board(column.fk_board_id, 'edit')
+        try:
+            cards = cloning.instantiate_template(template, column, request.user, params.validated_data['count'])
+        except IntegrityError:
+            return Response({'detail': 'A coluna foi alterada durante a operação. Tente novamente.'}, status=409)
+        queryset = CardSerializer.optimize(Card.objects.filter(id__in=[card.id for card in cards])).order_by('position', 'id')
+        return Response(CardSerializer(queryset, many=True, context=self.get_serializer_context()).data, status=201)
+
+class CommentViewSet(CachePolicyMixin, IdempotencyMixin, BoardScopedMixin, viewsets.ModelViewSet):
     queryset = Comment.objects.all()
     serializer_class = CommentSerializer
     lookup_field = 'id'
+    board_field = 'fk_card__fk_column__fk_board'
+    write_denied = 'Você não tem permissão para comentar nos cartões deste quadro.'
+
+    def get_queryset(self):
+        return CardSerializer.optimize(super().get_queryset(), 'fk_card__').select_related('fk_user').prefetch_related(
+            *UserSerializer.prefetch('fk_user__'),
+        ).order_by('id')
 
-class NotificationViewSet(viewsets.ModelViewSet):
+class NotificationViewSet(CachePolicyMixin, IdempotencyMixin, viewsets.ModelViewSet):
     queryset = Notification.objects.all()
     serializer_class = NotificationSerializer
     lookup_field = 'id'
 
-class AttachmentViewSet(viewsets.ModelViewSet):
+    def get_queryset(self):
+        # Na geração do schema (drf_yasg) a view não tem requisição nem usuário
+        if getattr(self, 'swagger_fake_view', False):
+            return Notification.objects.none()
+        # Só as notificações do próprio usuário, pelo índice de fk_user (mais recentes primeiro)
+        return Notification.objects.filter(fk_user=self.request.user).select_related('fk_user').prefetch_related(
+            *UserSerializer.prefetch('fk_user__'),
+        ).order_by('-id')
+
+class AttachmentViewSet(CachePolicyMixin, IdempotencyMixin, BoardScopedMixin, viewsets.ModelViewSet):
     queryset = Attachment.objects.all()
     serializer_class = AttachmentSerializer
     lookup_field = 'id'
+    throttle_scope = None
+    board_field = 'fk_card__fk_column__fk_board'
+    write_denied = 'Você não tem permissão para anexar arquivos a este cartão.'
+
+    def get_queryset(self):
+        return CardSerializer.optimize(super().get_queryset(), 'fk_card__').select_related('uploaded_by').prefetch_related(
+            *UserSerializer.prefetch('uploaded_by__'),
+        ).order_by('id')
+
+    def create(self, request, *args, **kwargs):
+        self._limit_upload(request)
+        return super().create(request, *args, **kwargs)
+
+    def update(self, request, *args, **kwargs):
+        self._limit_upload(request)
+        return super().update(request, *args, **kwargs)
+
+    def get_throttles(self):
+        # Upload direto conta no mesmo bucket das sessões de upload em partes
+        if self.action in ('create', 'update', 'partial_update'):
+            self.throttle_scope = 'upload'
+        return super().get_throttles()
+
+    def _limit_upload(self, request):
+        # Recusa pelo Content-Length antes de ler o corpo e, durante a leitura, pelo handler
+        # (a margem cobre os cabeçalhos e demais campos do multipart)
+        if uploads.content_length(request) > uploads.max_size() + 64 * 1024:
+            raise uploads.PayloadTooLarge(uploads.size_error(uploads.content_length(request)))
+        handler = uploads.LimitedUploadHandler(request)
+        request.upload_handlers.insert(0, handler)
+        request.data  # Processa o multipart com o handler instalado
+        if handler.too_large:
+            raise uploads.PayloadTooLarge(handler.error)
+        if handler.error:
+            raise ValidationError({'file': [handler.error]})
+
+    # Download em streaming (com Range) ou delegado ao servidor web (KANBAN_SENDFILE)
+    @action(detail=True, methods=['get'])
+    def download(self, request, id=None):
+        attachment = get_object_or_404(self.scope(Attachment.objects.all()), id=id)
+        return storage.serve(request, attachment)
+
+    # Miniatura (imagens) ou preview da primeira página (PDFs), com poucos KB
+    @action(detail=True, methods=['get'])
+    def thumbnail(self, request, id=None):
+        attachment = get_object_or_404(self.scope(Attachment.objects.exclude(thumbnail='')), id=id)
+        return storage.serve_thumbnail(request, attachment)
+
+    # Upload em partes: POST cria a sessão; PATCH envia bytes a partir de Upload-Offset;
+    # HEAD/GET informam quanto já foi recebido (para retomar); DELETE cancela.
+    @action(detail=False, methods=['post'], url_path='uploads', serializer_class=UploadSessionSerializer,
+            throttle_scope='upload')
+    @idempotent
+    def create_upload(self, request):
+        serializer = UploadSessionSerializer(data=request.data, context=self.get_serializer_context())
+        serializer.is_valid(raise_exception=True)
+        card = serializer.validated_data['fk_card']
+        self.check_board(card.get_board_id())
+        session = serializer.save(uploaded_by=request.user)
+        response = Response(serializer.data, status=201)
+        response['Location'] = reverse('attachment-upload', kwargs={'upload_id': session.id})
+        return self._upload_headers(response, session)
+
+    @action(detail=False, methods=['get', 'head', 'patch', 'delete'], url_path=r'uploads/(?P<upload_id>[0-9a-f-]{36})',
+            url_name='upload', serializer_class=UploadSessionSerializer, throttle_scope='upload')
+    def upload(self, request, upload_id=None):
+        session = get_object_or_404(UploadSession, id=upload_id, uploaded_by=request.user)
+        if request.method == 'DELETE':
+            uploads.discard(session)
+            return Response(status=204)
+        if request.method in ('GET', 'HEAD'):
+            return self._upload_headers(Response(UploadSessionSerializer(session).data), session)
+
+        try:
+            offset = int(request.headers['Upload-Offset'])
+        except (KeyError, ValueError):
+            raise ValidationError('Informe o header Upload-Offset com o offset do trecho enviado.')
+        length = uploads.content_length(request)
+        if offset != session.offset:
+            raise uploads.UploadConflict()
+        if offset + length > session.size:
+            raise uploads.PayloadTooLarge('O trecho enviado ultrapassa o tamanho declarado do arquivo.')
+        try:
+            uploads.append_chunk(session, request.stream, offset, length)
+        except ValidationError:
+            # Conteúdo que não corresponde ao tipo declarado: a sessão não tem como prosseguir
+            if offset == 0:
+                uploads.discard(session)
+            raise
+        if session.offset < session.size:
+            return self._upload_headers(Response(status=204), session)
+        attachment = uploads.complete(session)
+        response = Response(AttachmentSerializer(attachment, context=self.get_serializer_context()).data, status=201)
+        return self._upload_headers(response, session)
+
+    def _upload_headers(self, response, session):
+        response['Upload-Offset'] = session.offset
+        response['Upload-Length'] = session.size
+        return response
 
 class CustomTokenObtainPairView(TokenObtainPairView):
     serializer_class = CustomTokenObtainPairSerializer
 
-class BoardCollaboratorViewSet(viewsets.ModelViewSet):
+class BoardCollaboratorViewSet(CachePolicyMixin, IdempotencyMixin, viewsets.ModelViewSet):
     queryset = BoardCollaborator.objects.all()
     serializer_class = BoardCollaboratorSerializer
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
+        # Na geração do schema (drf_yasg) a view não tem requisição nem usuário
+        if getattr(self, 'swagger_fake_view', False):
+            return BoardCollaborator.objects.none()
         user = self.request.user
 
         # Se o usuário for admin do sistema, ele pode visualizar todos os colaboradores
@@ -115,13 +521,11 @@ class BoardCollaboratorViewSet(viewsets.ModelViewSet):
         # Para outros usuários, filtrar colaboradores apenas dos boards onde eles têm permissão
         board_id = self.request.query_params.get('board_id')
 
-        # Se nenhum board_id foi fornecido, retornar apenas os colaboradores onde o usuário tem permissão
+        # Se nenhum board_id foi fornecido, retornar apenas os colaboradores onde o usuário tem permissão:
+        # os dos quadros que ele possui e as próprias colaborações (subquery, sem JOIN)
         if not board_id:
-            return BoardCollaborator.objects.filter(
-                fk_board__fk_user=user  # Dono do quadro
-            ) | BoardCollaborator.objects.filter(
-                fk_user=user  # Colaborador
-            )
+            owned = BoardAccess.objects.filter(fk_user=user, permission='owner').values('fk_board')
+            return BoardCollaborator.objects.filter(Q(fk_board__in=owned) | Q(fk_user=user))
 
         # Se o board_id foi fornecido, verificar se o usuário tem permissão de visualização
         board = Board.objects.filter(id=board_id).first()
@@ -150,3 +554,47 @@ class BoardCollaboratorViewSet(viewsets.ModelViewSet):
             raise PermissionDenied("Você não tem permissão para remover colaboradores deste quadro.")
 
         instance.delete()
+
+
+# Exposição das métricas agregadas por view/action no formato de texto do Prometheus
+class MetricsView(CachePolicyMixin, APIView):
+    permission_classes = [IsAdminUser]
+    swagger_schema = None
+    cache_control = {'no_store': True}
+
+    def get(self, request):
+        return HttpResponse(
+            metrics.registry.to_prometheus(),
+            content_type='text/plain; version=0.0.4; charset=utf-8',
+        )
+
+
+# Busca textual em cartões, comentários e tarefas dos quadros acessíveis ao usuário,
+# ordenada por relevância e paginada por cursor (?q=...&cursor=...&page_size=...)
+class SearchView(CachePolicyMixin, APIView):
+    permission_classes = [IsAuthenticated]
+    throttle_scope = 'search'
+    default_page_size = 20
+    max_page_size = 100
+
+    def get(self, request):
+        text = request.query_params.get('q', '').strip()
+        if not text:
+            raise ValidationError({'q': 'Informe o termo de busca.'})
+        try:
+            page_size = min(int(request.query_params.get('page_size', self.default_page_size)), self.max_page_size)
+        except ValueError:
+            raise ValidationError({'page_size': 'O tamanho da página deve ser um número inteiro.'})
+        if page_size < 1:
+            raise ValidationError({'page_size': 'O tamanho da página deve ser positivo.'})
+
+        results, next_cursor = search.search(
+            request.user, text, cursor=request.query_params.get('cursor'), limit=page_size,
+        )
+        next_url = None
+        if next_cursor:
+            next_url = replace_query_param(request.build_absolute_uri(), 'cursor', next_cursor)
+        return Response({
+            'next': next_url,
+            'results': SearchEntrySerializer(results, many=True).data,
+        })
@@ -10,7 +10,13 @@ https://docs.djangoproject.com/en/5.0/howto/deployment/asgi/
 import os
 
 from django.core.asgi import get_asgi_application
+from django.urls import get_resolver
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'setup.settings')
 
 application = get_asgi_application()
+
+# O Django só importa o urlconf (e com ele views, serializers e renderers) na primeira
+# requisição; aqui ele é carregado junto com a aplicação. Com o preload do gunicorn
+# (setup/gunicorn.conf.py), isso acontece uma vez no mestre, antes do fork dos workers.
+get_resolver().url_patterns
@@ -0,0 +1,48 @@
+"""
+Configuração do gunicorn para o perfil de produção (setup/settings_production.py):
+
+    gunicorn -c setup/gunicorn.conf.py setup.wsgi
+
+Tudo vem de variáveis de ambiente GUNICORN_*, com padrões para uma máquina dedicada à API.
+Para escolher workers e threads no hardware de destino: manage.py benchmark_server.
+"""
+import multiprocessing
+import os
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'setup.settings_production')
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+
+# Processos: o padrão (2 x CPUs + 1) mantém as CPUs ocupadas enquanto parte dos workers espera o banco
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+
+# Threads por processo: com mais de uma, o worker é gthread. As threads dividem o GIL, mas
+# sobrepõem a espera por banco e rede e custam bem menos memória que outro processo
+threads = int(os.environ.get('GUNICORN_THREADS', 1))
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread' if threads > 1 else 'sync')
+
+# Carrega o Django e o urlconf (setup/wsgi.py) uma vez no mestre, antes do fork: os workers
+# nascem prontos e compartilham essas páginas de memória (copy-on-write)
+preload_app = os.environ.get('GUNICORN_PRELOAD', '1') == '1'
+
+# Recicla cada worker após N requisições, com jitter para não reiniciarem todos juntos:
+# limita o crescimento de memória (fragmentação, caches em processo) sem depender de vazamentos
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 100))
+
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+
+# Heartbeat dos workers em memória: em containers, /tmp costuma ser disco (ou overlay) e pode travar
+worker_tmp_dir = os.environ.get('GUNICORN_WORKER_TMP_DIR') or ('/dev/shm' if os.path.isdir('/dev/shm') else None)
+
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-') or None
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOG_LEVEL', 'info')
+
+
+def post_fork(server, worker):
+    # Conexões abertas no mestre durante o preload não podem ser usadas por dois processos
+    from django.db import connections
+    connections.close_all()
@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.0/ref/settings/
 """
 
 from datetime import timedelta
+from importlib.util import find_spec
 from pathlib import Path
 import os
 
@@ -22,12 +23,14 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 # See https://docs.djangoproject.com/en/5.0/howto/deployment/checklist/
 
 # SECURITY WARNING: keep the secret key used in production secret!
-SECRET_KEY = 'django-insecure-$6-&uh1_k&0$!w8lz$nm(&=#l)35@is$3!b6v-%c=#gwzpbf0p'
+SECRET_KEY = os.environ.get('DJANGO_SECRET_KEY', 'django-insecure-$6-&uh1_k&0$!w8lz$nm(&=#l)35@is$3!b6v-%c=#gwzpbf0p')
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+# Com DEBUG, o Django guarda na memória do processo cada query executada (connection.queries).
+# Em produção use o perfil setup.settings_production, que parte de DEBUG desligado.
+DEBUG = os.environ.get('DJANGO_DEBUG', '1') == '1'
 
-ALLOWED_HOSTS = []
+ALLOWED_HOSTS = [host for host in os.environ.get('DJANGO_ALLOWED_HOSTS', '').split(',') if host]
 
 
 # Application definition
@@ -40,11 +43,17 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'rest_framework',
+    'django_filters',
     'kanban',
     'drf_yasg',
 ]
 
 MIDDLEWARE = [
+    # Mais externo: as métricas e os demais middlewares veem a resposta ainda sem compressão
+    'kanban.middleware.CompressionMiddleware',
+    'kanban.middleware.QueryMetricsMiddleware',
+    'kanban.middleware.QueryInspectorMiddleware',
+    'kanban.middleware.ActivityMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -86,6 +95,31 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+# Em produção, aponte para um cache compartilhado (Redis/Memcached).
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'OPTIONS': {
+            # Os buckets diários das métricas de fluxo ocupam uma entrada por quadro/dia
+            'MAX_ENTRIES': 10000,
+        },
+    },
+    # Respostas das criações com Idempotency-Key (kanban/idempotency.py): o limite de entradas
+    # segura a memória; com mais de um processo, também deve ser um cache compartilhado
+    'idempotency': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'idempotency',
+        'TIMEOUT': 60 * 60 * 24,
+        'OPTIONS': {
+            'MAX_ENTRIES': 5000,
+        },
+    },
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 
@@ -122,12 +156,29 @@ USE_TZ = True
 
 STATIC_URL = 'static/'
 
+# Arquivos enviados (anexos)
+MEDIA_ROOT = BASE_DIR / 'media'
+MEDIA_URL = 'media/'
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# MessagePack e CBOR (kanban/renderers.py), escolhidos pelo header Accept ou por ?format=msgpack/cbor.
+# São opcionais: cada formato só é registrado se a biblioteca (msgpack, cbor2) estiver instalada.
+KANBAN_BINARY_FORMATS = [name for module, name in (('msgpack', 'MessagePack'), ('cbor2', 'CBOR')) if find_spec(module)]
+
 REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': [
+        'rest_framework.renderers.JSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ] + [f'kanban.renderers.{name}Renderer' for name in KANBAN_BINARY_FORMATS],
+    'DEFAULT_PARSER_CLASSES': [
+        'rest_framework.parsers.JSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ] + [f'kanban.renderers.{name}Parser' for name in KANBAN_BINARY_FORMATS],
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
@@ -136,8 +187,37 @@ REST_FRAMEWORK = {
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 5,
+    # Token buckets por usuário, por quadro e por classe de endpoint (kanban/throttling.py)
+    'DEFAULT_THROTTLE_CLASSES': [
+        'kanban.throttling.KanbanRateThrottle',
+    ],
+    'DEFAULT_THROTTLE_RATES': {
+        'user_read': '600/min',
+        'user_write': '120/min',
+        'board_read': '1200/min',
+        'board_write': '300/min',
+        'anon': '60/min',
+        # Endpoints caros, com `throttle_scope` na view ou na action
+        'export': '10/min',
+        'search': '60/min',
+        'upload': '60/min',
+    },
 }
 
+# Cache onde fica o estado dos throttles. Com mais de um processo, deve ser um cache
+# compartilhado (Redis/Memcached); o LocMemCache limita cada processo separadamente.
+KANBAN_THROTTLE_CACHE = 'default'
+
+# Idempotency-Key nos POSTs de criação: cache das respostas e por quanto tempo uma repetição
+# com a mesma chave recebe a resposta original em vez de criar outro registro
+KANBAN_IDEMPOTENCY_CACHE = 'idempotency'
+KANBAN_IDEMPOTENCY_TTL = timedelta(hours=24)
+
+# Compressão gzip das respostas (kanban/middleware.py, sobre o GZipMiddleware do Django, nível 6):
+# tamanho mínimo das respostas comuns (as em streaming são sempre comprimidas).
+# manage.py benchmark_compression mede o custo de CPU de cada nível.
+KANBAN_COMPRESS_MIN_SIZE = 1024
+
 '''
 # Autenticacão com JWT
 'DEFAULT_AUTHENTICATION_CLASSES': (
@@ -145,6 +225,58 @@ REST_FRAMEWORK = {
 ),
 '''
 
+# Métricas por requisição (queries, tempo de banco, serialização e tamanho da resposta)
+# expostas no header Server-Timing e agregadas em /metrics
+KANBAN_METRICS_ENABLED = True
+
+# Detector de N+1 e queries lentas (desenvolvimento/staging). Com RAISE=True
+# qualquer problema encontrado levanta kanban.querywatch.QueryProblem.
+KANBAN_QUERY_INSPECTOR = {
+    'ENABLED': DEBUG,
+    'NPLUSONE_THRESHOLD': 5,
+    'SLOW_QUERY_MS': 100,
+    'RAISE': False,
+}
+
+# Lembretes de prazo (manage.py send_due_reminders)
+KANBAN_DUE_SOON_WINDOW = timedelta(hours=24)
+KANBAN_OVERDUE_LOOKBACK = timedelta(days=30)
+
+# Validade do cache dos buckets diários de /boards/{id}/analytics/ (em segundos)
+KANBAN_ANALYTICS_CACHE_TIMEOUT = 60 * 60 * 24 * 7
+
+# Retenção do feed de atividades (manage.py prune_activity)
+KANBAN_ACTIVITY_RETENTION = timedelta(days=180)
+# Fora de requisições, tempo máximo (em segundos) que um evento espera no buffer do processo
+KANBAN_ACTIVITY_FLUSH_INTERVAL = 5
+
+# Prazo para restaurar um quadro removido antes que o reaper expurgue o conteúdo
+# (manage.py reap_boards)
+KANBAN_BOARD_PURGE_DELAY = timedelta(days=1)
+
+# Anexos: tamanho máximo, pasta dos uploads em partes e validade das sessões paradas
+# (manage.py prune_uploads)
+KANBAN_ATTACHMENT_MAX_SIZE = 1024 * 1024 * 5
+KANBAN_UPLOAD_DIR = MEDIA_ROOT / 'uploads'
+KANBAN_UPLOAD_EXPIRY = timedelta(hours=24)
+
+# Envio dos downloads delegado ao servidor web: None (streaming pelo Django),
+# 'x-sendfile' (Apache/lighttpd) ou 'x-accel-redirect' (Nginx, location interna
+# KANBAN_SENDFILE_PREFIX apontando para MEDIA_ROOT)
+KANBAN_SENDFILE = None
+KANBAN_SENDFILE_PREFIX = '/protected/'
+
+# Miniaturas de anexos (requer Pillow; previews de PDF requerem o pdftoppm do poppler):
+# lado máximo em pixels e threads do pool em processo (0 = gera após o commit, na própria thread)
+KANBAN_THUMBNAIL_SIZE = 320
+KANBAN_THUMBNAIL_WORKERS = 2
+
+# Documento OpenAPI gerado no build (manage.py generate_schema). Só é servido se foi gerado
+# para a versão do código em execução: KANBAN_CODE_VERSION (ex.: o commit do build) ou,
+# sem ela, um hash do código das apps
+KANBAN_SCHEMA_DIR = BASE_DIR / 'openapi'
+KANBAN_CODE_VERSION = os.environ.get('KANBAN_CODE_VERSION')
+
 # Vincula a classe usuário personalizada ao modelo de usuário padrão do Django
 AUTH_USER_MODEL = 'kanban.User'
 
@@ -0,0 +1,43 @@
+"""
+Perfil dos workers da API (DJANGO_SETTINGS_MODULE=setup.settings_api).
+
+Mesmas configurações de setup.settings, sem o que só o admin e a documentação
+usam: sessions, messages, staticfiles, drf_yasg, a API navegável do DRF e os
+middlewares de sessão/CSRF/mensagens (a API autentica por Basic/JWT). Admin,
+Swagger/ReDoc, collectstatic e migrate continuam no perfil completo (setup.settings).
+Para comparar o boot dos perfis: manage.py benchmark_startup.
+"""
+from .settings import *  # noqa: F401,F403
+
+INSTALLED_APPS = [
+    # Sem autodiscover nem rotas: o app fica só para que LogEntry continue registrado
+    # (remover um usuário apaga também o histórico dele no admin, como no perfil completo)
+    'django.contrib.admin.apps.SimpleAdminConfig' if app == 'django.contrib.admin' else app
+    for app in INSTALLED_APPS
+    if app not in ('django.contrib.sessions', 'django.contrib.messages', 'django.contrib.staticfiles', 'drf_yasg')
+]
+
+MIDDLEWARE = [
+    middleware for middleware in MIDDLEWARE
+    if middleware not in (
+        'django.contrib.sessions.middleware.SessionMiddleware',
+        'django.middleware.csrf.CsrfViewMiddleware',
+        'django.contrib.auth.middleware.AuthenticationMiddleware',
+        'django.contrib.messages.middleware.MessageMiddleware',
+        'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    )
+]
+
+ROOT_URLCONF = 'setup.urls_api'
+
+# O admin não é servido neste perfil: as exigências dele (sessions, messages, templates) não se aplicam
+SILENCED_SYSTEM_CHECKS = ['admin.E402', 'admin.E404', 'admin.E406', 'admin.E408', 'admin.E409', 'admin.E410']
+
+TEMPLATES = [{**TEMPLATES[0], 'OPTIONS': {'context_processors': []}}]
+
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    'DEFAULT_RENDERER_CLASSES': ['rest_framework.renderers.JSONRenderer'] + [
+        f'kanban.renderers.{name}Renderer' for name in KANBAN_BINARY_FORMATS  # noqa: F405
+    ],
+}
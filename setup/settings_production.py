@@ -0,0 +1,121 @@
+"""
+Perfil de produção (DJANGO_SETTINGS_MODULE=setup.settings_production), configurado só por
+variáveis de ambiente e servido pelo gunicorn: gunicorn -c setup/gunicorn.conf.py setup.wsgi
+
+Parte do perfil completo (setup.settings) ou, com KANBAN_API_ONLY=1, do perfil dos workers
+da API (setup.settings_api). DEBUG fica desligado: com ele, cada processo guardaria todas as
+queries executadas até ser reciclado.
+
+    DJANGO_SECRET_KEY            obrigatória
+    DJANGO_ALLOWED_HOSTS         hosts separados por vírgula
+    DJANGO_CSRF_TRUSTED_ORIGINS  origens do admin atrás de HTTPS (ex.: https://kanban.exemplo.com)
+    DJANGO_DEBUG                 1 só para diagnóstico (padrão 0)
+    DJANGO_HSTS_SECONDS          max-age do Strict-Transport-Security (padrão 0, desligado)
+    DJANGO_LOG_LEVEL             padrão INFO
+    KANBAN_DB_ENGINE             sqlite3 (padrão) ou postgresql; KANBAN_DB_NAME, _USER, _PASSWORD,
+                                 _HOST, _PORT e _CONN_MAX_AGE (segundos, padrão 60)
+    KANBAN_REDIS_URL             obrigatória: cache compartilhado entre os processos (throttles,
+                                 Idempotency-Key, analytics); requer o pacote redis
+    KANBAN_LOCAL_CACHE           1 dispensa o KANBAN_REDIS_URL e mantém um cache por processo, o que
+                                 torna o Idempotency-Key e os throttles válidos só dentro de cada
+                                 worker (um único processo, benchmarks locais)
+    KANBAN_THROTTLE_ENABLED      0 desliga os throttles (benchmarks locais)
+
+Workers, threads, preload e reciclagem ficam em setup/gunicorn.conf.py (GUNICORN_*);
+manage.py benchmark_server compara as combinações no dataset de manage.py seed_benchmark.
+"""
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+if os.environ.get('KANBAN_API_ONLY') == '1':
+    from .settings_api import *  # noqa: F401,F403
+else:
+    from .settings import *  # noqa: F401,F403
+
+
+def _flag(name, default):
+    return os.environ.get(name, '1' if default else '0') == '1'
+
+
+def _list(name):
+    return [value.strip() for value in os.environ.get(name, '').split(',') if value.strip()]
+
+
+DEBUG = _flag('DJANGO_DEBUG', False)
+
+SECRET_KEY = os.environ.get('DJANGO_SECRET_KEY')
+if not SECRET_KEY:
+    raise ImproperlyConfigured('Defina DJANGO_SECRET_KEY para usar o perfil de produção.')
+
+ALLOWED_HOSTS = _list('DJANGO_ALLOWED_HOSTS')
+CSRF_TRUSTED_ORIGINS = _list('DJANGO_CSRF_TRUSTED_ORIGINS')
+
+# Atrás do proxy que termina o TLS (Nginx): o esquema original vem em X-Forwarded-Proto
+SECURE_PROXY_SSL_HEADER = ('HTTP_X_FORWARDED_PROTO', 'https')
+SESSION_COOKIE_SECURE = _flag('DJANGO_SECURE_COOKIES', True)
+CSRF_COOKIE_SECURE = SESSION_COOKIE_SECURE
+# O redirecionamento para HTTPS fica com o proxy; HSTS só quando todo o domínio já é HTTPS
+SECURE_HSTS_SECONDS = int(os.environ.get('DJANGO_HSTS_SECONDS', 0))
+
+STATIC_ROOT = os.environ.get('DJANGO_STATIC_ROOT', BASE_DIR / 'staticfiles')  # noqa: F405
+
+_engine = os.environ.get('KANBAN_DB_ENGINE', 'sqlite3')
+DATABASES = {
+    'default': {
+        'ENGINE': f'django.db.backends.{_engine}',
+        'NAME': os.environ.get('KANBAN_DB_NAME', DATABASES['default']['NAME']),  # noqa: F405
+        'USER': os.environ.get('KANBAN_DB_USER', ''),
+        'PASSWORD': os.environ.get('KANBAN_DB_PASSWORD', ''),
+        'HOST': os.environ.get('KANBAN_DB_HOST', ''),
+        'PORT': os.environ.get('KANBAN_DB_PORT', ''),
+        # Uma conexão por thread do worker, reaproveitada entre requisições (e testada antes do reuso)
+        'CONN_MAX_AGE': int(os.environ.get('KANBAN_DB_CONN_MAX_AGE', 60)),
+        'CONN_HEALTH_CHECKS': True,
+    }
+}
+if _engine == 'sqlite3':
+    # Vários processos no mesmo arquivo: WAL deixa as leituras seguirem durante uma escrita e
+    # IMMEDIATE pega o lock de escrita no início da transação (sem "database is locked" no meio)
+    DATABASES['default']['OPTIONS'] = {
+        'timeout': 20,
+        'transaction_mode': 'IMMEDIATE',
+        'init_command': 'PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL;',
+    }
+
+if not os.environ.get('KANBAN_REDIS_URL') and not _flag('KANBAN_LOCAL_CACHE', False):
+    # Com o LocMem, uma repetição com o mesmo Idempotency-Key que caia em outro worker criaria o registro de novo
+    raise ImproperlyConfigured(
+        'Defina KANBAN_REDIS_URL para usar o perfil de produção (ou KANBAN_LOCAL_CACHE=1 para um cache por processo).'
+    )
+if os.environ.get('KANBAN_REDIS_URL'):
+    CACHES = {
+        alias: {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['KANBAN_REDIS_URL'],
+            'KEY_PREFIX': f'kanban:{alias}',
+            'TIMEOUT': CACHES[alias].get('TIMEOUT', 300),  # noqa: F405
+        }
+        for alias in CACHES  # noqa: F405
+    }
+
+if not _flag('KANBAN_THROTTLE_ENABLED', True):
+    REST_FRAMEWORK = {**REST_FRAMEWORK, 'DEFAULT_THROTTLE_CLASSES': []}  # noqa: F405
+
+# Sem a API navegável: só os formatos de máquina (JSON, MessagePack, CBOR)
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,  # noqa: F405
+    'DEFAULT_RENDERER_CLASSES': [
+        renderer for renderer in REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES']  # noqa: F405
+        if renderer != 'rest_framework.renderers.BrowsableAPIRenderer'
+    ],
+}
+
+KANBAN_QUERY_INSPECTOR = {**KANBAN_QUERY_INSPECTOR, 'ENABLED': DEBUG}  # noqa: F405
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {'console': {'class': 'logging.StreamHandler'}},
+    'root': {'handlers': ['console'], 'level': os.environ.get('DJANGO_LOG_LEVEL', 'INFO')},
+}
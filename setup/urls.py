@@ -1,14 +1,12 @@
 from django.contrib import admin
 from django.urls import path, include, re_path
-from rest_framework.routers import DefaultRouter
-from kanban.views import UserViewSet, BoardViewSet, ColumnViewSet, CardViewSet, TaskViewSet, TagViewSet, CommentViewSet, NotificationViewSet, AttachmentViewSet, CustomTokenObtainPairView, BoardCollaboratorViewSet
-from rest_framework_simplejwt.views import TokenRefreshView
 
 from rest_framework import permissions
-from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
+from kanban.openapi import get_cached_schema_view
 
-schema_view = get_schema_view(
+# Documento OpenAPI gerado no build (manage.py generate_schema) ou memoizado por versão do código
+schema_view = get_cached_schema_view(
     openapi.Info(
         title="API Kanban",
         default_version='v1',
@@ -21,23 +19,9 @@ schema_view = get_schema_view(
     permission_classes=(permissions.AllowAny,),
 )
 
-router = DefaultRouter()
-router.register(r'users', UserViewSet)
-router.register(r'boards', BoardViewSet)
-router.register(r'columns', ColumnViewSet)
-router.register(r'cards', CardViewSet)
-router.register(r'tasks', TaskViewSet)
-router.register(r'tags', TagViewSet)
-router.register(r'comments', CommentViewSet)
-router.register(r'notifications', NotificationViewSet)
-router.register(r'attachments', AttachmentViewSet)
-router.register(r'board-collaborators', BoardCollaboratorViewSet)
-
 urlpatterns = [
     path('admin/', admin.site.urls),
-    path('', include(router.urls)),
-    path('token/', CustomTokenObtainPairView.as_view(), name='token_obtain_pair'),
-    path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('', include('setup.urls_api')),
     path('swagger/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
     path('redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
     re_path(r'^swagger(?P<format>\.json|\.yaml)$', schema_view.without_ui(cache_timeout=0), name='schema-json'),
@@ -0,0 +1,39 @@
+"""
+Rotas da API, sem admin nem documentação: é o ROOT_URLCONF do perfil
+setup.settings_api. O urlconf completo (setup.urls) as inclui.
+"""
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+from kanban.views import UserViewSet, BoardViewSet, ColumnViewSet, CardViewSet, TaskViewSet, TagViewSet, CardTemplateViewSet, CommentViewSet, NotificationViewSet, AttachmentViewSet, CustomTokenObtainPairView, BoardCollaboratorViewSet, MetricsView, SearchView
+from kanban.async_views import AsyncBoardView, AsyncColumnView, AsyncCardView, AsyncNotificationView
+from rest_framework_simplejwt.views import TokenRefreshView
+
+router = DefaultRouter()
+router.register(r'users', UserViewSet)
+router.register(r'boards', BoardViewSet)
+router.register(r'columns', ColumnViewSet)
+router.register(r'cards', CardViewSet)
+router.register(r'tasks', TaskViewSet)
+router.register(r'tags', TagViewSet)
+router.register(r'card-templates', CardTemplateViewSet)
+router.register(r'comments', CommentViewSet)
+router.register(r'notifications', NotificationViewSet)
+router.register(r'attachments', AttachmentViewSet)
+router.register(r'board-collaborators', BoardCollaboratorViewSet)
+
+urlpatterns = [
+    path('', include(router.urls)),
+    path('token/', CustomTokenObtainPairView.as_view(), name='token_obtain_pair'),
+    path('token/refresh/', TokenRefreshView.as_view(), name='token_refresh'),
+    path('search/', SearchView.as_view(), name='search'),
+    # Rotas de leitura assíncronas (ASGI) para as listagens e detalhes mais acessados
+    path('async/boards/', AsyncBoardView.as_view(), name='async-board-list'),
+    path('async/boards/<int:pk>/', AsyncBoardView.as_view(), name='async-board-detail'),
+    path('async/columns/', AsyncColumnView.as_view(), name='async-column-list'),
+    path('async/columns/<int:pk>/', AsyncColumnView.as_view(), name='async-column-detail'),
+    path('async/cards/', AsyncCardView.as_view(), name='async-card-list'),
+    path('async/cards/<int:pk>/', AsyncCardView.as_view(), name='async-card-detail'),
+    path('async/notifications/', AsyncNotificationView.as_view(), name='async-notification-list'),
+    path('async/notifications/<int:pk>/', AsyncNotificationView.as_view(), name='async-notification-detail'),
+    path('metrics', MetricsView.as_view(), name='metrics'),
+]